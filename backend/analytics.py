@@ -0,0 +1,264 @@
+from typing import Dict, List, Optional, Tuple
+
+from ledger import season_of
+
+# Form, streak and split analytics over completed matches.
+#
+# match_results keeps one row per completed match with a score, in
+# (match_date, match_id) order, together with the length of the win and
+# unbeaten runs ending at that match. A run only depends on the run before
+# it, so a match write recomputes runs from the changed position onwards and
+# stops at the first later match whose stored runs come out unchanged,
+# usually within a few rows. Current streaks are the runs of the latest
+# match, longest streaks an indexed MAX.
+#
+# team_splits holds W/D/L and goal totals per venue (home/away), month and
+# season, adjusted by the difference between a match's old and new
+# contribution, like team_stats. Everything is written in the transaction
+# of the match write. The hand-kept CSV history has no per-match rows, so
+# analytics cover recorded matches only.
+
+SPLITS = ("venue", "month", "season")
+SPLIT_COLUMNS = ("played", "wins", "draws", "losses", "goals_scored", "goals_conceded")
+RESULT_FIELDS = ("match_id", "match_date", "opponent", "home_away", "result", "goals_scored", "goals_conceded")
+RESULT_COLUMNS = ", ".join(RESULT_FIELDS)
+# Rows read per step while recomputing runs
+RUN_CHUNK = 256
+
+
+def create_tables(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS match_results (
+            match_id TEXT PRIMARY KEY,
+            match_date TEXT NOT NULL,
+            opponent TEXT NOT NULL,
+            home_away TEXT NOT NULL,
+            result TEXT NOT NULL,
+            goals_scored INTEGER NOT NULL,
+            goals_conceded INTEGER NOT NULL,
+            win_run INTEGER,
+            unbeaten_run INTEGER
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_results_date ON match_results (match_date, match_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_results_win_run ON match_results (win_run)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_results_unbeaten_run ON match_results (unbeaten_run)")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS team_splits (
+            split TEXT NOT NULL,
+            period TEXT NOT NULL,
+            played INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            draws INTEGER NOT NULL DEFAULT 0,
+            losses INTEGER NOT NULL DEFAULT 0,
+            goals_scored INTEGER NOT NULL DEFAULT 0,
+            goals_conceded INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (split, period)
+        )
+    ''')
+
+
+def result_entry(match: Optional[dict]) -> Optional[dict]:
+    """The match_results row of a match, or None unless it's completed with a score"""
+    if not match or match.get("status") != "completed":
+        return None
+    scored, conceded = match.get("fc_ssoa_score"), match.get("opponent_score")
+    if scored is None or conceded is None:
+        return None
+    return {
+        "match_id": match["id"],
+        "match_date": match["match_date"],
+        "opponent": match["opponent"],
+        "home_away": match.get("home_away") or "home",
+        "result": "win" if scored > conceded else "loss" if scored < conceded else "draw",
+        "goals_scored": scored,
+        "goals_conceded": conceded,
+    }
+
+
+def _split_keys(entry: dict) -> List[Tuple[str, str]]:
+    return [("venue", entry["home_away"]), ("month", entry["match_date"][:7]),
+            ("season", season_of(entry))]
+
+
+def _contribution(entry: dict) -> Tuple[int, ...]:
+    """What one result adds to each of its splits, in SPLIT_COLUMNS order"""
+    result = entry["result"]
+    return (1, int(result == "win"), int(result == "draw"), int(result == "loss"),
+            entry["goals_scored"], entry["goals_conceded"])
+
+
+def _add_to(totals: Dict[Tuple[str, str], List[int]], entry: dict, sign: int = 1):
+    contribution = _contribution(entry)
+    for key in _split_keys(entry):
+        total = totals.setdefault(key, [0] * len(SPLIT_COLUMNS))
+        for i, value in enumerate(contribution):
+            total[i] += sign * value
+
+
+def _apply_splits(conn, old: Optional[dict], new: Optional[dict]):
+    deltas: Dict[Tuple[str, str], List[int]] = {}
+    for entry, sign in ((old, -1), (new, 1)):
+        if entry:
+            _add_to(deltas, entry, sign)
+
+    columns = ", ".join(SPLIT_COLUMNS)
+    placeholders = ", ".join("?" for _ in SPLIT_COLUMNS)
+    increments = ", ".join(f"{column} = {column} + excluded.{column}" for column in SPLIT_COLUMNS)
+    conn.executemany(
+        f"INSERT INTO team_splits (split, period, {columns}) VALUES (?, ?, {placeholders}) "
+        f"ON CONFLICT (split, period) DO UPDATE SET {increments}",
+        [(split, period, *delta) for (split, period), delta in deltas.items() if any(delta)]
+    )
+    if old:
+        conn.execute("DELETE FROM team_splits WHERE played = 0")
+
+
+def _next_runs(previous: Tuple[int, int], result: str) -> Tuple[int, int]:
+    win_run, unbeaten_run = previous
+    return (win_run + 1 if result == "win" else 0,
+            unbeaten_run + 1 if result != "loss" else 0)
+
+
+def _rows_from(conn, start: Tuple[str, str]):
+    """match_results rows from `start` on, in match order, read RUN_CHUNK at a time"""
+    after, comparison = start, ">="
+    while True:
+        rows = conn.execute(f'''
+            SELECT match_id, match_date, result, win_run, unbeaten_run FROM match_results
+            WHERE (match_date, match_id) {comparison} (?, ?)
+            ORDER BY match_date, match_id LIMIT {RUN_CHUNK}
+        ''', after).fetchall()
+        yield from rows
+        if len(rows) < RUN_CHUNK:
+            return
+        after, comparison = (rows[-1]["match_date"], rows[-1]["match_id"]), ">"
+
+
+def _recompute_runs(conn, start: Tuple[str, str]):
+    """Recompute runs from position `start` on, up to the first row that doesn't change"""
+    previous = conn.execute('''
+        SELECT win_run, unbeaten_run FROM match_results
+        WHERE (match_date, match_id) < (?, ?) ORDER BY match_date DESC, match_id DESC LIMIT 1
+    ''', start).fetchone()
+    runs = tuple(previous) if previous else (0, 0)
+
+    updates = []
+    for match_id, _, result, win_run, unbeaten_run in _rows_from(conn, start):
+        runs = _next_runs(runs, result)
+        if runs != (win_run, unbeaten_run):
+            updates.append((*runs, match_id))
+        else:
+            break  # every later run follows from this one, which didn't change
+    conn.executemany("UPDATE match_results SET win_run = ?, unbeaten_run = ? WHERE match_id = ?", updates)
+
+
+def apply_match_change(conn, old: Optional[dict], new: Optional[dict]):
+    """Update results, runs and splits for a match going from `old` to `new` (None = absent)"""
+    before, after = result_entry(old), result_entry(new)
+    if before == after:
+        return
+    _apply_splits(conn, before, after)
+
+    # Removal and insertion are repaired one after the other, so moving a
+    # match across years only touches the rows next to its old and new dates
+    if before:
+        conn.execute("DELETE FROM match_results WHERE match_id = ?", (before["match_id"],))
+        _recompute_runs(conn, (before["match_date"], before["match_id"]))
+    if after:
+        conn.execute(f'''
+            INSERT INTO match_results ({RESULT_COLUMNS}, win_run, unbeaten_run)
+            VALUES (?, ?, ?, ?, ?, ?, ?, NULL, NULL)
+        ''', tuple(after[field] for field in RESULT_FIELDS))
+        _recompute_runs(conn, (after["match_date"], after["match_id"]))
+
+
+def rebuild(conn):
+    """Recompute every row from a full scan of matches"""
+    conn.execute("DELETE FROM match_results")
+    conn.execute("DELETE FROM team_splits")
+    rows = conn.execute('''
+        SELECT id, match_date, opponent, home_away, status, fc_ssoa_score, opponent_score
+        FROM matches WHERE status = 'completed' ORDER BY match_date, id
+    ''').fetchall()
+    entries = [entry for entry in map(result_entry, (dict(row) for row in rows)) if entry]
+
+    runs = (0, 0)
+    values = []
+    for entry in entries:
+        runs = _next_runs(runs, entry["result"])
+        values.append((*(entry[field] for field in RESULT_FIELDS), *runs))
+    conn.executemany(f'''
+        INSERT INTO match_results ({RESULT_COLUMNS}, win_run, unbeaten_run)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', values)
+
+    totals: Dict[Tuple[str, str], List[int]] = {}
+    for entry in entries:
+        _add_to(totals, entry)
+    conn.executemany(
+        f"INSERT INTO team_splits (split, period, {', '.join(SPLIT_COLUMNS)}) "
+        f"VALUES (?, ?, {', '.join('?' for _ in SPLIT_COLUMNS)})",
+        [(split, period, *total) for (split, period), total in totals.items()]
+    )
+
+
+def form(conn, last: int) -> dict:
+    """The last `last` results, newest first, with their W/D/L tally"""
+    rows = conn.execute(f'''
+        SELECT {RESULT_COLUMNS} FROM match_results
+        ORDER BY match_date DESC, match_id DESC LIMIT ?
+    ''', (last,)).fetchall()
+    results = [dict(row) for row in rows]
+    return {
+        "last": last,
+        "form": "".join(result["result"][0].upper() for result in results),
+        "wins": sum(result["result"] == "win" for result in results),
+        "draws": sum(result["result"] == "draw" for result in results),
+        "losses": sum(result["result"] == "loss" for result in results),
+        "goals_scored": sum(result["goals_scored"] for result in results),
+        "goals_conceded": sum(result["goals_conceded"] for result in results),
+        "results": results,
+    }
+
+
+def _longest(conn, column: str) -> dict:
+    end = conn.execute(f'''
+        SELECT match_date, match_id, {column} FROM match_results
+        WHERE {column} = (SELECT MAX({column}) FROM match_results) AND {column} > 0
+        ORDER BY match_date DESC, match_id DESC LIMIT 1
+    ''').fetchone()
+    if not end:
+        return {"length": 0, "from_date": None, "to_date": None}
+    start = conn.execute('''
+        SELECT match_date FROM match_results WHERE (match_date, match_id) <= (?, ?)
+        ORDER BY match_date DESC, match_id DESC LIMIT 1 OFFSET ?
+    ''', (end[0], end[1], end[2] - 1)).fetchone()
+    return {"length": end[2], "from_date": start[0], "to_date": end[0]}
+
+
+def streaks(conn) -> dict:
+    """Current and longest win and unbeaten runs"""
+    latest = conn.execute('''
+        SELECT win_run, unbeaten_run FROM match_results ORDER BY match_date DESC, match_id DESC LIMIT 1
+    ''').fetchone()
+    return {
+        "current_win": latest[0] if latest else 0,
+        "current_unbeaten": latest[1] if latest else 0,
+        "longest_win": _longest(conn, "win_run"),
+        "longest_unbeaten": _longest(conn, "unbeaten_run"),
+    }
+
+
+def splits(conn, split: str) -> List[dict]:
+    """Records per venue, month or season, in period order"""
+    rows = conn.execute(
+        f"SELECT period, {', '.join(SPLIT_COLUMNS)} FROM team_splits WHERE split = ? ORDER BY period",
+        (split,)
+    )
+    records = []
+    for row in rows:
+        record = dict(row)
+        record["win_rate"] = round(record["wins"] / record["played"] * 100, 2)
+        records.append(record)
+    return records
@@ -0,0 +1,87 @@
+import os
+import uuid
+from typing import Optional
+
+from file_lock import file_lock
+from media import MEDIA_DIR, content_hash
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow is optional; without it the original file is served
+    Image = features = None
+
+# Static image asset pipeline.
+#
+# Large images such as the team logo are served as resized, recompressed
+# variants: /api/assets/ROGO.png?w=128 renders a 128 px wide copy once and
+# stores it under MEDIA_DIR/.variants, named after the source file's content
+# hash, width and format. Later requests (and every worker) reuse that file;
+# a changed source gets a new hash and so a fresh variant.
+
+ASSET_DIR = os.environ.get("FC_SSOA_ASSET_DIR", os.path.dirname(os.path.abspath(__file__)))
+VARIANT_DIR = os.path.join(MEDIA_DIR, ".variants")
+ASSET_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+
+# Only these widths are rendered, so arbitrary ?w= values can't fill the disk
+VARIANT_WIDTHS = (32, 64, 128, 192, 256, 384, 512, 768, 1024)
+
+# Encoder options per output format
+FORMATS = {
+    "webp": {"quality": 82, "method": 6},
+    "png": {"optimize": True},
+}
+
+
+def resolve_asset(name: str, asset_dir: str = ASSET_DIR) -> Optional[str]:
+    """Path of a top-level image in the asset directory, or None"""
+    if "/" in name or "\\" in name or name.startswith("."):
+        return None
+    if os.path.splitext(name)[1].lower() not in ASSET_EXTENSIONS:
+        return None
+    path = os.path.join(asset_dir, name)
+    return path if os.path.isfile(path) else None
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """WebP when the client accepts it (and Pillow can write it), otherwise PNG"""
+    if accept and "image/webp" in accept and features is not None and features.check("webp"):
+        return "webp"
+    return "png"
+
+
+def variant_path(source_hash: str, width: Optional[int], fmt: str) -> str:
+    size = f"w{width}" if width else "full"
+    return os.path.join(VARIANT_DIR, source_hash[:2], f"{source_hash}-{size}.{fmt}")
+
+
+def _render(source: str, target: str, width: Optional[int], fmt: str):
+    with Image.open(source) as image:
+        if width and image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+        if fmt == "png" and image.mode not in ("RGBA", "RGB", "LA", "L", "P"):
+            image = image.convert("RGBA")
+        temporary = f"{target}.{uuid.uuid4().hex}.tmp"
+        try:
+            image.save(temporary, fmt.upper(), **FORMATS[fmt])
+            os.replace(temporary, target)
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+
+def get_variant(source: str, width: Optional[int], fmt: str) -> str:
+    """Path of the variant (full size when width is None), rendering it on first use.
+
+    Without Pillow the original file is returned unchanged.
+    """
+    if Image is None:
+        return source
+
+    target = variant_path(content_hash(source, os.stat(source)), width, fmt)
+    if not os.path.exists(target):
+        # Concurrent requests for a new variant, in any worker, render it once
+        with file_lock(os.path.join(os.path.dirname(target), ".lock")):
+            if not os.path.exists(target):
+                _render(source, target, width, fmt)
+    return target
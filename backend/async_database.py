@@ -0,0 +1,93 @@
+import functools
+from starlette.concurrency import run_in_threadpool
+import database
+import live
+
+
+def _offload(func):
+    """Wrap a blocking database function so it runs in the thread pool"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_in_threadpool(func, *args, **kwargs)
+    return wrapper
+
+# Async variants of the database.py functions. SQLite queries and file
+# I/O run on worker threads, so a slow write never stalls the event loop.
+
+# Changes after every committed write; polled by the response cache and the live hub
+get_data_version = _offload(database.get_data_version)
+
+# Team
+get_team_stats = _offload(database.get_team_stats)
+get_team_summary = _offload(database.get_team_summary)
+get_team_form = _offload(database.get_team_form)
+get_team_streaks = _offload(database.get_team_streaks)
+get_team_splits = _offload(database.get_team_splits)
+
+# Players
+count_players = _offload(database.count_players)
+get_players = _offload(database.get_players)
+get_player_choices = _offload(database.get_player_choices)
+get_player = _offload(database.get_player)
+create_player = _offload(database.create_player)
+update_player = _offload(database.update_player)
+delete_player = _offload(database.delete_player)
+add_player_stats = _offload(database.add_player_stats)
+export_players_csv = _offload(database.export_players_csv)
+get_leaderboard = _offload(database.get_leaderboard)
+get_seasons = _offload(database.get_seasons)
+get_season_table = _offload(database.get_season_table)
+get_player_totals = _offload(database.get_player_totals)
+get_player_ranks = _offload(database.get_player_ranks)
+
+# Matches
+get_matches = _offload(database.get_matches)
+get_match = _offload(database.get_match)
+create_match = _offload(database.create_match)
+update_match = _offload(database.update_match)
+delete_match = _offload(database.delete_match)
+complete_match = _offload(database.complete_match)
+complete_matches = _offload(database.complete_matches)
+
+# Head-to-head
+get_opponent_records = _offload(database.get_opponent_records)
+get_opponent_history = _offload(database.get_opponent_history)
+
+# Ratings and predictions
+get_ratings = _offload(database.get_ratings)
+predict_matches = _offload(database.predict_matches)
+get_upcoming_predictions = _offload(database.get_upcoming_predictions)
+
+# Announcements
+get_announcements = _offload(database.get_announcements)
+get_announcement = _offload(database.get_announcement)
+create_announcement = _offload(database.create_announcement)
+update_announcement = _offload(database.update_announcement)
+delete_announcement = _offload(database.delete_announcement)
+
+# Live matches
+start_live_match = _offload(database.start_live_match)
+record_live_event = _offload(database.record_live_event)
+get_live_snapshot = _offload(database.get_live_snapshot)
+get_live_events = _offload(database.get_live_events)
+
+# One hub per worker, fanning stored events out to SSE subscribers
+live_hub = live.LiveHub(
+    _offload(database.get_live_events_since),
+    _offload(database.get_latest_live_event_id),
+    get_data_version
+)
+
+# Dashboard
+get_dashboard = _offload(database.get_dashboard)
+
+# Search
+search_content = _offload(database.search_content)
+
+# Bulk import / export (export_records returns a generator, so it isn't offloaded)
+import_records = _offload(database.import_records)
+export_records = database.export_records
+
+# Gallery
+get_gallery_page = _offload(database.get_gallery_page)
+get_gallery_item = _offload(database.get_gallery_item)
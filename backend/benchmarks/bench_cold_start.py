@@ -0,0 +1,74 @@
+"""Cold-start time to first byte of a real uvicorn process.
+
+Starts `uvicorn main:app` against a scratch copy of data/ and polls
+GET /api/health until it answers, then prints the app's own startup
+report (/api/health/startup). The first run starts without a database
+(every migration and the CSV import run); later runs reuse it, which is
+what a restarted free-tier instance sees.
+
+    python -m benchmarks.bench_cold_start --runs 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+from benchmarks.common import BACKEND_DIR, use_scratch_data_dir
+
+
+def wait_for_first_byte(url: str, timeout: float) -> float:
+    """Seconds until `url` answers, polling every 10 ms"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                response.read()
+                return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.01)
+    raise TimeoutError(f"{url} did not answer within {timeout}s")
+
+
+def run_once(port: int, timeout: float) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        wait_for_first_byte(f"{base}/api/health", timeout)
+        first_byte = time.perf_counter() - started
+        with urllib.request.urlopen(f"{base}/api/health/startup") as response:
+            report = json.load(response)
+    finally:
+        process.terminate()
+        process.wait()
+    return {"first_byte_ms": round(first_byte * 1000, 1), "report": report}
+
+
+def main(runs: int, port: int, timeout: float):
+    scratch = use_scratch_data_dir()
+    os.remove(os.path.join(scratch, "fc_ssoa.db"))  # first run starts from the CSVs alone
+    os.environ["FC_SSOA_GALLERY_SCAN_DELAY"] = "60"
+
+    for run in range(runs):
+        result = run_once(port, timeout)
+        report = result["report"]
+        phases = "  ".join(f"{phase['name']}={phase['ms']}ms" for phase in report["phases"])
+        label = "empty database" if run == 0 else "existing database"
+        print(f"run {run + 1} ({label}): first byte {result['first_byte_ms']}ms "
+              f"(app ready {report['ready_ms']}ms)")
+        print(f"  {phases}  migrations applied={len(report['migrations_applied'])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    main(args.runs, args.port, args.timeout)
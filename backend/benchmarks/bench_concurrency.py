@@ -0,0 +1,92 @@
+"""Read latency on /api/matches while writes are in flight.
+
+Readers hammer GET /api/matches, first on their own and then alongside
+writers that update players and create matches. Data access runs in the
+thread pool and WAL readers never wait for the writer, but the writers
+still take pool threads and event-loop time, so reads do get somewhat
+slower. The run reports how much the read p99 grew and exits with status 1
+when that's more than --tolerance (50% by default).
+
+    python -m benchmarks.bench_concurrency --readers 8 --writers 4 --seconds 3
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from benchmarks.common import app_client, percentile, seed_matches, use_scratch_data_dir
+
+
+async def reader(client, deadline: float, latencies: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/api/matches")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def writer(client, deadline: float, index: int, writes: list):
+    players = (await client.get("/api/players")).json()
+    n = 0
+    while time.perf_counter() < deadline:
+        player = players[(index + n) % len(players)]
+        response = await client.put(f"/api/players/{player['id']}", json={"phone": f"010-{n:04d}"})
+        response.raise_for_status()
+        response = await client.post("/api/matches", json={
+            "opponent": f"FC Writer {index}",
+            "match_date": "2030-01-01T06:00",
+            "location": "Bench Ground",
+            "home_away": "home",
+        })
+        response.raise_for_status()
+        writes.append(n)
+        n += 1
+
+
+async def run_phase(client, readers: int, writers: int, seconds: float):
+    deadline = time.perf_counter() + seconds
+    latencies, writes = [], []
+    tasks = [reader(client, deadline, latencies) for _ in range(readers)]
+    tasks += [writer(client, deadline, i, writes) for i in range(writers)]
+    await asyncio.gather(*tasks)
+    return latencies, len(writes)
+
+
+def report(label: str, latencies: list, writes: int):
+    print(f"  {label:<16} reads={len(latencies):6d} writes={writes:5d} "
+          f"p50={percentile(latencies, 50) * 1000:7.2f}ms "
+          f"p99={percentile(latencies, 99) * 1000:7.2f}ms")
+
+
+async def main(readers: int, writers: int, seconds: float, matches: int, tolerance: float) -> int:
+    use_scratch_data_dir()
+    from main import app, response_cache
+
+    response_cache.max_entries = 0  # measure the data path, not the response cache
+
+    async with app_client(app) as client:
+        seed_matches(matches)
+        idle = await run_phase(client, readers, 0, seconds)
+        busy = await run_phase(client, readers, writers, seconds)
+
+    print(f"/api/matches read latency, {readers} readers, {matches} seeded matches")
+    report("reads only", *idle)
+    report("reads + writes", *busy)
+
+    growth = percentile(busy[0], 99) / percentile(idle[0], 99) - 1
+    within = growth <= tolerance
+    print(f"Read p99 {'grew' if growth >= 0 else 'fell'} {abs(growth):.0%} with writers "
+          f"({'within' if within else 'over'} the {tolerance:.0%} tolerance)")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--matches", type=int, default=200)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed read p99 growth with writers, e.g. 0.5 = 50%%")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.readers, args.writers, args.seconds, args.matches, args.tolerance)))
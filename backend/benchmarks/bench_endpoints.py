@@ -0,0 +1,341 @@
+"""Throughput, latency and allocations of every API route on a synthetic club.
+
+Builds a dataset with benchmarks.dataset in a scratch copy of data/. Then
+it sends --requests requests to each route in backend/routers/ through the
+in-process ASGI client, --concurrency at a time, with the response cache
+off unless --cache is given. Writes use fresh rows of their own, so every
+request does real work. A second, sequential pass under tracemalloc
+records the peak memory allocated while serving one request.
+
+--output writes the results as JSON. --baseline compares a run against an
+earlier one. The exit status is 1 if any route is slower or allocates more
+than --tolerance allows, or if any request failed.
+
+    python -m benchmarks.bench_endpoints --players 2000 --matches 20000 --announcements 10000 \\
+        --output baseline.json
+    python -m benchmarks.bench_endpoints ... --baseline baseline.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple
+from urllib.parse import quote
+
+from benchmarks.common import app_client, percentile, use_scratch_data_dir
+
+# Routes left out on purpose (GET /api/live/{id}/stream: see bench_live)
+SKIPPED_ROUTES = {("GET", "/api/live/{match_id}/stream")}
+# Differences smaller than these are noise, whatever the ratio
+MIN_LATENCY_DELTA_MS = 1.0
+MIN_ALLOC_DELTA_KB = 16.0
+
+
+class Scenario(NamedTuple):
+    method: str
+    route: str
+    # request number -> keyword arguments for client.request (url, json, content, headers)
+    request: Callable[[int], dict]
+    # Exports and imports are far heavier than everything else and get fewer requests
+    heavy: bool = False
+
+
+def _get(url: str) -> Callable[[int], dict]:
+    return lambda n: {"url": url}
+
+
+def _fixtures(count: int) -> Dict[str, List[str]]:
+    """Rows for the write scenarios to use up, `count` per scenario (ten per bulk completion)"""
+    import database
+
+    def matches(n: int) -> List[str]:
+        return [database.create_match({"opponent": "FC Fixture", "match_date": "2040-01-01T06:00",
+                                       "location": "Fixture Ground", "home_away": "home"})["id"]
+                for _ in range(n)]
+
+    return {
+        "players": [database.create_player({"name": f"Fixture Player {n:05d}", "position": "defender"})["id"]
+                    for n in range(count)],
+        "announcements": [database.create_announcement(
+            {"title": "Fixture", "content": "To be deleted", "author": "Bench"})["id"] for _ in range(count)],
+        "edited": matches(count),
+        "completed": matches(count),
+        "bulk": matches(count * 10),
+        "deleted": matches(count),
+        "live": matches(count),
+    }
+
+
+async def _scenarios(client, fixtures: dict) -> List[Scenario]:
+    async def first(url: str, key: str = "id"):
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.json()[0][key]
+
+    player = quote(await first("/api/players?sort_by=goals"), safe="")
+    match = await first("/api/matches/completed/list")
+    announcement = await first("/api/announcements")
+    opponent = quote(await first("/api/opponents", "opponent"), safe="")
+    season = quote((await client.get("/api/players/seasons/list")).json()[0], safe="")
+    gallery = (await client.get("/api/gallery")).json()["images"]
+    photo = gallery[0]["id"] if gallery else "missing"
+    media = gallery[0]["url"][len("/api/media/"):] if gallery else "missing.jpg"
+    live = fixtures["live"][0]
+    (await client.post(f"/api/live/{live}/start")).raise_for_status()
+
+    players, announcements = fixtures["players"], fixtures["announcements"]
+    new_match = {"opponent": "FC Bench", "match_date": "2040-06-01T06:00",
+                 "location": "Bench Ground", "home_away": "away"}
+    result = {"fc_ssoa_score": 2, "opponent_score": 1,
+              "goals": [{"player_name": players[0], "count": 2}], "players": players[:11]}
+    imported = "\n".join(json.dumps({"title": f"Imported {n}", "content": "Bulk body", "author": "Bench"})
+                         for n in range(100))
+
+    return [
+        Scenario("GET", "/api/health", _get("/api/health")),
+        Scenario("GET", "/api/metrics", _get("/api/metrics")),
+        Scenario("GET", "/api/team/info", _get("/api/team/info")),
+        Scenario("GET", "/api/team/stats", _get("/api/team/stats")),
+        Scenario("GET", "/api/team/members", _get("/api/team/members")),
+        Scenario("GET", "/api/team/form", _get("/api/team/form?last=10")),
+        Scenario("GET", "/api/team/streaks", _get("/api/team/streaks")),
+        Scenario("GET", "/api/team/splits/{split}", _get("/api/team/splits/month")),
+        Scenario("GET", "/api/players", _get("/api/players?sort_by=attack_points")),
+        Scenario("GET", "/api/players/{player_id}", _get(f"/api/players/{player}")),
+        Scenario("GET", "/api/players/top/scorers", _get("/api/players/top/scorers")),
+        Scenario("GET", "/api/players/top/assisters", _get("/api/players/top/assisters")),
+        Scenario("GET", "/api/players/leaderboard/{metric}", _get("/api/players/leaderboard/attack_points")),
+        Scenario("GET", "/api/players/{player_id}/rank", _get(f"/api/players/{player}/rank")),
+        Scenario("GET", "/api/players/{player_id}/stats", _get(f"/api/players/{player}/stats")),
+        Scenario("GET", "/api/players/seasons/list", _get("/api/players/seasons/list")),
+        Scenario("GET", "/api/players/seasons/{season}", _get(f"/api/players/seasons/{season}")),
+        Scenario("GET", "/api/players/export/csv", _get("/api/players/export/csv"), heavy=True),
+        Scenario("POST", "/api/players", lambda n: {
+            "url": "/api/players", "json": {"name": f"Bench Player {n:05d}", "position": "forward"}}),
+        Scenario("PUT", "/api/players/{player_id}", lambda n: {
+            "url": f"/api/players/{player}", "json": {"phone": f"010-{n:04d}"}}),
+        Scenario("DELETE", "/api/players/{player_id}", lambda n: {
+            "url": f"/api/players/{quote(players[n], safe='')}"}),
+        Scenario("GET", "/api/matches", _get("/api/matches?limit=20")),
+        Scenario("GET", "/api/matches/{match_id}", _get(f"/api/matches/{match}")),
+        Scenario("GET", "/api/matches/players-for-stats", _get("/api/matches/players-for-stats")),
+        Scenario("GET", "/api/matches/upcoming/list", _get("/api/matches/upcoming/list")),
+        Scenario("GET", "/api/matches/completed/list", _get("/api/matches/completed/list")),
+        Scenario("GET", "/api/matches/predictions/list", _get("/api/matches/predictions/list")),
+        Scenario("GET", "/api/matches/{match_id}/prediction", _get(f"/api/matches/{fixtures['live'][-1]}/prediction")),
+        Scenario("POST", "/api/matches", lambda n: {"url": "/api/matches", "json": new_match}),
+        Scenario("PUT", "/api/matches/{match_id}", lambda n: {
+            "url": f"/api/matches/{fixtures['edited'][n]}", "json": {"location": f"Ground {n}"}}),
+        Scenario("POST", "/api/matches/{match_id}/complete", lambda n: {
+            "url": f"/api/matches/{fixtures['completed'][n]}/complete", "json": result}),
+        Scenario("POST", "/api/matches/bulk/complete", lambda n: {
+            "url": "/api/matches/bulk/complete",
+            "json": {"matches": [{"match_id": match_id, **result}
+                                 for match_id in fixtures["bulk"][n * 10:n * 10 + 10]]}}),
+        Scenario("DELETE", "/api/matches/{match_id}", lambda n: {
+            "url": f"/api/matches/{fixtures['deleted'][n]}"}),
+        Scenario("GET", "/api/announcements", _get("/api/announcements")),
+        Scenario("GET", "/api/announcements/{announcement_id}", _get(f"/api/announcements/{announcement}")),
+        Scenario("GET", "/api/announcements/latest/list", _get("/api/announcements/latest/list")),
+        Scenario("POST", "/api/announcements", lambda n: {
+            "url": "/api/announcements", "json": {"title": f"Bench {n}", "content": "Body", "author": "Bench"}}),
+        Scenario("PUT", "/api/announcements/{announcement_id}", lambda n: {
+            "url": f"/api/announcements/{announcement}", "json": {"title": f"Edited {n}"}}),
+        Scenario("DELETE", "/api/announcements/{announcement_id}", lambda n: {
+            "url": f"/api/announcements/{announcements[n]}"}),
+        Scenario("GET", "/api/opponents", _get("/api/opponents")),
+        Scenario("GET", "/api/opponents/{opponent}", _get(f"/api/opponents/{opponent}")),
+        Scenario("GET", "/api/opponents/ratings/list", _get("/api/opponents/ratings/list")),
+        Scenario("GET", "/api/gallery", _get("/api/gallery")),
+        Scenario("GET", "/api/gallery/{media_id}", _get(f"/api/gallery/{photo}")),
+        Scenario("POST", "/api/gallery/rescan", lambda n: {"url": "/api/gallery/rescan"}),
+        Scenario("GET", "/api/media/{file_path:path}", _get(f"/api/media/{media}")),
+        Scenario("GET", "/api/assets/{name}", _get("/api/assets/ROGO.png?w=128")),
+        Scenario("GET", "/api/bulk/{entity}/export", _get("/api/bulk/matches/export?format=ndjson"), heavy=True),
+        Scenario("POST", "/api/bulk/{entity}/import", lambda n: {
+            "url": "/api/bulk/announcements/import", "content": imported,
+            "headers": {"Content-Type": "application/x-ndjson"}}, heavy=True),
+        Scenario("GET", "/api/search", _get("/api/search?q=tact")),
+        Scenario("GET", "/api/dashboard", _get("/api/dashboard")),
+        Scenario("POST", "/api/live/{match_id}/start", lambda n: {
+            "url": f"/api/live/{fixtures['live'][n + 1]}/start"}),
+        Scenario("POST", "/api/live/{match_id}/events", lambda n: {
+            "url": f"/api/live/{live}/events", "json": {"kind": "note", "note": f"Minute {n}"}}),
+        Scenario("GET", "/api/live/{match_id}/events", _get(f"/api/live/{live}/events")),
+    ]
+
+
+def _uncovered_routes(app, scenarios: List[Scenario]) -> List[str]:
+    covered = {(scenario.method, scenario.route) for scenario in scenarios} | SKIPPED_ROUTES
+    missing = []
+    for route in app.routes:
+        for method in sorted(getattr(route, "methods", None) or ()):
+            if route.path.startswith("/api/") and method != "HEAD" and (method, route.path) not in covered:
+                missing.append(f"{method} {route.path}")
+    return missing
+
+
+class Counter:
+    """Hands out request numbers; each write scenario consumes one fixture row per number"""
+
+    def __init__(self):
+        self.next = 0
+
+    def take(self) -> int:
+        self.next += 1
+        return self.next - 1
+
+
+async def _load(client, scenario: Scenario, requests: int, concurrency: int, numbers: Counter) -> dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    issued = 0
+
+    async def worker():
+        nonlocal issued
+        while issued < requests:
+            issued += 1
+            started = time.perf_counter()
+            response = await client.request(scenario.method, **scenario.request(numbers.take()))
+            if response.status_code < 400:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": issued,
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1e3, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1e3, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1e3, 3),
+    }
+
+
+async def _allocations(client, scenario: Scenario, samples: int, numbers: Counter) -> float:
+    """Median peak KB allocated (by any thread) while one request is served"""
+    peaks = []
+    for _ in range(samples):
+        arguments = scenario.request(numbers.take())
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await client.request(scenario.method, **arguments)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    return round(statistics.median(peaks) / 1024, 1)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Routes that got slower or allocate more than the baseline allows"""
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline["endpoints"].get(name)
+        if not previous:
+            continue
+        for key, floor in (("p95_ms", MIN_LATENCY_DELTA_MS), ("p99_ms", MIN_LATENCY_DELTA_MS),
+                           ("alloc_kb", MIN_ALLOC_DELTA_KB)):
+            if current[key] > previous[key] * (1 + tolerance) and current[key] - previous[key] > floor:
+                regressions.append(f"{name}: {key} {previous[key]} -> {current[key]}")
+        if current["rps"] * (1 + tolerance) < previous["rps"]:
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+    return regressions
+
+
+async def run(args) -> dict:
+    use_scratch_data_dir()
+    from benchmarks.dataset import generate
+    from main import app, response_cache
+
+    if not args.cache:
+        response_cache.max_entries = 0  # measure the data path, not the response cache
+
+    started = time.perf_counter()
+    dataset = generate(args.players, args.matches, args.announcements, photos=args.photos, seed=args.seed)
+    per_route = args.requests + args.alloc_samples + 2  # warm-up, and the live match itself
+    fixtures = _fixtures(per_route)
+    print(f"Dataset {dataset} ready in {time.perf_counter() - started:.1f}s")
+
+    endpoints = {}
+    async with app_client(app) as client:
+        scenarios = await _scenarios(client, fixtures)
+        for missing in _uncovered_routes(app, scenarios):
+            print(f"  not covered: {missing}")
+        for scenario in scenarios:
+            name = f"{scenario.method} {scenario.route}"
+            requests = max(args.requests // 10, 5) if scenario.heavy else args.requests
+            numbers = Counter()
+            await client.request(scenario.method, **scenario.request(numbers.take()))  # warm up
+            result = await _load(client, scenario, requests, args.concurrency, numbers)
+            tracemalloc.start()
+            try:
+                result["alloc_kb"] = await _allocations(client, scenario, args.alloc_samples, numbers)
+            finally:
+                tracemalloc.stop()
+            endpoints[name] = result
+            failed = f"  {sum(result['errors'].values())} failed {result['errors']}" if result["errors"] else ""
+            print(f"  {name:<44} {result['rps']:8.1f}/s  p50={result['p50_ms']:7.2f}ms  "
+                  f"p95={result['p95_ms']:7.2f}ms  p99={result['p99_ms']:7.2f}ms  "
+                  f"alloc={result['alloc_kb']:8.1f}KB{failed}")
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "dataset": dataset,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "response_cache": args.cache,
+        },
+        "endpoints": endpoints,
+    }
+
+
+def main(args) -> int:
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    failed = [name for name, result in results["endpoints"].items() if result["errors"]]
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["dataset"] != results["meta"]["dataset"]:
+            print(f"Warning: the baseline was measured on a different dataset: {baseline['meta']['dataset']}")
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"{len(regressions)} regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+        for regression in regressions:
+            print(f"  {regression}")
+    if failed:
+        print(f"Requests failed on: {', '.join(failed)}")
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--announcements", type=int, default=10000)
+    parser.add_argument("--photos", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--alloc-samples", type=int, default=5, help="Sequential requests per route under tracemalloc")
+    parser.add_argument("--cache", action="store_true", help="Leave the response cache on")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against the JSON output of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown, e.g. 0.25 = 25%%")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+"""Fan-out latency of live match events to many SSE watchers.
+
+Starts `uvicorn main:app` (optionally with several workers) against a
+scratch copy of data/. The benchmark puts a match live and opens
+--watchers streams on /api/live/{id}/stream. It posts --events goals one
+after another, then completes the match. It reports how long each event
+took to reach every watcher, and checks that every watcher saw every
+event in order, followed by the final score.
+
+    python -m benchmarks.bench_live --watchers 200 --events 20 --workers 1
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.bench_workers import wait_until_ready
+from benchmarks.common import BACKEND_DIR, percentile, use_scratch_data_dir
+
+
+async def watch(client, match_id: str, watchers: int, connected: list, ready: asyncio.Event, received: list):
+    events = []
+    async with client.stream("GET", f"/api/live/{match_id}/stream") as response:
+        response.raise_for_status()
+        name = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                name = line[len("event: "):]
+            elif line.startswith("data: "):
+                if name == "snapshot":
+                    connected.append(1)
+                    if len(connected) == watchers:
+                        ready.set()
+                    continue
+                event = json.loads(line[len("data: "):])
+                events.append((time.perf_counter(), event))
+                if name == "final":
+                    break
+    received.append(events)
+
+
+async def run(base: str, watchers: int, events: int) -> bool:
+    limits = httpx.Limits(max_connections=watchers + 10)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        match = (await client.post("/api/matches", json={
+            "opponent": "FC Live Bench", "match_date": "2031-06-01T06:00",
+            "location": "Live Ground", "home_away": "home",
+        })).json()
+        (await client.post(f"/api/live/{match['id']}/start")).raise_for_status()
+        player = (await client.get("/api/players")).json()[0]["name"]
+
+        ready = asyncio.Event()
+        connected, received = [], []
+        tasks = [asyncio.create_task(watch(client, match["id"], watchers, connected, ready, received))
+                 for _ in range(watchers)]
+        await asyncio.wait_for(ready.wait(), 60)
+
+        sent_at = {}
+        started = time.perf_counter()
+        for minute in range(events):
+            sent = time.perf_counter()
+            response = await client.post(f"/api/live/{match['id']}/events", json={
+                "kind": "goal", "minute": minute, "player_name": player,
+            })
+            response.raise_for_status()
+            sent_at[response.json()["id"]] = sent
+        (await client.post(f"/api/matches/{match['id']}/complete", json={
+            "fc_ssoa_score": events, "opponent_score": 0,
+        })).raise_for_status()
+        await asyncio.wait_for(asyncio.gather(*tasks), 60)
+        elapsed = time.perf_counter() - started
+
+    latencies, broken = [], 0
+    for stream in received:
+        scores = [event["fc_ssoa_score"] for _, event in stream if event["kind"] == "goal"]
+        final = stream[-1][1] if stream else None
+        if scores != list(range(1, events + 1)) or not final or final["kind"] != "final" \
+                or final["fc_ssoa_score"] != events:
+            broken += 1
+        latencies.extend(at - sent_at[event["id"]] for at, event in stream if event["id"] in sent_at)
+
+    print(f"{watchers} watchers, {events} events in {elapsed:.2f}s")
+    print(f"  delivery  p50={percentile(latencies, 50) * 1e3:7.2f}ms  "
+          f"p95={percentile(latencies, 95) * 1e3:7.2f}ms  p99={percentile(latencies, 99) * 1e3:7.2f}ms")
+    print(f"  streams missing or misordering events: {broken} of {len(received)}")
+    return broken == 0 and len(received) == watchers
+
+
+def main(watchers: int, events: int, workers: int, port: int) -> int:
+    use_scratch_data_dir()
+    env = {**os.environ, "FC_SSOA_GALLERY_SCAN_DELAY": "600"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_until_ready(base, timeout=60))
+        ok = asyncio.run(run(base, watchers, events))
+    finally:
+        server.terminate()
+        server.wait()
+    print("all watchers consistent" if ok else "INCONSISTENT")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--watchers", type=int, default=200)
+    parser.add_argument("--events", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+    sys.exit(main(args.watchers, args.events, args.workers, args.port))
@@ -0,0 +1,82 @@
+"""Payload size and serialization time for the list endpoints.
+
+For /api/matches and /api/players this reports the body size with no
+compression, gzip and brotli, the time to encode the body with the stdlib
+JSON encoder (the old JSONResponse) and orjson (the default response class
+now), the time to compress it, and the end-to-end request latency per
+Accept-Encoding with the response cache disabled.
+
+    python -m benchmarks.bench_payload --matches 500 --rounds 200
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import app_client, percentile, seed_matches, use_scratch_data_dir
+
+PATHS = ("/api/matches", "/api/players")
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def time_call(func, rounds: int) -> float:
+    """Median seconds per call of func()"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 50)
+
+
+async def request_latency(client, path: str, encoding: str, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = await client.get(path, headers={"accept-encoding": encoding})
+        response.raise_for_status()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 50)
+
+
+async def main(matches: int, rounds: int):
+    use_scratch_data_dir()
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from compression import compress
+    from main import app, response_cache
+
+    response_cache.max_entries = 0  # every request renders and compresses its body
+
+    async with app_client(app) as client:
+        seed_matches(matches)
+        for path in PATHS:
+            content = (await client.get(path, headers={"accept-encoding": "identity"})).json()
+            body = ORJSONResponse(content).body
+            print(f"{path}  ({len(content)} items)")
+
+            print("  size       " + "  ".join(
+                f"{encoding}={len(body if encoding == 'identity' else compress(body, encoding)):8d}B"
+                for encoding in ENCODINGS
+            ))
+            stdlib = time_call(lambda: JSONResponse(content), rounds)
+            fast = time_call(lambda: ORJSONResponse(content), rounds)
+            print(f"  encode     json={stdlib * 1e3:7.3f}ms  orjson={fast * 1e3:7.3f}ms  "
+                  f"speedup={stdlib / fast if fast else 0:5.1f}x")
+            print("  compress   " + "  ".join(
+                f"{encoding}={time_call(lambda: compress(body, encoding), rounds) * 1e3:7.3f}ms"
+                for encoding in ENCODINGS[1:]
+            ))
+            latencies = [
+                (encoding, await request_latency(client, path, encoding, rounds))
+                for encoding in ENCODINGS
+            ]
+            print("  request    " + "  ".join(
+                f"{encoding}={latency * 1e3:7.3f}ms" for encoding, latency in latencies
+            ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.matches, args.rounds))
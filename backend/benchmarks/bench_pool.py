@@ -0,0 +1,81 @@
+"""Requests/sec on /api/matches with and without the connection pool.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_pool --matches 200 --requests 500
+"""
+import argparse
+import asyncio
+import sqlite3
+
+from benchmarks.common import app_client, requests_per_second, seed_matches, use_scratch_data_dir
+
+
+class _Rows(list):
+    """Rows already read from a closed connection, with the cursor methods callers use"""
+
+    def fetchall(self):
+        return list(self)
+
+    def fetchone(self):
+        return self[0] if self else None
+
+
+class _OneShotConnection(sqlite3.Connection):
+    """Runs one statement, reads its rows and closes, like the old connect/query/close helpers"""
+
+    def execute(self, *args):
+        try:
+            return _Rows(super().execute(*args).fetchall())
+        finally:
+            self.close()
+
+
+class UnpooledConnections:
+    """Stand-in for the old behaviour: a fresh connection for every call, closed after its query"""
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def connection(self):
+        conn = sqlite3.connect(self._pool.db_path, factory=_OneShotConnection)
+        conn.row_factory = sqlite3.Row
+        conn.isolation_level = None
+        return conn
+
+    def transaction(self):
+        return self._pool.transaction()
+
+    def data_version(self):
+        return self._pool.data_version()
+
+
+async def main(matches: int, total: int):
+    use_scratch_data_dir()
+    import database
+    from main import app, response_cache
+
+    response_cache.max_entries = 0  # measure the data path, not the response cache
+
+    async with app_client(app) as client:
+        seed_matches(matches)
+        pooled = await requests_per_second(client, "/api/matches", total)
+
+        real_pool = database.pool
+        database.pool = UnpooledConnections(real_pool)
+        try:
+            unpooled = await requests_per_second(client, "/api/matches", total)
+        finally:
+            database.pool = real_pool
+
+    print(f"/api/matches with {matches} matches, {total} requests")
+    print(f"  per-call connections: {unpooled:8.1f} req/s")
+    print(f"  pooled connections:   {pooled:8.1f} req/s  ({pooled / unpooled:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.matches, args.requests))
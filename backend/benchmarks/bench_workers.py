@@ -0,0 +1,154 @@
+"""Consistency and throughput with several uvicorn worker processes.
+
+Starts `uvicorn main:app --workers N` against a scratch copy of data/.
+Writers create and complete matches (a 3-1 win with one goal for the same
+player) while readers poll /api/team/stats and the player's record. Every
+request opens a new connection, so consecutive requests land on different
+workers. A read is stale when it reports fewer wins or goals than writes
+already acknowledged before the read was sent. This can only happen if a
+worker served data or a cached response from before another worker's write.
+
+At the end, every worker must agree on the exact totals. The exit status
+is 1 when any check fails.
+
+    python -m benchmarks.bench_workers --workers 4 --writers 4 --readers 8 --matches 25
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import BACKEND_DIR, percentile, use_scratch_data_dir
+
+
+async def wait_until_ready(base: str, timeout: float):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+    raise TimeoutError(f"{base} did not start within {timeout}s")
+
+
+async def read_totals(client, player_id: str):
+    stats, player = await asyncio.gather(
+        client.get("/api/team/stats"), client.get(f"/api/players/{player_id}")
+    )
+    stats.raise_for_status()
+    player.raise_for_status()
+    return stats.json()["wins"], player.json()["goals"]
+
+
+class LoadTest:
+    def __init__(self, client, player: dict, baseline: tuple):
+        self.client = client
+        self.player = player
+        self.baseline_wins, self.baseline_goals = baseline
+        self.acknowledged = 0  # completed wins whose response has arrived
+        self.writers_done = False
+        self.stale_reads = []
+        self.read_latencies = []
+        self.write_latencies = []
+
+    async def writer(self, index: int, matches: int):
+        for n in range(matches):
+            started = time.perf_counter()
+            response = await self.client.post("/api/matches", json={
+                "opponent": f"FC Worker {index}",
+                "match_date": f"2031-{1 + n % 12:02d}-{1 + n % 28:02d}T06:00",
+                "location": "Load Test Ground",
+                "home_away": "home",
+            })
+            response.raise_for_status()
+            response = await self.client.post(f"/api/matches/{response.json()['id']}/complete", json={
+                "fc_ssoa_score": 3,
+                "opponent_score": 1,
+                "goals": [{"player_name": self.player["name"], "count": 1}],
+                "players": [self.player["name"]],
+            })
+            response.raise_for_status()
+            self.write_latencies.append(time.perf_counter() - started)
+            self.acknowledged += 1
+
+    async def reader(self):
+        while not self.writers_done:
+            floor = self.acknowledged
+            started = time.perf_counter()
+            wins, goals = await read_totals(self.client, self.player["id"])
+            self.read_latencies.append(time.perf_counter() - started)
+            if wins < self.baseline_wins + floor or goals < self.baseline_goals + floor:
+                self.stale_reads.append((floor, wins - self.baseline_wins, goals - self.baseline_goals))
+
+
+async def run(base: str, workers: int, writers: int, readers: int, matches: int) -> bool:
+    # No keep-alive: every request is a fresh connection, accepted by whichever worker is free
+    limits = httpx.Limits(max_keepalive_connections=0, max_connections=writers + readers * 2)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30) as client:
+        player = (await client.get("/api/players")).json()[0]
+        test = LoadTest(client, player, await read_totals(client, player["id"]))
+
+        started = time.perf_counter()
+        reader_tasks = [asyncio.create_task(test.reader()) for _ in range(readers)]
+        await asyncio.gather(*(test.writer(index, matches) for index in range(writers)))
+        test.writers_done = True
+        await asyncio.gather(*reader_tasks)
+        elapsed = time.perf_counter() - started
+
+        expected = writers * matches
+        final = [await read_totals(client, player["id"]) for _ in range(workers * 4)]
+        mismatched = [
+            totals for totals in final
+            if totals != (test.baseline_wins + expected, test.baseline_goals + expected)
+        ]
+
+    reads, writes = len(test.read_latencies), len(test.write_latencies)
+    print(f"{workers} workers, {writers} writers x {matches} matches, {readers} readers, {elapsed:.2f}s")
+    print(f"  writes  {writes:6d}  {writes / elapsed:7.1f}/s  "
+          f"p50={percentile(test.write_latencies, 50) * 1e3:7.2f}ms  "
+          f"p99={percentile(test.write_latencies, 99) * 1e3:7.2f}ms")
+    print(f"  reads   {reads:6d}  {reads / elapsed:7.1f}/s  "
+          f"p50={percentile(test.read_latencies, 50) * 1e3:7.2f}ms  "
+          f"p99={percentile(test.read_latencies, 99) * 1e3:7.2f}ms")
+    print(f"  stale reads: {len(test.stale_reads)}  "
+          f"final totals disagreeing with {expected} writes: {len(mismatched)} of {len(final)}")
+    for floor, wins, goals in test.stale_reads[:5]:
+        print(f"    after {floor} acknowledged writes a read saw +{wins} wins, +{goals} goals")
+    return not test.stale_reads and not mismatched
+
+
+def main(workers: int, writers: int, readers: int, matches: int, port: int) -> int:
+    use_scratch_data_dir()
+    env = {**os.environ, "FC_SSOA_GALLERY_SCAN_DELAY": "600"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_until_ready(base, timeout=60))
+        consistent = asyncio.run(run(base, workers, writers, readers, matches))
+    finally:
+        server.terminate()
+        server.wait()
+    print("consistent" if consistent else "INCONSISTENT")
+    return 0 if consistent else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--matches", type=int, default=25)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    sys.exit(main(args.workers, args.writers, args.readers, args.matches, args.port))
@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def use_scratch_data_dir() -> str:
+    """Point the backend at a throwaway copy of data/ so benchmarks never touch real data.
+
+    Must be called before `database` is imported.
+    """
+    scratch = tempfile.mkdtemp(prefix="fc_ssoa_bench_")
+    for name in os.listdir(os.path.join(BACKEND_DIR, "data")):
+        if name.endswith(".csv") or name.endswith(".db"):
+            shutil.copy(os.path.join(BACKEND_DIR, "data", name), scratch)
+    os.environ["FC_SSOA_DATA_DIR"] = scratch
+    return scratch
+
+
+@asynccontextmanager
+async def app_client(app):
+    """httpx client for the app with its lifespan (migrations, seeding) run around it"""
+    import httpx
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+
+
+def seed_matches(count: int):
+    """Insert `count` synthetic matches through the regular data functions"""
+    from database import create_match
+
+    for i in range(count):
+        create_match({
+            "match_date": f"20{10 + i % 15:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}T06:00",
+            "opponent": f"FC Bench {i % 40}",
+            "location": "Bench Ground",
+            "home_away": "home" if i % 2 else "away",
+        })
+
+
+async def requests_per_second(client, path: str, total: int) -> float:
+    """Issue `total` sequential GETs against `path` and return the request rate"""
+    await client.get(path)  # warm up
+    start = time.perf_counter()
+    for _ in range(total):
+        response = await client.get(path)
+        response.raise_for_status()
+    return total / (time.perf_counter() - start)
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
@@ -0,0 +1,154 @@
+"""Synthetic club data at configurable scale.
+
+Everything goes through the regular database functions, so the derived
+data (team stats, head-to-head records, the season ledger, the search
+index) matches what real usage would produce:
+
+- import_records adds players, scheduled matches and announcements;
+- complete_matches completes every past match, in batches, with goals,
+  assists and appearances by the generated players;
+- the gallery gets small generated JPEGs, indexed by refresh_gallery.
+
+Call use_scratch_data_dir() before importing this module. It can also
+build a dataset on its own, which is handy for looking at a big club in
+the frontend:
+
+    python -m benchmarks.dataset --players 2000 --matches 20000 --announcements 10000
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+COMPLETE_BATCH = 500
+SEASONS = 20
+POSITIONS = ("goalkeeper", "defender", "midfielder", "forward")
+GROUNDS = ("Riverside Park", "Hangang Field", "North Stadium", "School Ground", "Harbour Pitch")
+AUTHORS = ("Coach Kim", "Captain Lee", "Manager Park", "Treasurer Choi")
+WORDS = ("training", "match", "kit", "schedule", "pitch", "fees", "dinner", "tournament",
+         "early", "morning", "rain", "league", "friendly", "keeper", "tactics", "season")
+
+
+def _player_rows(count: int, rng: random.Random) -> List[dict]:
+    return [{
+        "name": f"Synthetic Player {i:05d}",
+        "position": POSITIONS[i % len(POSITIONS)],
+        "jersey_number": 1 + i % 99,
+        "join_date": (date(2015, 1, 1) + timedelta(days=rng.randrange(3650))).isoformat(),
+    } for i in range(count)]
+
+
+def _match_rows(count: int, opponents: int, rng: random.Random) -> List[dict]:
+    # Spread evenly over SEASONS years, oldest first, ending a month after today
+    last = datetime.combine(date.today() + timedelta(days=30), datetime.min.time())
+    step = timedelta(days=SEASONS * 365) / max(count, 1)
+    first = last - step * count
+    return [{
+        "opponent": f"FC Synthetic {rng.randrange(opponents):03d}",
+        "match_date": (first + step * i).replace(hour=6, minute=0).isoformat(timespec="minutes"),
+        "location": rng.choice(GROUNDS),
+        "home_away": rng.choice(("home", "away")),
+        "notes": " ".join(rng.choices(WORDS, k=6)),
+    } for i in range(count)]
+
+
+def _announcement_rows(count: int, rng: random.Random) -> List[dict]:
+    first = date.today() - timedelta(days=count // 4)
+    return [{
+        "title": " ".join(rng.choices(WORDS, k=4)).capitalize(),
+        "content": " ".join(rng.choices(WORDS, k=rng.randrange(20, 120))),
+        "author": rng.choice(AUTHORS),
+        "created_at": f"{first + timedelta(days=i // 4)}T{6 + i % 4:02d}:00:00",
+    } for i in range(count)]
+
+
+def _completion(match_id: str, names: List[str], rng: random.Random) -> dict:
+    squad = rng.sample(names, min(11, len(names)))
+    scored = rng.randrange(6)
+    goals: Dict[str, int] = {}
+    assists: Dict[str, int] = {}
+    for _ in range(scored):
+        scorer = rng.choice(squad)
+        goals[scorer] = goals.get(scorer, 0) + 1
+        if rng.random() < 0.7:
+            assister = rng.choice(squad)
+            assists[assister] = assists.get(assister, 0) + 1
+    return {
+        "match_id": match_id,
+        "fc_ssoa_score": scored,
+        "opponent_score": rng.randrange(5),
+        "goal_scorers": [{"player_name": name, "count": count} for name, count in goals.items()],
+        "assist_providers": [{"player_name": name, "count": count} for name, count in assists.items()],
+        "appearances": squad,
+    }
+
+
+def _write_photos(media_dir: str, count: int, rng: random.Random) -> int:
+    try:
+        from PIL import Image
+    except ImportError:
+        return 0
+    folder = os.path.join(media_dir, "synthetic")
+    os.makedirs(folder, exist_ok=True)
+    for i in range(count):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        Image.new("RGB", (640, 480), color).save(os.path.join(folder, f"photo_{i:05d}.jpg"), quality=80)
+    return count
+
+
+def generate(players: int = 2000, matches: int = 20000, announcements: int = 10000,
+             opponents: int = 200, photos: int = 100, seed: int = 0) -> dict:
+    """Add a synthetic club to the current database and return what was created"""
+    import database
+    from media import MEDIA_DIR
+
+    rng = random.Random(seed)
+    database.migrate_db()
+    database.seed_db()
+
+    def run_import(entity: str, rows: List[dict]) -> int:
+        result = database.import_records(entity, list(enumerate(rows, start=1)))
+        if result["errors"]:
+            raise RuntimeError(f"{entity} import failed: {result['errors'][:3]}")
+        return result["imported"]
+
+    player_rows = _player_rows(players, rng)
+    created = {"players": run_import("players", player_rows)}
+    created["matches"] = run_import("matches", _match_rows(matches, opponents, rng))
+    created["announcements"] = run_import("announcements", _announcement_rows(announcements, rng))
+
+    # Every match before today gets a result; the last month's worth stays scheduled
+    names = [row["name"] for row in player_rows] or [p["name"] for p in database.get_player_choices()]
+    to_complete = database.get_matches(status="scheduled", date_to=date.today().isoformat(),
+                                       order="asc", with_stats=False)
+    for start in range(0, len(to_complete), COMPLETE_BATCH):
+        batch = to_complete[start:start + COMPLETE_BATCH]
+        database.complete_matches([_completion(match["id"], names, rng) for match in batch])
+    created["completed"] = len(to_complete)
+
+    created["photos"] = _write_photos(MEDIA_DIR, photos, rng)
+    database.refresh_gallery()
+    return created
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--announcements", type=int, default=10000)
+    parser.add_argument("--opponents", type=int, default=200)
+    parser.add_argument("--photos", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="Write here instead of a scratch copy of data/")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.environ["FC_SSOA_DATA_DIR"] = os.path.abspath(args.data_dir)
+    else:
+        from benchmarks.common import use_scratch_data_dir
+        use_scratch_data_dir()
+    started = time.perf_counter()
+    counts = generate(args.players, args.matches, args.announcements, args.opponents, args.photos, seed=args.seed)
+    print(f"Generated {counts} in {os.environ['FC_SSOA_DATA_DIR']} ({time.perf_counter() - started:.1f}s)")
@@ -0,0 +1,258 @@
+import codecs
+import csv
+import io
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+from models import AnnouncementImport, MatchImport, PlayerImport
+
+# Bulk import / export of players, matches and announcements.
+#
+# Imports arrive as CSV (header row of field names) or NDJSON (one object
+# per line). The body is decoded and parsed chunk by chunk, but the parsed
+# records are collected in memory (at most IMPORT_MAX_ROWS of them): an
+# import is all-or-nothing, so every row is validated before the valid rows
+# are written with batched executemany calls in one transaction by
+# database.import_records. Only exports stream end to end.
+# Exports are generators reading keyset-ordered batches of EXPORT_BATCH
+# rows, so a large table is never held in memory.
+
+IMPORT_MAX_ROWS = int(os.environ.get("FC_SSOA_IMPORT_MAX_ROWS", "50000"))
+EXPORT_BATCH = 500
+INSERT_BATCH = 500
+
+IMPORT_MODELS: Dict[str, type] = {
+    "players": PlayerImport,
+    "matches": MatchImport,
+    "announcements": AnnouncementImport,
+}
+
+EXPORT_COLUMNS = {
+    "players": ["id", "name", "position", "jersey_number", "phone", "email", "join_date",
+                "goals", "assists", "matches_played"],
+    "matches": ["id", "match_date", "opponent", "location", "home_away", "status",
+                "fc_ssoa_score", "opponent_score", "notes", "goal_scorers", "assist_providers",
+                "created_at"],
+    "announcements": ["id", "title", "content", "author", "created_at", "updated_at"],
+}
+
+# Columns holding JSON text, decoded for NDJSON output
+JSON_COLUMNS = {"goal_scorers", "assist_providers"}
+
+
+class ImportTooLarge(Exception):
+    """Raised when an import body holds more than IMPORT_MAX_ROWS rows"""
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream as UTF-8 (BOM tolerated) and yield complete lines"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, dict]]:
+    header = None
+    record_lines: List[str] = []
+    quotes = 0
+    row_number = 0
+    async for line in lines:
+        # A record ends at a newline outside quotes, i.e. once its quote count is even
+        record_lines.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        values = next(csv.reader(["".join(record_lines)]), [])
+        record_lines, quotes = [], 0
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_number += 1
+        if not any(value.strip() for value in values):
+            continue
+        # Empty cells mean "not given", so optional fields fall back to their defaults
+        yield row_number, {
+            name: value for name, value in zip(header, values) if name and value.strip() != ""
+        }
+
+
+async def _ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, object]]:
+    row_number = 0
+    async for line in lines:
+        row_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as e:
+            yield row_number, e
+
+
+async def read_records(chunks: AsyncIterator[bytes], fmt: str,
+                       max_rows: int = IMPORT_MAX_ROWS) -> List[Tuple[int, object]]:
+    """Every (row number, record) pair of a CSV or NDJSON body, collected into a list.
+
+    The body is parsed as it arrives, without buffering it, but all records
+    are kept so the import can be validated as a whole; more than
+    `max_rows` raises ImportTooLarge. Unparsable NDJSON lines carry the error.
+    """
+    parser = _csv_records if fmt == "csv" else _ndjson_records
+    records = []
+    async for row_number, record in parser(_lines(chunks)):
+        if len(records) >= max_rows:
+            raise ImportTooLarge(f"Imports are limited to {max_rows} rows")
+        records.append((row_number, record))
+    return records
+
+
+def _error_messages(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+def validate(entity: str, records: List[Tuple[int, object]]) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+    """Split records into (row number, validated data) pairs and per-row errors"""
+    model: BaseModel = IMPORT_MODELS[entity]
+    valid, errors = [], []
+    for row_number, record in records:
+        if isinstance(record, Exception):
+            errors.append({"row": row_number, "errors": [f"Invalid JSON: {record}"]})
+            continue
+        if not isinstance(record, dict):
+            errors.append({"row": row_number, "errors": ["Expected an object"]})
+            continue
+        try:
+            data = model.model_validate(record).model_dump(mode="json")
+        except ValidationError as e:
+            errors.append({"row": row_number, "errors": _error_messages(e)})
+            continue
+        if entity == "matches" and data["status"] == "completed" and (
+                data["fc_ssoa_score"] is None or data["opponent_score"] is None):
+            errors.append({"row": row_number, "errors": ["completed matches need both scores"]})
+            continue
+        valid.append((row_number, data))
+    return valid, errors
+
+
+def _assign_ids(entity: str, rows: List[Tuple[int, dict]]):
+    now = datetime.now().isoformat()
+    for _, data in rows:
+        if entity == "players":
+            data["id"] = data["name"]  # same rule as create_player
+            continue
+        data["id"] = data.get("id") or str(uuid.uuid4())
+        data["created_at"] = data.get("created_at") or now
+        if entity == "announcements":
+            data["updated_at"] = data.get("updated_at") or data["created_at"]
+
+
+def find_conflicts(conn, entity: str, rows: List[Tuple[int, dict]]) -> List[dict]:
+    """Errors for rows whose id already exists, in the table or earlier in the same import"""
+    _assign_ids(entity, rows)
+    existing = set()
+    ids = [data["id"] for _, data in rows]
+    for start in range(0, len(ids), INSERT_BATCH):
+        batch = ids[start:start + INSERT_BATCH]
+        placeholders = ", ".join("?" for _ in batch)
+        existing.update(
+            row[0] for row in conn.execute(f"SELECT id FROM {entity} WHERE id IN ({placeholders})", batch)
+        )
+
+    errors, seen = [], set()
+    for row_number, data in rows:
+        if data["id"] in existing:
+            errors.append({"row": row_number, "errors": [f"id {data['id']!r} already exists"]})
+        elif data["id"] in seen:
+            errors.append({"row": row_number, "errors": [f"id {data['id']!r} appears twice in this import"]})
+        seen.add(data["id"])
+    return errors
+
+
+INSERTS = {
+    "players": '''
+        INSERT INTO players (id, name, position, jersey_number, phone, email, join_date,
+                             goals, assists, matches_played)
+        VALUES (:id, :name, :position, :jersey_number, :phone, :email, :join_date,
+                :goals, :assists, :matches_played)
+    ''',
+    "matches": '''
+        INSERT INTO matches (id, match_date, opponent, location, home_away, status,
+                             fc_ssoa_score, opponent_score, notes, goal_scorers,
+                             assist_providers, created_at)
+        VALUES (:id, :match_date, :opponent, :location, :home_away, :status,
+                :fc_ssoa_score, :opponent_score, :notes, NULL, NULL, :created_at)
+    ''',
+    "announcements": '''
+        INSERT INTO announcements (id, title, content, author, created_at, updated_at)
+        VALUES (:id, :title, :content, :author, :created_at, :updated_at)
+    ''',
+}
+
+
+def insert(conn, entity: str, rows: List[dict]):
+    """Insert validated rows in batches of INSERT_BATCH"""
+    for start in range(0, len(rows), INSERT_BATCH):
+        conn.executemany(INSERTS[entity], rows[start:start + INSERT_BATCH])
+
+
+def iter_rows(connection: Callable, entity: str) -> Iterator[dict]:
+    """Every row of an entity's table, read in keyset batches on rowid.
+
+    `connection` is called for each batch, so the generator can be resumed
+    on any thread (StreamingResponse iterates sync generators in the
+    thread pool) and always uses that thread's pooled connection.
+    """
+    columns = ", ".join(EXPORT_COLUMNS[entity])
+    last_rowid = 0
+    while True:
+        rows = connection().execute(
+            f"SELECT rowid, {columns} FROM {entity} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (last_rowid, EXPORT_BATCH)
+        ).fetchall()
+        for row in rows:
+            record = dict(row)
+            last_rowid = record.pop("rowid")
+            yield record
+        if len(rows) < EXPORT_BATCH:
+            return
+
+
+def csv_lines(entity: str, rows: Iterator[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS[entity])
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_lines(rows: Iterator[dict]) -> Iterator[str]:
+    lines = []
+    for row in rows:
+        for column in JSON_COLUMNS.intersection(row):
+            if row[column]:
+                row[column] = json.loads(row[column])
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if len(lines) >= EXPORT_BATCH:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
@@ -0,0 +1,198 @@
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+
+from compression import negotiate_encoding
+
+# Response cache settings (override through environment variables)
+CACHE_MAX_ENTRIES = int(os.environ.get("FC_SSOA_CACHE_MAX_ENTRIES", "512"))
+CACHE_MAX_BODY_BYTES = int(os.environ.get("FC_SSOA_CACHE_MAX_BODY_BYTES", str(1024 * 1024)))
+CACHE_MAX_AGE = int(os.environ.get("FC_SSOA_CACHE_MAX_AGE", "0"))
+
+# Read-heavy API routes whose responses only change when data is written
+CACHEABLE_PREFIXES = (
+    "/api/team",
+    "/api/matches",
+    "/api/players",
+    "/api/announcements",
+    "/api/opponents",
+    "/api/gallery",
+    "/api/search",
+    "/api/dashboard",
+)
+
+
+class CachedResponse:
+    __slots__ = ("status", "headers", "body", "etag")
+
+    def __init__(self, status: int, headers: list, body: bytes, etag: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+
+
+class ResponseCache:
+    """LRU of rendered responses, valid for a single data version.
+
+    Every committed write bumps the data version (see database.get_data_version),
+    and the first lookup after a bump drops all entries rendered before it.
+    `version_source` is awaited, so the SQLite read behind it runs off the
+    event loop.
+    """
+
+    def __init__(self, version_source: Callable[[], Awaitable[int]], max_entries: int = CACHE_MAX_ENTRIES):
+        self.version_source = version_source
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], CachedResponse]" = OrderedDict()
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    async def current_version(self) -> int:
+        version = await self.version_source()
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+        return version
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[CachedResponse]:
+        """The entry for `key`, as of the last current_version() call"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def put(self, key: Tuple[str, str, str], version: int, entry: CachedResponse):
+        # Never store a response rendered against data that has since changed
+        if version != await self.current_version():
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "data_version": self._version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def cache_control_header() -> bytes:
+    if CACHE_MAX_AGE > 0:
+        return f"public, max-age={CACHE_MAX_AGE}".encode()
+    return b"no-cache"
+
+
+def _etag_matches(if_none_match: Optional[bytes], etag: bytes) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(b",")]
+    return b"*" in candidates or etag in candidates or b"W/" + etag in candidates
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving cached GET responses with ETag / If-None-Match support"""
+
+    def __init__(self, app, cache: ResponseCache, prefixes: Tuple[str, ...] = CACHEABLE_PREFIXES):
+        self.app = app
+        self.cache = cache
+        self.prefixes = prefixes
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] != "GET"
+                or not scope["path"].startswith(self.prefixes)):
+            await self.app(scope, receive, send)
+            return
+
+        # Compression runs inside this middleware, so each encoding is its own entry
+        key = (scope["path"], self._normalized_query(scope), negotiate_encoding(scope) or "identity")
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value
+
+        version = await self.cache.current_version()
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.hits += 1
+            await self._send_entry(send, entry, if_none_match)
+            return
+
+        self.cache.misses += 1
+        start_message = None
+        chunks = []
+        passthrough = False
+
+        async def capture(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                if not self._is_cacheable(message):
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                body = b"".join(chunks)
+                entry = self._build_entry(start_message, body)
+                await self.cache.put(key, version, entry)
+                await self._send_entry(send, entry, if_none_match)
+
+        await self.app(scope, receive, capture)
+
+    @staticmethod
+    def _normalized_query(scope) -> str:
+        query = scope.get("query_string", b"").decode("latin-1")
+        return "&".join(sorted(part for part in query.split("&") if part))
+
+    @staticmethod
+    def _is_cacheable(start_message) -> bool:
+        if start_message["status"] != 200:
+            return False
+        for name, value in start_message.get("headers", []):
+            if name == b"content-length":
+                return int(value) <= CACHE_MAX_BODY_BYTES
+        return False  # streamed responses are passed through untouched
+
+    @staticmethod
+    def _build_entry(start_message, body: bytes) -> CachedResponse:
+        etag = b'"' + hashlib.blake2b(body, digest_size=12).hexdigest().encode() + b'"'
+        headers = [
+            (name, value) for name, value in start_message.get("headers", [])
+            if name not in (b"etag", b"cache-control")
+        ]
+        headers.append((b"etag", etag))
+        headers.append((b"cache-control", cache_control_header()))
+        return CachedResponse(start_message["status"], headers, body, etag)
+
+    async def _send_entry(self, send, entry: CachedResponse, if_none_match: Optional[bytes]):
+        if _etag_matches(if_none_match, entry.etag):
+            self.cache.not_modified += 1
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(b"etag", entry.etag), (b"cache-control", cache_control_header())],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": entry.status, "headers": entry.headers})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -0,0 +1,175 @@
+import gzip
+import os
+import zlib
+from typing import Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is used on its own without it
+    brotli = None
+
+# Response compression settings (override through environment variables)
+COMPRESS_MIN_BYTES = int(os.environ.get("FC_SSOA_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("FC_SSOA_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("FC_SSOA_BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/", "application/javascript", "image/svg+xml")
+
+# Media files and image variants are already compressed and served with
+# byte ranges, which a re-encoded body would break.
+SKIP_PREFIXES = ("/api/media", "/api/assets")
+
+
+def negotiate_encoding(scope) -> Optional[str]:
+    """'br' or 'gzip' if the client accepts it, else None (identity)"""
+    if scope["type"] != "http" or scope["path"].startswith(SKIP_PREFIXES):
+        return None
+    accept = ""
+    for name, value in scope["headers"]:
+        if name == b"accept-encoding":
+            accept = value.decode("latin-1").lower()
+    accepted = set()
+    for part in accept.split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor for streamed (chunked) response bodies"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._compress, self._finish = self._compressor.process, self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._compress, self._finish = self._compressor.compress, self._compressor.flush
+
+    def feed(self, chunk: bytes, last: bool) -> bytes:
+        data = self._compress(chunk) if chunk else b""
+        return data + self._finish() if last else data
+
+
+def _is_compressible(start_message) -> Tuple[bool, Optional[int]]:
+    """Whether a response may be compressed, and its declared length if any"""
+    if start_message["status"] < 200 or start_message["status"] in (204, 206, 304):
+        return False, None
+    content_type, length = b"", None
+    for name, value in start_message.get("headers", []):
+        if name == b"content-encoding":
+            return False, None
+        if name == b"content-type":
+            content_type = value
+        elif name == b"content-length":
+            length = int(value)
+    content_type = content_type.decode("latin-1")
+    # Event streams must reach the client event by event, not when a compressor block fills
+    if not content_type.startswith(COMPRESSIBLE_TYPES) or content_type.startswith("text/event-stream"):
+        return False, None
+    return True, length
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing JSON/text responses with brotli or gzip.
+
+    Bodies with a Content-Length under COMPRESS_MIN_BYTES are sent as-is;
+    streamed bodies are compressed chunk by chunk. Any upstream ETag is
+    weakened, since the bytes on the wire no longer match it.
+    """
+
+    def __init__(self, app, min_bytes: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.min_bytes = min_bytes
+
+    async def __call__(self, scope, receive, send):
+        encoding = negotiate_encoding(scope)
+        if encoding is None or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        streamer: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start_message, streamer, passthrough
+            if message["type"] == "http.response.start":
+                compressible, length = _is_compressible(message)
+                if not compressible or (length is not None and length < self.min_bytes):
+                    passthrough = True
+                    if compressible:
+                        message = {**message, "headers": _with_vary(message.get("headers", []))}
+                    await send(message)
+                    return
+                start_message = message
+                if length is None:
+                    streamer = _StreamCompressor(encoding)
+                    await send({**message, "headers": _encoded_headers(message, encoding, None)})
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            more_body = message.get("more_body", False)
+            if streamer is not None:
+                data = streamer.feed(message.get("body", b""), last=not more_body)
+                if data or not more_body:
+                    await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+            if more_body:
+                # Content-Length body sent in several parts: compress it as a stream
+                streamer = _StreamCompressor(encoding)
+                await send({**start_message, "headers": _encoded_headers(start_message, encoding, None)})
+                await send({"type": "http.response.body",
+                            "body": streamer.feed(message.get("body", b""), last=False), "more_body": True})
+                return
+            body = compress(message.get("body", b""), encoding)
+            await send({**start_message, "headers": _encoded_headers(start_message, encoding, len(body))})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, compressing_send)
+
+
+def _with_vary(headers) -> list:
+    headers = list(headers)
+    for i, (name, value) in enumerate(headers):
+        if name == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[i] = (name, value + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
+
+
+def _encoded_headers(start_message, encoding: str, length: Optional[int]) -> list:
+    headers = []
+    for name, value in _with_vary(start_message.get("headers", [])):
+        if name == b"content-length":
+            continue
+        if name == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        headers.append((name, value))
+    headers.append((b"content-encoding", encoding.encode()))
+    if length is not None:
+        headers.append((b"content-length", str(length).encode()))
+    return headers
@@ -1,94 +1,79 @@
 import csv
+import io
 import os
 import uuid
-import sqlite3
 from datetime import datetime
-from typing import Dict, List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 import json
+from db_pool import ConnectionPool
+from file_lock import file_lock
+import team_stats
+import leaderboard
+import ledger
+import head_to_head
+import analytics
+import ratings
+import gallery
+import bulk
+import search
+import live
+import migrations
+import metrics
 
 # Data directory path
-DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DATA_DIR = os.environ.get("FC_SSOA_DATA_DIR", os.path.join(os.path.dirname(__file__), "data"))
 DB_PATH = os.path.join(DATA_DIR, "fc_ssoa.db")
 
-# In-memory storage (players only, others use SQLite)
-players_db: Dict[str, dict] = {}
-team_stats_data: dict = {}  # 팀 전체 전적
+# SQLite connection pool (one long-lived connection per thread). Statements
+# and new connections are counted towards the request being served.
+pool = ConnectionPool(DB_PATH, factory=metrics.TimedConnection, on_connect=metrics.connection_opened)
 
-# SQLite connection
 def get_db_connection():
-    """Get SQLite database connection"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get the calling thread's pooled SQLite connection"""
+    return pool.connection()
 
-def init_sqlite_db():
-    """Initialize SQLite database tables"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Create matches table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS matches (
-            id TEXT PRIMARY KEY,
-            match_date TEXT NOT NULL,
-            opponent TEXT NOT NULL,
-            location TEXT,
-            home_away TEXT DEFAULT 'home',
-            status TEXT DEFAULT 'scheduled',
-            fc_ssoa_score INTEGER,
-            opponent_score INTEGER,
-            notes TEXT,
-            goal_scorers TEXT,
-            assist_providers TEXT,
-            created_at TEXT NOT NULL
-        )
-    ''')
-    
-    # Migration: Add home_away column if it doesn't exist
-    try:
-        cursor.execute("SELECT home_away FROM matches LIMIT 1")
-    except sqlite3.OperationalError:
-        # Column doesn't exist, add it
-        print("Adding home_away column to matches table...")
-        cursor.execute("ALTER TABLE matches ADD COLUMN home_away TEXT DEFAULT 'home'")
-        conn.commit()
-        print("Migration completed!")
-    
-    # Create announcements table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS announcements (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            author TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+def transaction():
+    """Context manager running a block of writes as one transaction"""
+    return pool.transaction()
+
+def get_data_version() -> int:
+    """Changes after every committed write by any worker; response caches compare against it"""
+    return pool.data_version()
+
+def migrate_db() -> List[dict]:
+    """Apply pending schema migrations; returns the ones applied"""
+    return migrations.migrate(transaction)
 
 def get_csv_path(filename: str) -> str:
     return os.path.join(DATA_DIR, filename)
 
-def load_players_from_csv():
-    """Load players from stats_all.csv"""
-    global players_db
-    players_db.clear()
+POSITION_MAP = {
+    "GK": "goalkeeper",
+    "DF": "defender", 
+    "MF": "midfielder",
+    "FW": "forward"
+}
+POSITION_REVERSE_MAP = {position: code for code, position in POSITION_MAP.items()}
+
+PLAYER_FIELDS = ['name', 'position', 'jersey_number', 'phone', 'email', 'join_date']
+
+def import_players_from_csv(cursor) -> int:
+    """One-time import of stats_all.csv into the players table (skipped once it has rows).
+
+    Per-player appearances were never recorded, so imported players start
+    at 0 matches played; only appearances in recorded matches count.
+    """
+    cursor.execute("SELECT COUNT(*) FROM players")
+    if cursor.fetchone()[0] > 0:
+        return 0
     
     csv_path = get_csv_path("stats_all.csv")
     if not os.path.exists(csv_path):
         print(f"Warning: {csv_path} not found")
-        return
-    
-    position_map = {
-        "GK": "goalkeeper",
-        "DF": "defender", 
-        "MF": "midfielder",
-        "FW": "forward"
-    }
+        return 0
     
+    rows = []
     with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -103,82 +88,217 @@ def load_players_from_csv():
             
             player_id = name  # Use name as ID for simplicity
             
-            players_db[player_id] = {
-                "id": player_id,
-                "name": name,
-                "position": position_map.get(position_code, "midfielder"),
-                "jersey_number": int(jersey_str) if jersey_str.isdigit() else None,
-                "phone": None,
-                "email": None,
-                "join_date": "2024-01-01",
-                "goals": int(goals_str) if goals_str.isdigit() else 0,
-                "assists": int(assists_str) if assists_str.isdigit() else 0,
-                "matches_played": 37  # From team_stats.csv
-            }
-
-def save_players_to_csv():
-    """Save players data back to CSV"""
-    csv_path = get_csv_path("stats_all.csv")
+            rows.append((
+                player_id,
+                name,
+                POSITION_MAP.get(position_code, "midfielder"),
+                int(jersey_str) if jersey_str.isdigit() else None,
+                "2024-01-01",
+                int(goals_str) if goals_str.isdigit() else 0,
+                int(assists_str) if assists_str.isdigit() else 0
+            ))
     
-    position_reverse_map = {
-        "goalkeeper": "GK",
-        "defender": "DF",
-        "midfielder": "MF", 
-        "forward": "FW"
-    }
+    cursor.executemany('''
+        INSERT OR IGNORE INTO players (id, name, position, jersey_number, join_date,
+                                       goals, assists, matches_played)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+    ''', rows)
+    print(f"Imported {len(rows)} players from {csv_path}")
+    return len(rows)
+
+def _read_stats_csv(csv_path: str) -> Dict[str, Tuple[int, int]]:
+    """Goals and assists per player name from a stats_*.csv file"""
+    stats = {}
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            name = row.get('이름', '').strip()
+            if not name:
+                continue
+            goals_str = row.get('골', '0').strip()
+            assists_str = row.get('어시', '0').strip()
+            stats[name] = (
+                int(goals_str) if goals_str.isdigit() else 0,
+                int(assists_str) if assists_str.isdigit() else 0
+            )
+    return stats
+
+def import_ledger_from_csv(cursor):
+    """One-time import of the hand-kept season CSVs into the stat ledger.
+
+    Each stats_YY.csv becomes season 20YY. Whatever stats_all.csv holds beyond
+    those seasons goes into the 'legacy' season, so ledger totals match the
+    players table. None of these rows count appearances (they weren't kept).
+    """
+    cursor.execute("SELECT id, goals, assists FROM players")
+    remaining = {row['id']: [row['goals'], row['assists']] for row in cursor.fetchall()}
+    
+    rows = []
+    for filename in sorted(os.listdir(DATA_DIR)):
+        season_code = filename[len("stats_"):-len(".csv")]
+        if not (filename.startswith("stats_") and filename.endswith(".csv") and season_code.isdigit()):
+            continue
+        season = f"20{season_code}" if len(season_code) == 2 else season_code
+        for name, (goals, assists) in _read_stats_csv(get_csv_path(filename)).items():
+            if name not in remaining:
+                continue
+            rows.append((name, season, 0, goals, assists))
+            remaining[name][0] -= goals
+            remaining[name][1] -= assists
     
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        fieldnames = ['포지션', '등번호', '이름', '골', '어시', '공격포인트']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for player in players_db.values():
-            goals = player.get('goals', 0)
-            assists = player.get('assists', 0)
-            writer.writerow({
-                '포지션': position_reverse_map.get(player.get('position'), 'MF'),
-                '등번호': player.get('jersey_number', ''),
-                '이름': player.get('name', ''),
-                '골': goals,
-                '어시': assists,
-                '공격포인트': goals + assists
-            })
-
-def load_team_stats_from_csv():
-    """Load team stats from team_stats.csv"""
-    global team_stats_data
+    for name, (goals, assists) in remaining.items():
+        rows.append((name, ledger.LEGACY_SEASON, 0, max(goals, 0), max(assists, 0)))
     
+    ledger.import_rows(cursor, rows)
+
+def write_players_csv(f):
+    """Write all players to a file object in the stats_all.csv layout"""
+    fieldnames = ['포지션', '등번호', '이름', '골', '어시', '공격포인트']
+    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    writer.writeheader()
+    
+    for player in get_players():
+        goals = player.get('goals') or 0
+        assists = player.get('assists') or 0
+        writer.writerow({
+            '포지션': POSITION_REVERSE_MAP.get(player.get('position'), 'MF'),
+            '등번호': player.get('jersey_number') or '',
+            '이름': player.get('name', ''),
+            '골': goals,
+            '어시': assists,
+            '공격포인트': goals + assists
+        })
+
+def export_players_csv() -> str:
+    """Export players as CSV text (on demand, the players table is the source of truth)"""
+    buffer = io.StringIO()
+    write_players_csv(buffer)
+    metrics.registry.count_csv_write("export")
+    return buffer.getvalue()
+
+def save_players_to_csv(csv_path: Optional[str] = None):
+    """Write a CSV snapshot of the players table (defaults to stats_all.csv).
+
+    Workers take turns through a lock file, and the snapshot replaces the
+    old file in one rename, so readers never see a half-written CSV.
+    """
+    csv_path = csv_path or get_csv_path("stats_all.csv")
+    with file_lock(csv_path + ".lock"):
+        temporary = f"{csv_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temporary, 'w', newline='', encoding='utf-8') as f:
+                write_players_csv(f)
+            os.replace(temporary, csv_path)
+            metrics.registry.count_csv_write("file")
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+def load_team_stats_from_csv() -> dict:
+    """Load the historical team record (팀 전체 전적) from team_stats.csv"""
     csv_path = get_csv_path("team_stats.csv")
     if not os.path.exists(csv_path):
         print(f"Warning: {csv_path} not found")
-        return
+        return {}
     
     with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            team_stats_data = {
+            return {
                 "total_matches": int(row.get('전적', 0)),
                 "wins": int(row.get('승리', 0)),
                 "draws": int(row.get('무승부', 0)),
                 "losses": int(row.get('패배', 0)),
                 "goals_scored": int(row.get('득점', 0)),
                 "goals_conceded": int(row.get('실점', 0))
+            }  # 첫 번째 행만 읽음
+    return {}
+
+def load_vs_team_from_csv() -> Dict[str, dict]:
+    """Load the historical record against each opponent (상대 전적) from vs_team.csv"""
+    csv_path = get_csv_path("vs_team.csv")
+    if not os.path.exists(csv_path):
+        print(f"Warning: {csv_path} not found")
+        return {}
+    
+    records = {}
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            opponent = row.get('팀명', '').strip()
+            if not opponent:
+                continue
+            wins = int(row.get('승리') or 0)
+            draws = int(row.get('무승부') or 0)
+            losses = int(row.get('패배') or 0)
+            records[opponent] = {
+                "total_matches": wins + draws + losses,
+                "wins": wins,
+                "draws": draws,
+                "losses": losses
             }
-            break  # 첫 번째 행만 읽음
+    return records
 
 def get_team_stats() -> dict:
-    """Get team stats"""
-    return team_stats_data
+    """Get team stats (materialized, kept in sync with the matches table)"""
+    return team_stats.read(get_db_connection()) or {}
 
-def init_db():
-    """Initialize database from CSV files and SQLite"""
-    init_sqlite_db()
-    load_players_from_csv()
-    load_team_stats_from_csv()
+def get_team_summary() -> dict:
+    """Team stats as served by /api/team/stats: totals, win rate and squad size"""
+    stats = get_team_stats()
+    total_matches = stats.get("total_matches", 0)
+    wins = stats.get("wins", 0)
+    return {
+        "total_players": count_players(),
+        "total_matches": total_matches,
+        "wins": wins,
+        "draws": stats.get("draws", 0),
+        "losses": stats.get("losses", 0),
+        "win_rate": round(wins / total_matches * 100, 2) if total_matches > 0 else 0.0,
+        "total_goals_scored": stats.get("goals_scored", 0),
+        "total_goals_conceded": stats.get("goals_conceded", 0),
+        "upcoming_matches": stats.get("upcoming_matches", 0)
+    }
+
+# Team analytics (recorded matches only, see analytics.py)
+def get_team_form(last: int = 5) -> dict:
+    """The last `last` results, newest first"""
+    return analytics.form(get_db_connection(), last)
+
+def get_team_streaks() -> dict:
+    """Current and longest win / unbeaten streaks"""
+    return analytics.streaks(get_db_connection())
+
+def get_team_splits(split: str) -> List[dict]:
+    """Record per venue, month or season"""
+    return analytics.splits(get_db_connection(), split)
+
+def seed_db():
+    """One-time import of the hand-kept CSV history and sample announcements.
+
+    The CSVs are only read while their data is still missing, so a warm
+    start skips them entirely.
+    """
+    with transaction() as conn:
+        players_missing = conn.execute("SELECT 1 FROM players LIMIT 1").fetchone() is None
+        if players_missing or not team_stats.is_seeded(conn):
+            team_history = load_team_stats_from_csv()
+            import_players_from_csv(conn.cursor())
+            import_ledger_from_csv(conn.cursor())
+            team_stats.seed(conn, team_history)
+        if not head_to_head.is_seeded(conn):
+            head_to_head.seed(conn, load_vs_team_from_csv())
+            # The imported records are the opponents' starting ratings
+            ratings.replay(conn)
     
     # Add sample announcements if database is empty
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with transaction() as conn:
+        _seed_sample_announcements(conn.cursor())
+
+def init_db():
+    """Initialize database from CSV files and SQLite (main.py runs these steps in its lifespan)"""
+    migrate_db()
+    seed_db()
+
+def _seed_sample_announcements(cursor):
     cursor.execute("SELECT COUNT(*) FROM announcements")
     count = cursor.fetchone()[0]
     
@@ -214,144 +334,221 @@ def init_db():
                 announcement["created_at"],
                 announcement["updated_at"]
             ))
-        
-        conn.commit()
-    conn.close()
 
 # Player functions
-def get_players() -> List[dict]:
-    return list(players_db.values())
+def _fetch_player(conn, player_id: str) -> Optional[dict]:
+    row = conn.execute("SELECT * FROM players WHERE id = ?", (player_id,)).fetchone()
+    return dict(row) if row else None
+
+def count_players() -> int:
+    return get_db_connection().execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+def get_players(position: Optional[str] = None, sort_by: Optional[str] = None) -> List[dict]:
+    """Get players, optionally filtered by position and sorted by a leaderboard metric or name"""
+    query = "SELECT * FROM players"
+    params = []
+    if position:
+        query += " WHERE position = ?"
+        params.append(position)
+    
+    if sort_by in leaderboard.METRICS:
+        query += f" ORDER BY {leaderboard.order_by(sort_by)}"
+    elif sort_by:
+        query += " ORDER BY name"
+    else:
+        query += " ORDER BY rowid"
+    
+    conn = get_db_connection()
+    return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+def get_player_choices() -> List[dict]:
+    """Name, position and number of every player, for goal/assist pickers"""
+    rows = get_db_connection().execute(
+        "SELECT name, position, jersey_number FROM players ORDER BY rowid"
+    )
+    return [dict(row) for row in rows]
+
+def get_seasons() -> List[str]:
+    """Seasons that have ledger rows, newest first"""
+    return ledger.seasons(get_db_connection())
+
+def get_season_table(season: str) -> List[dict]:
+    """Per-player totals for one season"""
+    return ledger.season_table(get_db_connection(), season)
+
+def get_player_totals(player_id: str) -> Optional[dict]:
+    """Per-season and career totals for one player"""
+    conn = get_db_connection()
+    if not _fetch_player(conn, player_id):
+        return None
+    return ledger.player_totals(conn, player_id)
+
+def get_leaderboard(metric: str, limit: int = 10, include_ties: bool = False) -> List[dict]:
+    """Top players for a metric (goals, assists, attack_points, matches_played) with ranks"""
+    return leaderboard.top(get_db_connection(), metric, limit, include_ties)
+
+def get_player_ranks(player_id: str) -> Optional[dict]:
+    """A player's rank on every leaderboard"""
+    conn = get_db_connection()
+    ranks = {metric: leaderboard.rank_of(conn, player_id, metric) for metric in leaderboard.METRICS}
+    if not any(ranks.values()):
+        return None
+    return ranks
 
 def get_player(player_id: str) -> Optional[dict]:
-    return players_db.get(player_id)
+    return _fetch_player(get_db_connection(), player_id)
 
 def create_player(player_data: dict) -> dict:
     player_id = player_data.get('name', str(uuid.uuid4()))
-    player = {
-        "id": player_id,
-        "goals": 0,
-        "assists": 0,
-        "matches_played": 0,
-        **player_data
-    }
-    players_db[player_id] = player
-    save_players_to_csv()
-    return player
+    with transaction() as conn:
+        conn.execute('''
+            INSERT OR REPLACE INTO players (id, name, position, jersey_number, phone, email,
+                                            join_date, goals, assists, matches_played)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 0, 0, 0)
+        ''', (player_id, *(player_data.get(key) for key in PLAYER_FIELDS)))
+        ledger.delete_player_rows(conn, player_id)
+        return _fetch_player(conn, player_id)
 
 def update_player(player_id: str, player_data: dict) -> Optional[dict]:
-    if player_id not in players_db:
-        return None
-    
-    player = players_db[player_id]
-    for key, value in player_data.items():
-        if value is not None:
-            player[key] = value
+    update_fields = []
+    values = []
     
-    players_db[player_id] = player
-    save_players_to_csv()
-    return player
+    for key in PLAYER_FIELDS:
+        if player_data.get(key) is not None:
+            update_fields.append(f"{key} = ?")
+            values.append(player_data[key])
+    
+    with transaction() as conn:
+        if update_fields:
+            values.append(player_id)
+            query = f"UPDATE players SET {', '.join(update_fields)} WHERE id = ?"
+            if conn.execute(query, values).rowcount == 0:
+                return None
+        return _fetch_player(conn, player_id)
 
 def delete_player(player_id: str) -> bool:
-    if player_id in players_db:
-        del players_db[player_id]
-        save_players_to_csv()
-        return True
-    return False
+    with transaction() as conn:
+        cursor = conn.execute("DELETE FROM players WHERE id = ?", (player_id,))
+        ledger.delete_player_rows(conn, player_id)
+        return cursor.rowcount > 0
 
 def add_player_stats(player_name: str, goals: int = 0, assists: int = 0) -> Optional[dict]:
     """Add goals and assists to a player's stats"""
-    if player_name not in players_db:
-        return None
-    
-    player = players_db[player_name]
-    player['goals'] = player.get('goals', 0) + goals
-    player['assists'] = player.get('assists', 0) + assists
-    players_db[player_name] = player
-    save_players_to_csv()
-    return player
+    with transaction() as conn:
+        cursor = conn.execute(
+            "UPDATE players SET goals = goals + ?, assists = assists + ? WHERE id = ?",
+            (goals, assists, player_name)
+        )
+        if cursor.rowcount == 0:
+            return None
+        return _fetch_player(conn, player_name)
 
 # Match functions
-def get_matches() -> List[dict]:
-    """Get all matches from SQLite"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM matches ORDER BY match_date DESC")
-    rows = cursor.fetchall()
-    conn.close()
-    
-    matches = []
-    for row in rows:
-        match = dict(row)
-        # Parse JSON fields
-        if match.get('goal_scorers'):
-            match['goal_scorers'] = json.loads(match['goal_scorers'])
-        if match.get('assist_providers'):
-            match['assist_providers'] = json.loads(match['assist_providers'])
-        matches.append(match)
-    
-    return matches
-
-def get_match(match_id: str) -> Optional[dict]:
-    """Get a single match by ID"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM matches WHERE id = ?", (match_id,))
-    row = cursor.fetchone()
-    conn.close()
-    
-    if not row:
-        return None
-    
+def _match_from_row(row) -> dict:
     match = dict(row)
     # Parse JSON fields
     if match.get('goal_scorers'):
         match['goal_scorers'] = json.loads(match['goal_scorers'])
     if match.get('assist_providers'):
         match['assist_providers'] = json.loads(match['assist_providers'])
-    
     return match
 
+def _fetch_match(conn, match_id: str) -> Optional[dict]:
+    row = conn.execute("SELECT * FROM matches WHERE id = ?", (match_id,)).fetchone()
+    return _match_from_row(row) if row else None
+
+def _on_match_changed(conn, old: Optional[dict], new: Optional[dict]):
+    """Keep derived aggregates in step with a match write (same transaction)"""
+    team_stats.apply_match_change(conn, old, new)
+    head_to_head.apply_match_change(conn, old, new)
+    ledger.apply_match_change(conn, old, new)
+    analytics.apply_match_change(conn, old, new)
+    ratings.apply_match_change(conn, old, new)  # reads match_results, so after analytics
+    live.apply_match_change(conn, old, new)
+
+# Columns served by list endpoints (goal_scorers/assist_providers are left undecoded)
+MATCH_LIST_COLUMNS = ("id, match_date, opponent, location, home_away, status, "
+                      "fc_ssoa_score, opponent_score, notes, created_at")
+
+def get_matches(status: Optional[str] = None, date_from: Optional[str] = None,
+                date_to: Optional[str] = None, opponent: Optional[str] = None,
+                limit: Optional[int] = None, cursor: Optional[tuple] = None,
+                order: str = "desc", with_stats: bool = True) -> List[dict]:
+    """Get matches from SQLite, filtered and paginated in SQL.
+
+    Rows are ordered by (match_date, id); `cursor` is the (match_date, id) of
+    the last row of the previous page. Date bounds are inclusive, and a plain
+    YYYY-MM-DD date_to covers the whole day. With with_stats=False the
+    goal_scorers/assist_providers JSON columns are not read or decoded.
+    """
+    direction = "ASC" if order == "asc" else "DESC"
+    conditions = []
+    params = []
+    
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if date_from:
+        conditions.append("match_date >= ?")
+        params.append(date_from)
+    if date_to:
+        conditions.append("match_date <= ?")
+        params.append(date_to + "T23:59:59.999999" if len(date_to) == 10 else date_to)
+    if opponent:
+        conditions.append("opponent = ?")
+        params.append(opponent)
+    if cursor:
+        conditions.append(f"(match_date, id) {'>' if direction == 'ASC' else '<'} (?, ?)")
+        params.extend(cursor)
+    
+    query = f"SELECT {'*' if with_stats else MATCH_LIST_COLUMNS} FROM matches"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY match_date {direction}, id {direction}"
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+    
+    rows = get_db_connection().execute(query, params).fetchall()
+    if not with_stats:
+        return [dict(row) for row in rows]
+    return [_match_from_row(row) for row in rows]
+
+def get_match(match_id: str) -> Optional[dict]:
+    """Get a single match by ID"""
+    return _fetch_match(get_db_connection(), match_id)
+
 def create_match(match_data: dict) -> dict:
     """Create a new match"""
     match_id = str(uuid.uuid4())
     now = datetime.now().isoformat()
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT INTO matches (id, match_date, opponent, location, home_away, status, 
-                           fc_ssoa_score, opponent_score, notes, goal_scorers, 
-                           assist_providers, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        match_id,
-        match_data.get('match_date'),
-        match_data.get('opponent'),
-        match_data.get('location'),
-        match_data.get('home_away', 'home'),
-        match_data.get('status', 'scheduled'),
-        match_data.get('fc_ssoa_score'),
-        match_data.get('opponent_score'),
-        match_data.get('notes'),
-        None,  # goal_scorers
-        None,  # assist_providers
-        now
-    ))
-    
-    conn.commit()
-    conn.close()
-    
-    return get_match(match_id)
+    with transaction() as conn:
+        conn.execute('''
+            INSERT INTO matches (id, match_date, opponent, location, home_away, status, 
+                               fc_ssoa_score, opponent_score, notes, goal_scorers, 
+                               assist_providers, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            match_id,
+            match_data.get('match_date'),
+            match_data.get('opponent'),
+            match_data.get('location'),
+            match_data.get('home_away', 'home'),
+            match_data.get('status', 'scheduled'),
+            match_data.get('fc_ssoa_score'),
+            match_data.get('opponent_score'),
+            match_data.get('notes'),
+            None,  # goal_scorers
+            None,  # assist_providers
+            now
+        ))
+        match = _fetch_match(conn, match_id)
+        _on_match_changed(conn, None, match)
+        return match
 
 def update_match(match_id: str, match_data: dict) -> Optional[dict]:
     """Update an existing match"""
-    if not get_match(match_id):
-        return None
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     # Build dynamic update query
     update_fields = []
     values = []
@@ -362,36 +559,71 @@ def update_match(match_id: str, match_data: dict) -> Optional[dict]:
             update_fields.append(f"{key} = ?")
             values.append(match_data[key])
     
-    if update_fields:
+    with transaction() as conn:
+        old = _fetch_match(conn, match_id)
+        if not old:
+            return None
+        if not update_fields:
+            return old
+        
         values.append(match_id)
         query = f"UPDATE matches SET {', '.join(update_fields)} WHERE id = ?"
-        cursor.execute(query, values)
-        conn.commit()
-    
-    conn.close()
-    return get_match(match_id)
+        conn.execute(query, values)
+        match = _fetch_match(conn, match_id)
+        _on_match_changed(conn, old, match)
+        return match
 
 def delete_match(match_id: str) -> bool:
     """Delete a match"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM matches WHERE id = ?", (match_id,))
-    deleted = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    return deleted
+    with transaction() as conn:
+        old = _fetch_match(conn, match_id)
+        if not old:
+            return False
+        conn.execute("DELETE FROM matches WHERE id = ?", (match_id,))
+        live.delete_events(conn, match_id)
+        _on_match_changed(conn, old, None)
+        return True
 
-def complete_match(match_id: str, fc_ssoa_score: int, opponent_score: int, 
-                   goal_scorers: List[dict] = None, assist_providers: List[dict] = None) -> Optional[dict]:
-    """Complete a match and update player stats"""
-    if not get_match(match_id):
+class MatchNotCompletable(Exception):
+    """Raised when a match in a bulk completion is missing or already completed"""
+    def __init__(self, match_id: str):
+        super().__init__(f"Match {match_id} not found or already completed")
+        self.match_id = match_id
+
+def aggregate_stat_deltas(completions: List[dict]) -> Dict[str, Tuple[int, int, int]]:
+    """Sum (goals, assists, appearances) per player across one or more match completions.
+
+    Everyone listed in appearances, goal_scorers or assist_providers counts
+    as having played the match once.
+    """
+    deltas: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+    for completion in completions:
+        played = set(completion.get('appearances') or [])
+        for scorer in completion.get('goal_scorers') or []:
+            deltas[scorer['player_name']][0] += scorer.get('count', 1)
+            played.add(scorer['player_name'])
+        for assister in completion.get('assist_providers') or []:
+            deltas[assister['player_name']][1] += assister.get('count', 1)
+            played.add(assister['player_name'])
+        for name in played:
+            deltas[name][2] += 1
+    return {name: tuple(delta) for name, delta in deltas.items()}
+
+def apply_stat_deltas(conn, deltas: Dict[str, Tuple[int, int, int]]):
+    """Apply aggregated deltas with one batched UPDATE (unknown players are ignored)"""
+    conn.executemany(
+        "UPDATE players SET goals = goals + ?, assists = assists + ?, "
+        "matches_played = matches_played + ? WHERE id = ?",
+        [(goals, assists, appearances, name) for name, (goals, assists, appearances) in deltas.items()]
+    )
+
+def _mark_match_completed(conn, completion: dict) -> Optional[dict]:
+    """Record the final score; returns the updated match, or None if it can't be completed"""
+    old = _fetch_match(conn, completion['match_id'])
+    if not old or old.get('status') == 'completed':
         return None
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Update match status and scores
-    cursor.execute('''
+    conn.execute('''
         UPDATE matches 
         SET status = 'completed', 
             fc_ssoa_score = ?, 
@@ -400,81 +632,239 @@ def complete_match(match_id: str, fc_ssoa_score: int, opponent_score: int,
             assist_providers = ?
         WHERE id = ?
     ''', (
-        fc_ssoa_score,
-        opponent_score,
-        json.dumps(goal_scorers) if goal_scorers else None,
-        json.dumps(assist_providers) if assist_providers else None,
-        match_id
+        completion['fc_ssoa_score'],
+        completion['opponent_score'],
+        json.dumps(completion['goal_scorers']) if completion.get('goal_scorers') else None,
+        json.dumps(completion['assist_providers']) if completion.get('assist_providers') else None,
+        completion['match_id']
     ))
-    
-    conn.commit()
-    conn.close()
-    
-    # Update player stats (CRITICAL: This preserves the CSV update flow)
-    if goal_scorers:
-        for scorer in goal_scorers:
-            add_player_stats(scorer['player_name'], goals=scorer.get('count', 1))
-    
-    if assist_providers:
-        for assister in assist_providers:
-            add_player_stats(assister['player_name'], assists=assister.get('count', 1))
-    
-    return get_match(match_id)
+    match = _fetch_match(conn, completion['match_id'])
+    _on_match_changed(conn, old, match)
+    ledger.record_match(conn, match, aggregate_stat_deltas([completion]))
+    return match
+
+def complete_match(match_id: str, fc_ssoa_score: int, opponent_score: int, 
+                   goal_scorers: List[dict] = None, assist_providers: List[dict] = None,
+                   appearances: List[str] = None) -> Optional[dict]:
+    """Complete a match and update player stats in a single transaction"""
+    completion = {
+        "match_id": match_id,
+        "fc_ssoa_score": fc_ssoa_score,
+        "opponent_score": opponent_score,
+        "goal_scorers": goal_scorers,
+        "assist_providers": assist_providers,
+        "appearances": appearances
+    }
+    with transaction() as conn:
+        # Update match status and scores
+        match = _mark_match_completed(conn, completion)
+        if not match:
+            return None
+        
+        # Update player stats
+        apply_stat_deltas(conn, aggregate_stat_deltas([completion]))
+        return match
+
+def complete_matches(completions: List[dict]) -> List[dict]:
+    """Complete several matches at once (all or nothing).
+
+    Each completion has match_id, fc_ssoa_score, opponent_score, goal_scorers,
+    assist_providers and optionally appearances. Raises MatchNotCompletable and rolls everything back
+    if any match is missing or already completed.
+    """
+    with transaction() as conn, ratings.batch(conn):
+        matches = []
+        for completion in completions:
+            match = _mark_match_completed(conn, completion)
+            if not match:
+                raise MatchNotCompletable(completion['match_id'])
+            matches.append(match)
+        
+        apply_stat_deltas(conn, aggregate_stat_deltas(completions))
+        return matches
+
+# Live match functions
+class MatchNotLive(Exception):
+    """Raised when a live update targets a match that isn't (or can't become) ongoing"""
+    def __init__(self, match_id: str, status: str):
+        super().__init__(f"Match {match_id} is {status}, not ongoing")
+        self.match_id = match_id
+        self.status = status
+
+def _set_live_score(conn, old: dict, fc_ssoa_score: int, opponent_score: int) -> dict:
+    conn.execute(
+        "UPDATE matches SET status = 'ongoing', fc_ssoa_score = ?, opponent_score = ? WHERE id = ?",
+        (fc_ssoa_score, opponent_score, old['id'])
+    )
+    match = _fetch_match(conn, old['id'])
+    _on_match_changed(conn, old, match)
+    return match
+
+def start_live_match(match_id: str) -> Optional[dict]:
+    """Mark a scheduled match as ongoing at 0-0 (idempotent for an ongoing match)"""
+    with transaction() as conn:
+        old = _fetch_match(conn, match_id)
+        if not old:
+            return None
+        if old['status'] == 'ongoing':
+            return old
+        if old['status'] != 'scheduled':
+            raise MatchNotLive(match_id, old['status'])
+        match = _set_live_score(conn, old, 0, 0)
+        live.insert_event(conn, match_id, 'start', 0, 0)
+        return match
+
+def record_live_event(match_id: str, event: dict) -> Optional[dict]:
+    """Store a goal, conceded goal, score correction or note for an ongoing match.
+
+    The match row carries the running score, so lists and the dashboard
+    show it too. Returns the stored event, or None if the match doesn't exist.
+    """
+    with transaction() as conn:
+        old = _fetch_match(conn, match_id)
+        if not old:
+            return None
+        if old['status'] != 'ongoing':
+            raise MatchNotLive(match_id, old['status'])
+        scored, conceded = old['fc_ssoa_score'] or 0, old['opponent_score'] or 0
+        kind = event['kind']
+        if kind == 'goal':
+            scored += 1
+        elif kind == 'opponent_goal':
+            conceded += 1
+        elif kind == 'score':
+            scored, conceded = event['fc_ssoa_score'], event['opponent_score']
+        if (scored, conceded) != (old['fc_ssoa_score'], old['opponent_score']):
+            _set_live_score(conn, old, scored, conceded)
+        return live.insert_event(conn, match_id, kind, scored, conceded, event.get('minute'),
+                                 event.get('player_name'), event.get('note'))
+
+def get_live_snapshot(match_id: str) -> Optional[dict]:
+    """A match and all of its live events, read from one snapshot"""
+    with pool.read_snapshot() as conn:
+        match = _fetch_match(conn, match_id)
+        if not match:
+            return None
+        return {"match": match, "events": live.events_for(conn, match_id)}
+
+def get_live_events(match_id: str, after_id: int = 0) -> List[dict]:
+    return live.events_for(get_db_connection(), match_id, after_id)
+
+def get_live_events_since(after_id: int) -> List[dict]:
+    return live.events_since(get_db_connection(), after_id)
+
+def get_latest_live_event_id() -> int:
+    return live.latest_id(get_db_connection())
+
+# Head-to-head functions
+def match_result(match: dict) -> Optional[str]:
+    """'win', 'draw' or 'loss' for a completed match with a score"""
+    scored, conceded = match.get('fc_ssoa_score'), match.get('opponent_score')
+    if match.get('status') != 'completed' or scored is None or conceded is None:
+        return None
+    if scored > conceded:
+        return 'win'
+    if scored < conceded:
+        return 'loss'
+    return 'draw'
+
+def get_opponent_records() -> List[dict]:
+    """Record against every opponent"""
+    return head_to_head.records(get_db_connection())
+
+def get_opponent_history(opponent: str, last: int = 5) -> Optional[dict]:
+    """Record against one opponent plus the last `last` results"""
+    record = head_to_head.record(get_db_connection(), opponent)
+    if not record:
+        return None
+    recent = get_matches(status='completed', opponent=opponent, limit=last, with_stats=False)
+    record['recent'] = [{**match, 'result': match_result(match)} for match in recent]
+    return record
+
+# Opponent ratings and predictions
+def get_ratings() -> dict:
+    """Elo ratings of the team and every opponent it has played"""
+    return ratings.table(get_db_connection())
+
+def predict_matches(matches: List[dict]) -> List[dict]:
+    """W/D/L expectations of the given matches from the current ratings"""
+    return ratings.predict(get_db_connection(), matches)
+
+def get_upcoming_predictions(limit: int = 10) -> List[dict]:
+    """Expectations of the next `limit` scheduled matches"""
+    with pool.read_snapshot():
+        upcoming = get_matches(status="scheduled", limit=limit, order="asc", with_stats=False)
+        return predict_matches(upcoming)
 
 # Announcement functions
-def get_announcements() -> List[dict]:
-    """Get all announcements from SQLite"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM announcements ORDER BY created_at DESC")
-    rows = cursor.fetchall()
-    conn.close()
-    
+# Columns served by list endpoints unless content is requested
+ANNOUNCEMENT_LIST_COLUMNS = "id, title, author, created_at, updated_at"
+
+def get_announcements(author: Optional[str] = None, date_from: Optional[str] = None,
+                      date_to: Optional[str] = None, limit: Optional[int] = None,
+                      cursor: Optional[tuple] = None, with_content: bool = True) -> List[dict]:
+    """Get announcements, newest first, filtered and paginated in SQL.
+
+    `cursor` is the (created_at, id) of the last row of the previous page.
+    Date bounds are inclusive, and a plain YYYY-MM-DD date_to covers the
+    whole day. With with_content=False the content column is not read.
+    """
+    conditions = []
+    params = []
+    
+    if author:
+        conditions.append("author = ?")
+        params.append(author)
+    if date_from:
+        conditions.append("created_at >= ?")
+        params.append(date_from)
+    if date_to:
+        conditions.append("created_at <= ?")
+        params.append(date_to + "T23:59:59.999999" if len(date_to) == 10 else date_to)
+    if cursor:
+        conditions.append("(created_at, id) < (?, ?)")
+        params.extend(cursor)
+    
+    query = f"SELECT {'*' if with_content else ANNOUNCEMENT_LIST_COLUMNS} FROM announcements"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY created_at DESC, id DESC"
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+    
+    rows = get_db_connection().execute(query, params).fetchall()
     return [dict(row) for row in rows]
 
+def _fetch_announcement(conn, announcement_id: str) -> Optional[dict]:
+    row = conn.execute("SELECT * FROM announcements WHERE id = ?", (announcement_id,)).fetchone()
+    return dict(row) if row else None
+
 def get_announcement(announcement_id: str) -> Optional[dict]:
     """Get a single announcement by ID"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM announcements WHERE id = ?", (announcement_id,))
-    row = cursor.fetchone()
-    conn.close()
-    
-    return dict(row) if row else None
+    return _fetch_announcement(get_db_connection(), announcement_id)
 
 def create_announcement(announcement_data: dict) -> dict:
     """Create a new announcement"""
     announcement_id = str(uuid.uuid4())
     now = datetime.now().isoformat()
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT INTO announcements (id, title, content, author, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        announcement_id,
-        announcement_data.get('title'),
-        announcement_data.get('content'),
-        announcement_data.get('author'),
-        now,
-        now
-    ))
-    
-    conn.commit()
-    conn.close()
-    
-    return get_announcement(announcement_id)
+    with transaction() as conn:
+        conn.execute('''
+            INSERT INTO announcements (id, title, content, author, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            announcement_id,
+            announcement_data.get('title'),
+            announcement_data.get('content'),
+            announcement_data.get('author'),
+            now,
+            now
+        ))
+        return _fetch_announcement(conn, announcement_id)
 
 def update_announcement(announcement_id: str, announcement_data: dict) -> Optional[dict]:
     """Update an existing announcement"""
-    if not get_announcement(announcement_id):
-        return None
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
     # Build dynamic update query
     update_fields = []
     values = []
@@ -484,24 +874,131 @@ def update_announcement(announcement_id: str, announcement_data: dict) -> Option
             update_fields.append(f"{key} = ?")
             values.append(announcement_data[key])
     
-    if update_fields:
-        update_fields.append("updated_at = ?")
-        values.append(datetime.now().isoformat())
-        values.append(announcement_id)
-        
-        query = f"UPDATE announcements SET {', '.join(update_fields)} WHERE id = ?"
-        cursor.execute(query, values)
-        conn.commit()
-    
-    conn.close()
-    return get_announcement(announcement_id)
+    with transaction() as conn:
+        if update_fields:
+            update_fields.append("updated_at = ?")
+            values.append(datetime.now().isoformat())
+            values.append(announcement_id)
+            
+            query = f"UPDATE announcements SET {', '.join(update_fields)} WHERE id = ?"
+            if conn.execute(query, values).rowcount == 0:
+                return None
+        return _fetch_announcement(conn, announcement_id)
 
 def delete_announcement(announcement_id: str) -> bool:
     """Delete an announcement"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM announcements WHERE id = ?", (announcement_id,))
-    deleted = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    return deleted
+    with transaction() as conn:
+        cursor = conn.execute("DELETE FROM announcements WHERE id = ?", (announcement_id,))
+        return cursor.rowcount > 0
+
+# Bulk import / export functions
+def import_records(entity: str, records: List[tuple], skip_invalid: bool = False) -> dict:
+    """Validate and insert parsed import records (see bulk.read_records) in one transaction.
+
+    Unless skip_invalid is set, any invalid row means nothing is written.
+    Imported matches update team and head-to-head stats like create_match;
+    imported player stats are also recorded in the ledger ('legacy' season).
+    """
+    valid, errors = bulk.validate(entity, records)
+    result = {"entity": entity, "received": len(records), "imported": 0, "errors": errors}
+    if errors and not skip_invalid:
+        return result
+    
+    with transaction() as conn, ratings.batch(conn):
+        conflicts = bulk.find_conflicts(conn, entity, valid)
+        if conflicts:
+            errors.extend(conflicts)
+            errors.sort(key=lambda error: error['row'])
+            if not skip_invalid:
+                return result
+            rejected = {error['row'] for error in conflicts}
+            valid = [(row_number, data) for row_number, data in valid if row_number not in rejected]
+        
+        rows = [data for _, data in valid]
+        bulk.insert(conn, entity, rows)
+        if entity == 'matches':
+            for match in rows:
+                _on_match_changed(conn, None, match)
+        elif entity == 'players':
+            ledger.add_import_rows(conn, [
+                (player['id'], ledger.LEGACY_SEASON, player['matches_played'], player['goals'], player['assists'])
+                for player in rows
+                if player['goals'] or player['assists'] or player['matches_played']
+            ])
+        result['imported'] = len(rows)
+    return result
+
+def export_records(entity: str, fmt: str = 'ndjson'):
+    """Generator of CSV or NDJSON text chunks covering a whole table"""
+    rows = bulk.iter_rows(get_db_connection, entity)
+    if fmt == 'csv':
+        metrics.registry.count_csv_write("export")
+        return bulk.csv_lines(entity, rows)
+    return bulk.ndjson_lines(rows)
+
+# Dashboard bundle
+DASHBOARD_SECTIONS = ("stats", "matches", "upcoming", "completed", "players")
+
+def get_dashboard(sections: List[str], upcoming_limit: int = 5, completed_limit: int = 10) -> dict:
+    """The requested page sections, all read from one snapshot in a single thread-pool call"""
+    bundle = {}
+    with pool.read_snapshot():
+        if "stats" in sections:
+            bundle["stats"] = get_team_summary()
+        if "matches" in sections:
+            bundle["matches"] = get_matches(with_stats=False)
+        if "upcoming" in sections:
+            bundle["upcoming"] = get_matches(status="scheduled", limit=upcoming_limit,
+                                             order="asc", with_stats=False)
+        if "completed" in sections:
+            bundle["completed"] = get_matches(status="completed", limit=completed_limit,
+                                              with_stats=False)
+        if "players" in sections:
+            bundle["players"] = get_player_choices()
+    return bundle
+
+# Search functions
+def search_content(text: str, kind: Optional[str] = None, limit: int = 20, offset: int = 0) -> List[dict]:
+    """Ranked full-text search over announcements and matches"""
+    return search.search(get_db_connection(), text, kind, limit, offset)
+
+# Gallery functions
+def get_gallery_page(limit: int = 24, cursor: Optional[tuple] = None,
+                     kind: Optional[str] = None) -> List[dict]:
+    """Newest-first page of the gallery index"""
+    return gallery.page(get_db_connection(), limit, cursor, kind)
+
+def get_gallery_item(media_id: str) -> Optional[dict]:
+    return gallery.get(get_db_connection(), media_id)
+
+def refresh_gallery() -> dict:
+    """Sync the gallery index with the media directory, then render missing thumbnails.
+
+    Hashing, probing and resizing all happen outside of transactions; only
+    the resulting rows are written, one short transaction per step. With
+    several workers only one scans at a time; the others skip their turn.
+    """
+    with file_lock(os.path.join(DATA_DIR, "gallery-scan.lock"), blocking=False) as locked:
+        if not locked:
+            return {"indexed": 0, "removed": 0, "thumbnails_rendered": 0, "skipped": True}
+        return _refresh_gallery()
+
+def _refresh_gallery() -> dict:
+    changed, removed = gallery.pending_changes(get_db_connection())
+    entries = [gallery.describe(path, stat_result) for path, stat_result in changed]
+    if entries or removed:
+        with transaction() as conn:
+            gallery.store(conn, entries, removed)
+    
+    rendered = 0
+    for row in gallery.pending_thumbnails(get_db_connection()):
+        status, thumbnail = gallery.render_thumbnail(row)
+        if status == row['thumbnail_status']:
+            continue
+        with transaction() as conn:
+            gallery.set_thumbnail(conn, row['id'], status, thumbnail)
+        rendered += status == 'ready'
+    return {"indexed": len(entries), "removed": len(removed), "thumbnails_rendered": rendered}
+
+# Background worker keeping the gallery index current (started by main.py)
+gallery_worker = gallery.GalleryWorker(refresh_gallery)
@@ -0,0 +1,153 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# Pool settings (override through environment variables)
+BUSY_TIMEOUT_MS = int(os.environ.get("FC_SSOA_DB_BUSY_TIMEOUT_MS", "5000"))
+STATEMENT_CACHE_SIZE = int(os.environ.get("FC_SSOA_DB_STATEMENT_CACHE", "256"))
+
+
+class ConnectionPool:
+    """Per-thread pool of long-lived SQLite connections.
+
+    Every thread gets its own connection, opened once in WAL mode and reused
+    for all later calls, so request handlers no longer pay for a
+    connect/close on each query. Statements are compiled once per connection
+    and kept in sqlite3's statement cache.
+    """
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = BUSY_TIMEOUT_MS,
+                 statement_cache_size: int = STATEMENT_CACHE_SIZE,
+                 factory: type = sqlite3.Connection,
+                 on_connect: Optional[Callable[[], None]] = None):
+        self.db_path = db_path
+        self.factory = factory
+        self.on_connect = on_connect
+        self.busy_timeout_ms = busy_timeout_ms
+        self.statement_cache_size = statement_cache_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._watcher: Optional[sqlite3.Connection] = None
+        self._watcher_lock = threading.Lock()
+
+    def _connect(self, factory: Optional[type] = None) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            cached_statements=self.statement_cache_size,
+            isolation_level=None,  # transactions are managed by transaction()
+            check_same_thread=False,  # only so close_all() may run on any thread
+            factory=factory or self.factory,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if self.on_connect is not None and factory is None:
+            self.on_connect()
+        return conn
+
+    def _prune_dead_threads(self):
+        """Close connections whose owning thread has exited (caller holds the lock)."""
+        alive = []
+        for thread, conn in self._connections:
+            if thread.is_alive():
+                alive.append((thread, conn))
+            else:
+                conn.close()
+        self._connections = alive
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            with self._lock:
+                self._prune_dead_threads()
+                self._connections.append((threading.current_thread(), conn))
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block of writes as one transaction.
+
+        Nested calls on the same thread join the outermost transaction, so
+        helpers can be composed without committing half-way through.
+        """
+        conn = self.connection()
+        if self._local.depth > 0:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            self._local.depth = 0
+
+    @contextmanager
+    def read_snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Run a block of reads against one consistent snapshot of the database.
+
+        In WAL mode a read transaction keeps seeing the data as of its first
+        query, so several queries can't straddle another thread's write.
+        Inside a transaction() the surrounding transaction is used as-is.
+        """
+        conn = self.connection()
+        if self._local.depth > 0:
+            yield conn
+            return
+
+        conn.execute("BEGIN")
+        self._local.depth = 1
+        try:
+            yield conn
+        finally:
+            self._local.depth = 0
+            conn.rollback()  # nothing was written
+
+    def data_version(self) -> int:
+        """SQLite's change counter, read through a connection that never writes.
+
+        PRAGMA data_version changes whenever another connection commits,
+        whether on another thread of this process or in another worker
+        process, so every worker can poll it (a few microseconds) to notice
+        writes made anywhere.
+        """
+        with self._watcher_lock:
+            if self._watcher is None:
+                # A plain connection: polling isn't work done for any request
+                self._watcher = self._connect(sqlite3.Connection)
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def close_all(self):
+        """Close every pooled connection (used on shutdown)"""
+        with self._lock:
+            for _, conn in self._connections:
+                conn.close()
+            self._connections = []
+        with self._watcher_lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+        self._local = threading.local()
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return len(self._connections)
@@ -0,0 +1,58 @@
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Inter-process file locks.
+#
+# With several uvicorn workers, every worker is a separate process, so
+# threading locks no longer keep two writers apart. file_lock holds an
+# exclusive OS lock on a small sidecar file (flock on POSIX, msvcrt.locking
+# on Windows) for the duration of a block. Each call opens the lock file
+# itself, so it also excludes other threads of the same process.
+
+
+def _acquire(fd: int, blocking: bool) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+
+def _release(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: str, blocking: bool = True) -> Iterator[bool]:
+    """Hold an exclusive lock on `path` (created if missing) for the block.
+
+    Yields True once locked. With blocking=False it yields False straight
+    away when another process or thread holds the lock.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        locked = _acquire(fd, blocking)
+        try:
+            yield locked
+        finally:
+            if locked:
+                _release(fd)
+    finally:
+        os.close(fd)
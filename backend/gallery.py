@@ -0,0 +1,295 @@
+import json
+import os
+import shutil
+import subprocess
+import threading
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from media import MEDIA_DIR, MEDIA_EXTENSIONS, file_digest
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it images are listed without thumbnails
+    Image = ImageOps = None
+
+# Gallery media index.
+#
+# A background worker walks the media directory and records every file's
+# size, dimensions, date and content hash in gallery_media, then renders one
+# thumbnail per image (Pillow) or poster frame per video (ffmpeg). Rendered
+# files go to a content-addressed cache under MEDIA_DIR/.thumbnails named
+# after the source's hash, so a renamed or duplicated file reuses the
+# existing thumbnail. The listing only reads the index: nothing is resized
+# or probed on the request path.
+
+THUMBNAIL_DIR_NAME = ".thumbnails"
+THUMBNAIL_SIZE = int(os.environ.get("FC_SSOA_THUMBNAIL_SIZE", "480"))
+SCAN_INTERVAL = int(os.environ.get("FC_SSOA_GALLERY_SCAN_INTERVAL", "300"))
+# The first scan waits this long so it doesn't compete with cold-start requests
+SCAN_START_DELAY = float(os.environ.get("FC_SSOA_GALLERY_SCAN_DELAY", "10"))
+VIDEO_EXTENSIONS = {".mp4", ".webm", ".mov", ".m4v"}
+
+FFMPEG = shutil.which("ffmpeg")
+FFPROBE = shutil.which("ffprobe")
+
+def create_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS gallery_media (
+            id TEXT PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            kind TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            width INTEGER,
+            height INTEGER,
+            taken_at TEXT NOT NULL,
+            thumbnail TEXT,
+            thumbnail_status TEXT NOT NULL DEFAULT 'pending',
+            indexed_at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_gallery_taken ON gallery_media (taken_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_gallery_kind_taken ON gallery_media (kind, taken_at, id)")
+
+def kind_of(path: str) -> str:
+    return "video" if os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS else "image"
+
+def walk(media_dir: str = MEDIA_DIR) -> Dict[str, os.stat_result]:
+    """Servable media files under media_dir, keyed by '/'-separated relative path"""
+    files = {}
+    for root, dirs, names in os.walk(media_dir):
+        dirs[:] = [name for name in dirs if not name.startswith(".")]  # skips the thumbnail cache
+        for name in names:
+            if name.startswith(".") or os.path.splitext(name)[1].lower() not in MEDIA_EXTENSIONS:
+                continue
+            full_path = os.path.join(root, name)
+            relative = os.path.relpath(full_path, media_dir).replace(os.sep, "/")
+            files[relative] = os.stat(full_path)
+    return files
+
+def pending_changes(conn, media_dir: str = MEDIA_DIR) -> Tuple[List[Tuple[str, os.stat_result]], List[str]]:
+    """Files that are new or changed since they were indexed, and indexed paths that are gone"""
+    indexed = {
+        row["path"]: (row["size"], row["mtime_ns"])
+        for row in conn.execute("SELECT path, size, mtime_ns FROM gallery_media")
+    }
+    on_disk = walk(media_dir)
+    changed = [
+        (path, stat_result) for path, stat_result in sorted(on_disk.items())
+        if indexed.get(path) != (stat_result.st_size, stat_result.st_mtime_ns)
+    ]
+    removed = [path for path in indexed if path not in on_disk]
+    return changed, removed
+
+def _exif_date(value: str) -> Optional[str]:
+    try:
+        return datetime.strptime(value.strip(), "%Y:%m:%d %H:%M:%S").isoformat()
+    except (AttributeError, ValueError):
+        return None
+
+def _probe_image(path: str) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    if Image is None:
+        return None, None, None
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+            exif = image.getexif()
+            taken_at = _exif_date(exif.get_ifd(0x8769).get(36867) or exif.get(306))
+            if exif.get(274) in (5, 6, 7, 8):  # rotated a quarter turn
+                width, height = height, width
+            return width, height, taken_at
+    except Exception:
+        return None, None, None
+
+def _probe_video(path: str) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    if not FFPROBE:
+        return None, None, None
+    try:
+        output = subprocess.run(
+            [FFPROBE, "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "stream=width,height:format_tags=creation_time", "-of", "json", path],
+            capture_output=True, timeout=30, check=True
+        ).stdout
+        info = json.loads(output)
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None, None, None
+    stream = (info.get("streams") or [{}])[0]
+    created = (info.get("format", {}).get("tags") or {}).get("creation_time")
+    taken_at = created[:19] if created and not created.startswith("1970") else None
+    return stream.get("width"), stream.get("height"), taken_at
+
+def describe(path: str, stat_result: os.stat_result, media_dir: str = MEDIA_DIR) -> dict:
+    """Index entry for one file: hash, dimensions and capture date (file mtime if unknown)"""
+    full_path = os.path.join(media_dir, path)
+    kind = kind_of(path)
+    width, height, taken_at = (_probe_video if kind == "video" else _probe_image)(full_path)
+    return {
+        "path": path,
+        "kind": kind,
+        "size": stat_result.st_size,
+        "mtime_ns": stat_result.st_mtime_ns,
+        "content_hash": file_digest(full_path),
+        "width": width,
+        "height": height,
+        "taken_at": taken_at or datetime.fromtimestamp(stat_result.st_mtime).isoformat(timespec="seconds"),
+    }
+
+def store(conn, entries: List[dict], removed: List[str]):
+    """Upsert scanned entries by path and drop rows for deleted files"""
+    now = datetime.now().isoformat()
+    conn.executemany('''
+        INSERT INTO gallery_media (id, path, kind, size, mtime_ns, content_hash, width, height,
+                                   taken_at, indexed_at)
+        VALUES (:id, :path, :kind, :size, :mtime_ns, :content_hash, :width, :height, :taken_at, :indexed_at)
+        ON CONFLICT (path) DO UPDATE SET
+            kind = excluded.kind, size = excluded.size, mtime_ns = excluded.mtime_ns,
+            content_hash = excluded.content_hash, width = excluded.width, height = excluded.height,
+            taken_at = excluded.taken_at, indexed_at = excluded.indexed_at,
+            thumbnail = NULL, thumbnail_status = 'pending'
+    ''', [{**entry, "id": str(uuid.uuid4()), "indexed_at": now} for entry in entries])
+    conn.executemany("DELETE FROM gallery_media WHERE path = ?", [(path,) for path in removed])
+
+def pending_thumbnails(conn) -> List[dict]:
+    """Rows still waiting for a thumbnail ('unsupported' ones are retried in case a tool was installed)"""
+    rows = conn.execute(
+        "SELECT id, path, kind, content_hash, thumbnail_status FROM gallery_media "
+        "WHERE thumbnail_status IN ('pending', 'unsupported')"
+    )
+    return [dict(row) for row in rows]
+
+def thumbnail_path(content_hash: str) -> str:
+    """Cache path of a thumbnail, relative to the media directory"""
+    return f"{THUMBNAIL_DIR_NAME}/{content_hash[:2]}/{content_hash}-{THUMBNAIL_SIZE}.jpg"
+
+def _render_image(source: str, target: str):
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        image.convert("RGB").save(target, "JPEG", quality=82, optimize=True)
+
+def _render_poster(source: str, target: str):
+    # Grab a frame one second in (clear of fade-ins), or the first frame of very short clips
+    for offset in ("1", "0"):
+        subprocess.run(
+            [FFMPEG, "-v", "error", "-y", "-ss", offset, "-i", source, "-frames:v", "1",
+             "-vf", f"scale='min({THUMBNAIL_SIZE},iw)':-2", "-f", "image2", "-c:v", "mjpeg", target],
+            capture_output=True, timeout=60, check=True
+        )
+        if os.path.getsize(target) > 0:
+            return
+    raise OSError("ffmpeg produced no frame")
+
+def render_thumbnail(row: dict, media_dir: str = MEDIA_DIR) -> Tuple[str, Optional[str]]:
+    """Render (or reuse) the cached thumbnail for an index row; returns (status, relative path)"""
+    relative = thumbnail_path(row["content_hash"])
+    target = os.path.join(media_dir, relative)
+    if os.path.exists(target):
+        return "ready", relative
+
+    render = _render_poster if row["kind"] == "video" else _render_image
+    if (row["kind"] == "video" and not FFMPEG) or (row["kind"] == "image" and Image is None):
+        return "unsupported", None
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temporary = f"{target}.{uuid.uuid4().hex}.tmp"
+    try:
+        render(os.path.join(media_dir, row["path"]), temporary)
+        os.replace(temporary, target)
+    except Exception as e:
+        print(f"Thumbnail for {row['path']} failed: {e}")
+        return "failed", None
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return "ready", relative
+
+def set_thumbnail(conn, media_id: str, status: str, thumbnail: Optional[str]):
+    conn.execute(
+        "UPDATE gallery_media SET thumbnail_status = ?, thumbnail = ? WHERE id = ?",
+        (status, thumbnail, media_id)
+    )
+
+def _media_url(path: str) -> str:
+    return "/api/media/" + quote(path)
+
+def item_from_row(row) -> dict:
+    item = dict(row)
+    path = item.pop("path")
+    thumbnail = item.pop("thumbnail")
+    item.pop("mtime_ns", None)
+    item.pop("indexed_at", None)
+    item["title"] = os.path.splitext(os.path.basename(path))[0]
+    item["url"] = _media_url(path)
+    item["thumbnail_url"] = _media_url(thumbnail) if thumbnail else None
+    item["date"] = item["taken_at"][:10]
+    return item
+
+def page(conn, limit: int, cursor: Optional[tuple] = None, kind: Optional[str] = None) -> List[dict]:
+    """Newest-first page of indexed media; `cursor` is the (taken_at, id) of the previous page's last item"""
+    conditions = []
+    params: list = []
+    if kind:
+        conditions.append("kind = ?")
+        params.append(kind)
+    if cursor:
+        conditions.append("(taken_at, id) < (?, ?)")
+        params.extend(cursor)
+    query = "SELECT * FROM gallery_media"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY taken_at DESC, id DESC LIMIT ?"
+    params.append(limit)
+    return [item_from_row(row) for row in conn.execute(query, params)]
+
+def get(conn, media_id: str) -> Optional[dict]:
+    row = conn.execute("SELECT * FROM gallery_media WHERE id = ?", (media_id,)).fetchone()
+    return item_from_row(row) if row else None
+
+
+class GalleryWorker:
+    """Daemon thread that runs `refresh` shortly after startup, every `interval` seconds and on wake()"""
+
+    def __init__(self, refresh: Callable[[], dict], interval: int = SCAN_INTERVAL,
+                 start_delay: float = SCAN_START_DELAY):
+        self.refresh = refresh
+        self.interval = interval
+        self.start_delay = start_delay
+        self.last_run: Optional[dict] = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="gallery-worker", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Schedule a rescan now instead of waiting for the next interval"""
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        self._wake.wait(self.start_delay)
+        while not self._stopping.is_set():
+            self._wake.clear()
+            started = datetime.now()
+            try:
+                result = self.refresh()
+            except Exception as e:
+                print(f"Gallery refresh failed: {e}")
+                result = {"error": str(e)}
+            self.last_run = {**result, "started_at": started.isoformat(),
+                             "seconds": round((datetime.now() - started).total_seconds(), 3)}
+            self._wake.wait(self.interval)
@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional
+
+from team_stats import STAT_COLUMNS, match_contribution
+
+# Head-to-head records per opponent.
+#
+# Same layout as team_stats: for every opponent a 'baseline' row holds the
+# hand-kept record imported once from vs_team.csv and a 'total' row holds
+# baseline plus every match against them. Match writes move the difference
+# between a match's old and new contribution onto the affected opponents'
+# 'total' rows, inside the write's transaction.
+#
+# The imported records have no goals, so a served record keeps them apart:
+# W/D/L overall, then the imported part and the recorded part (total minus
+# baseline), goals only in the latter.
+
+def create_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS opponent_records (
+            opponent TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            total_matches INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            draws INTEGER NOT NULL DEFAULT 0,
+            losses INTEGER NOT NULL DEFAULT 0,
+            goals_scored INTEGER NOT NULL DEFAULT 0,
+            goals_conceded INTEGER NOT NULL DEFAULT 0,
+            upcoming_matches INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, opponent)
+        )
+    ''')
+
+def _add(conn, opponent: str, scope: str, delta: List[int]):
+    """Add `delta` to an opponent's row, creating it on first use"""
+    columns = ", ".join(STAT_COLUMNS)
+    placeholders = ", ".join("?" for _ in STAT_COLUMNS)
+    increments = ", ".join(f"{column} = {column} + excluded.{column}" for column in STAT_COLUMNS)
+    conn.execute(
+        f"INSERT INTO opponent_records (opponent, scope, {columns}) VALUES (?, ?, {placeholders}) "
+        f"ON CONFLICT (scope, opponent) DO UPDATE SET {increments}",
+        (opponent, scope, *delta)
+    )
+
+def apply_match_change(conn, old: Optional[dict], new: Optional[dict]):
+    """Move a match's contribution between opponents' 'total' rows"""
+    deltas: Dict[str, List[int]] = {}
+    for match, sign in ((old, -1), (new, 1)):
+        if not match:
+            continue
+        contribution = match_contribution(match)
+        delta = deltas.setdefault(match["opponent"], [0] * len(STAT_COLUMNS))
+        for i, column in enumerate(STAT_COLUMNS):
+            delta[i] += sign * contribution[column]
+
+    for opponent, delta in deltas.items():
+        if any(delta):
+            _add(conn, opponent, "total", delta)
+
+def is_seeded(conn) -> bool:
+    return conn.execute("SELECT 1 FROM opponent_records WHERE scope = 'baseline' LIMIT 1").fetchone() is not None
+
+def seed(conn, baseline: Dict[str, dict]):
+    """Store the imported records once and build the 'total' rows from them"""
+    if is_seeded(conn):
+        return
+    for opponent, record in baseline.items():
+        _add(conn, opponent, "baseline", [record.get(column, 0) for column in STAT_COLUMNS])
+    rebuild(conn)
+
+def rebuild(conn):
+    """Recompute every 'total' row from the baselines and a full scan of matches"""
+    conn.execute("DELETE FROM opponent_records WHERE scope = 'total'")
+    columns = ", ".join(STAT_COLUMNS)
+    conn.execute(
+        f"INSERT INTO opponent_records (opponent, scope, {columns}) "
+        f"SELECT opponent, 'total', {columns} FROM opponent_records WHERE scope = 'baseline'"
+    )
+    rows = conn.execute(
+        "SELECT opponent, status, fc_ssoa_score, opponent_score FROM matches"
+    ).fetchall()
+    for row in rows:
+        apply_match_change(conn, None, dict(row))
+
+# vs_team.csv only has W/D/L, so goals come from recorded matches alone
+RESULT_COLUMNS = ("total_matches", "wins", "draws", "losses")
+GOAL_COLUMNS = ("goals_scored", "goals_conceded")
+
+def _with_win_rate(record: dict) -> dict:
+    played = record["total_matches"]
+    record["win_rate"] = round(record["wins"] / played * 100, 2) if played else 0.0
+    return record
+
+def _split(total: dict, baseline: Optional[dict]) -> dict:
+    """Overall W/D/L with its imported and recorded parts; only the recorded part has goals"""
+    recorded = {column: total[column] - (baseline[column] if baseline else 0)
+                for column in RESULT_COLUMNS + GOAL_COLUMNS}
+    record = _with_win_rate({
+        "opponent": total["opponent"],
+        **{column: total[column] for column in RESULT_COLUMNS},
+        "upcoming_matches": total["upcoming_matches"],
+    })
+    record["imported"] = _with_win_rate({column: baseline[column] if baseline else 0 for column in RESULT_COLUMNS})
+    record["recorded"] = _with_win_rate(recorded)
+    return record
+
+def _rows(conn, scope: str, opponent: Optional[str] = None):
+    query = f"SELECT opponent, {', '.join(STAT_COLUMNS)} FROM opponent_records WHERE scope = ?"
+    params = [scope]
+    if opponent is not None:
+        query += " AND opponent = ?"
+        params.append(opponent)
+    if scope == "total":
+        query += " ORDER BY total_matches DESC, wins DESC, opponent"
+    return [dict(row) for row in conn.execute(query, params)]
+
+def records(conn) -> List[dict]:
+    """Every opponent's record, most-played first"""
+    baselines = {row["opponent"]: row for row in _rows(conn, "baseline")}
+    return [_split(total, baselines.get(total["opponent"])) for total in _rows(conn, "total")]
+
+def record(conn, opponent: str) -> Optional[dict]:
+    totals = _rows(conn, "total", opponent)
+    if not totals:
+        return None
+    baselines = _rows(conn, "baseline", opponent)
+    return _split(totals[0], baselines[0] if baselines else None)
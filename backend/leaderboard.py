@@ -0,0 +1,76 @@
+from typing import List, Optional
+
+# Player leaderboards.
+#
+# Each metric has a descending index on (value, name), so SQLite keeps every
+# leaderboard sorted as stats change: top-N walks the first N index entries
+# and a rank lookup is an index range count, with no per-request sort.
+# Ranks use competition ranking: tied players share a rank and the next
+# rank skips (1, 2, 2, 4).
+
+METRICS = {
+    "goals": "goals",
+    "assists": "assists",
+    "attack_points": "goals + assists",
+    "matches_played": "matches_played",
+}
+
+def create_indexes(cursor):
+    for metric, expression in METRICS.items():
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_players_{metric} ON players (({expression}) DESC, name)"
+        )
+
+def order_by(metric: str) -> str:
+    """ORDER BY clause that walks the metric's index"""
+    return f"({METRICS[metric]}) DESC, name"
+
+def top(conn, metric: str, limit: int, include_ties: bool = False) -> List[dict]:
+    """Top `limit` players by metric, each with its rank and metric value.
+
+    With include_ties, players tied with the last one are included too, so
+    the list can run past `limit`.
+    """
+    expression = METRICS[metric]
+    rows = conn.execute(
+        f"SELECT *, {expression} AS value FROM players ORDER BY {order_by(metric)} LIMIT ?",
+        (limit,)
+    ).fetchall()
+    entries = [dict(row) for row in rows]
+
+    if include_ties and len(entries) == limit:
+        cutoff = entries[-1]["value"]
+        extra = conn.execute(
+            f"SELECT *, {expression} AS value FROM players WHERE {expression} = ? "
+            f"ORDER BY {order_by(metric)} LIMIT -1 OFFSET ?",
+            (cutoff, sum(1 for entry in entries if entry["value"] == cutoff))
+        ).fetchall()
+        entries.extend(dict(row) for row in extra)
+
+    previous = None
+    for position, entry in enumerate(entries, start=1):
+        if previous is None or entry["value"] != previous["value"]:
+            entry["rank"] = position
+        else:
+            entry["rank"] = previous["rank"]
+        previous = entry
+    return entries
+
+def rank_of(conn, player_id: str, metric: str) -> Optional[dict]:
+    """Rank of one player for a metric, plus how many players share it"""
+    expression = METRICS[metric]
+    row = conn.execute(f"SELECT {expression} AS value FROM players WHERE id = ?", (player_id,)).fetchone()
+    if not row:
+        return None
+
+    value = row["value"]
+    ahead, tied, total = conn.execute(
+        f'''
+        SELECT
+            (SELECT COUNT(*) FROM players WHERE {expression} > ?),
+            (SELECT COUNT(*) FROM players WHERE {expression} = ?),
+            (SELECT COUNT(*) FROM players)
+        ''',
+        (value, value)
+    ).fetchone()
+    return {"metric": metric, "value": value, "rank": ahead + 1, "tied_with": tied - 1, "total_players": total}
@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional, Tuple
+
+# Player appearance / stat ledger.
+#
+# One row per player per completed match (match_id set), written by
+# complete_match in the same transaction as the match. Rows imported from
+# the hand-kept CSVs have match_id NULL and source 'import'. Per-season and
+# career totals are grouped queries over this table; the goals, assists and
+# matches_played columns on players are running totals of the same rows.
+
+LEGACY_SEASON = "legacy"  # stats_all.csv history not covered by a stats_XX.csv season file
+
+def create_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS player_match_stats (
+            player_id TEXT NOT NULL,
+            match_id TEXT,
+            season TEXT NOT NULL,
+            appearances INTEGER NOT NULL DEFAULT 1,
+            goals INTEGER NOT NULL DEFAULT 0,
+            assists INTEGER NOT NULL DEFAULT 0,
+            source TEXT NOT NULL DEFAULT 'match'
+        )
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_ledger_match_player
+        ON player_match_stats (match_id, player_id) WHERE match_id IS NOT NULL
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ledger_season_player ON player_match_stats (season, player_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ledger_player_season ON player_match_stats (player_id, season)")
+
+def season_of(match: dict) -> str:
+    """Seasons follow the calendar year of the match date"""
+    return (match.get("match_date") or "")[:4] or LEGACY_SEASON
+
+def add_import_rows(cursor, rows: List[Tuple[str, str, int, int, int]]):
+    """Insert (player_id, season, appearances, goals, assists) rows not tied to a match"""
+    cursor.executemany('''
+        INSERT INTO player_match_stats (player_id, match_id, season, appearances, goals, assists, source)
+        VALUES (?, NULL, ?, ?, ?, ?, 'import')
+    ''', rows)
+
+def import_rows(cursor, rows: List[Tuple[str, str, int, int, int]]):
+    """One-time import of the hand-kept CSV history (skipped once the ledger has rows)"""
+    cursor.execute("SELECT COUNT(*) FROM player_match_stats")
+    if cursor.fetchone()[0] > 0:
+        return
+    add_import_rows(cursor, rows)
+
+def record_match(conn, match: dict, lines: Dict[str, Tuple[int, int, int]]):
+    """Write one ledger row per known player for a completed match.
+
+    `lines` maps player id to (goals, assists, appearances); players that
+    don't exist are skipped, the same way their stats are.
+    """
+    season = season_of(match)
+    conn.executemany('''
+        INSERT INTO player_match_stats (player_id, match_id, season, appearances, goals, assists)
+        SELECT id, ?, ?, ?, ?, ? FROM players WHERE id = ?
+    ''', [
+        (match["id"], season, appearances, goals, assists, player_id)
+        for player_id, (goals, assists, appearances) in lines.items()
+    ])
+
+def apply_match_change(conn, old: Optional[dict], new: Optional[dict]):
+    """Keep ledger rows (and the players running totals) in step with a match write"""
+    was_completed = bool(old) and old.get("status") == "completed"
+    is_completed = bool(new) and new.get("status") == "completed"
+
+    if was_completed and not is_completed:
+        # Match deleted or reopened: take its stats back off the players
+        conn.execute('''
+            UPDATE players SET
+                goals = goals - (SELECT SUM(goals) FROM player_match_stats l
+                                 WHERE l.match_id = :match_id AND l.player_id = players.id),
+                assists = assists - (SELECT SUM(assists) FROM player_match_stats l
+                                     WHERE l.match_id = :match_id AND l.player_id = players.id),
+                matches_played = matches_played - (SELECT SUM(appearances) FROM player_match_stats l
+                                                   WHERE l.match_id = :match_id AND l.player_id = players.id)
+            WHERE id IN (SELECT player_id FROM player_match_stats WHERE match_id = :match_id)
+        ''', {"match_id": old["id"]})
+        conn.execute("DELETE FROM player_match_stats WHERE match_id = ?", (old["id"],))
+    elif was_completed and is_completed and season_of(old) != season_of(new):
+        conn.execute(
+            "UPDATE player_match_stats SET season = ? WHERE match_id = ?",
+            (season_of(new), new["id"])
+        )
+
+def delete_player_rows(conn, player_id: str):
+    conn.execute("DELETE FROM player_match_stats WHERE player_id = ?", (player_id,))
+
+TOTALS = "SUM(l.appearances) AS matches_played, SUM(l.goals) AS goals, SUM(l.assists) AS assists"
+
+def seasons(conn) -> List[str]:
+    rows = conn.execute(
+        "SELECT DISTINCT season FROM player_match_stats ORDER BY season = ?, season DESC",
+        (LEGACY_SEASON,)
+    )
+    return [row["season"] for row in rows]
+
+def season_table(conn, season: str) -> List[dict]:
+    """Every player's totals for one season, in a single grouped query"""
+    rows = conn.execute(f'''
+        SELECT p.id, p.name, p.position, p.jersey_number, {TOTALS}
+        FROM player_match_stats l JOIN players p ON p.id = l.player_id
+        WHERE l.season = ?
+        GROUP BY l.player_id
+        ORDER BY goals DESC, assists DESC, p.name
+    ''', (season,))
+    return [dict(row) for row in rows]
+
+def player_totals(conn, player_id: str) -> dict:
+    """Per-season and career totals for one player"""
+    by_season = [dict(row) for row in conn.execute(f'''
+        SELECT l.season, {TOTALS} FROM player_match_stats l
+        WHERE l.player_id = ? GROUP BY l.season ORDER BY l.season = ?, l.season DESC
+    ''', (player_id, LEGACY_SEASON))]
+    career = {
+        key: sum(season[key] for season in by_season)
+        for key in ("matches_played", "goals", "assists")
+    }
+    return {"player_id": player_id, "seasons": by_season, "career": career}
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+# Live scores for ongoing matches.
+#
+# Every score change or note for an ongoing match is stored as a row in
+# match_events (ids only ever grow, so they double as SSE event ids), in the
+# same transaction that updates the match's running score. LiveHub fans the
+# events out to the Server-Sent Events streams of this worker: one poller
+# task reads new rows once per change, whoever wrote them (this worker or
+# another), and copies each event into the bounded queue of every
+# subscriber of that match. A watcher therefore costs one queue slot, not a
+# polling request.
+#
+# A match that stops being ongoing gets one terminal event, which closes
+# its streams: `final` with the final score when it's completed, `ended`
+# when it's edited to another status. A deleted match takes its events
+# with it, so its streams get an `ended` event that isn't stored
+# (LiveHub.end), and streams on other workers notice at their next
+# keep-alive.
+
+# Subscriber queue length; a client that falls this far behind loses its oldest events
+QUEUE_SIZE = int(os.environ.get("FC_SSOA_LIVE_QUEUE_SIZE", "64"))
+# How often the poller checks for events written by other workers
+POLL_INTERVAL = float(os.environ.get("FC_SSOA_LIVE_POLL_INTERVAL", "0.5"))
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_INTERVAL = float(os.environ.get("FC_SSOA_LIVE_HEARTBEAT", "15"))
+
+# Event kinds after which a match has no more events
+TERMINAL_KINDS = ("final", "ended")
+
+EVENT_COLUMNS = ("id, match_id, kind, minute, player_name, note, "
+                 "fc_ssoa_score, opponent_score, created_at")
+
+
+def create_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS match_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            minute INTEGER,
+            player_name TEXT,
+            note TEXT,
+            fc_ssoa_score INTEGER NOT NULL,
+            opponent_score INTEGER NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_events_match ON match_events (match_id, id)")
+
+
+def insert_event(conn, match_id: str, kind: str, fc_ssoa_score: int, opponent_score: int,
+                 minute: Optional[int] = None, player_name: Optional[str] = None,
+                 note: Optional[str] = None) -> dict:
+    cursor = conn.execute('''
+        INSERT INTO match_events (match_id, kind, minute, player_name, note,
+                                  fc_ssoa_score, opponent_score, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (match_id, kind, minute, player_name, note, fc_ssoa_score, opponent_score,
+          datetime.now().isoformat()))
+    return dict(conn.execute(f"SELECT {EVENT_COLUMNS} FROM match_events WHERE id = ?",
+                             (cursor.lastrowid,)).fetchone())
+
+
+def events_for(conn, match_id: str, after_id: int = 0) -> List[dict]:
+    rows = conn.execute(
+        f"SELECT {EVENT_COLUMNS} FROM match_events WHERE match_id = ? AND id > ? ORDER BY id",
+        (match_id, after_id)
+    )
+    return [dict(row) for row in rows]
+
+
+def events_since(conn, after_id: int) -> List[dict]:
+    """Events of every match written after `after_id`, oldest first"""
+    rows = conn.execute(
+        f"SELECT {EVENT_COLUMNS} FROM match_events WHERE id > ? ORDER BY id", (after_id,)
+    )
+    return [dict(row) for row in rows]
+
+
+def latest_id(conn) -> int:
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM match_events").fetchone()[0]
+
+
+def delete_events(conn, match_id: str):
+    conn.execute("DELETE FROM match_events WHERE match_id = ?", (match_id,))
+
+
+def apply_match_change(conn, old: Optional[dict], new: Optional[dict]):
+    """Write the terminal event of a match leaving 'ongoing' for another status"""
+    if not old or not new or old.get("status") != "ongoing" or new.get("status") == "ongoing":
+        return
+    scored, conceded = (new[key] if new.get(key) is not None else old.get(key) or 0
+                        for key in ("fc_ssoa_score", "opponent_score"))
+    if new.get("status") == "completed":
+        kind, note = "final", None
+    else:
+        kind, note = "ended", f"Match {new['status']}"
+    insert_event(conn, old["id"], kind, scored, conceded, note=note)
+
+
+def deleted_event(match_id: str) -> dict:
+    """The `ended` event of a deleted match, which isn't stored and has no id"""
+    return {"match_id": match_id, "kind": "ended", "note": "Match deleted"}
+
+
+def format_sse(event: dict, name: Optional[str] = None, data: Optional[str] = None) -> str:
+    """One Server-Sent Events message (`data` defaults to the event as JSON)"""
+    lines = []
+    if "id" in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {name or event['kind']}")
+    lines.append(f"data: {data if data is not None else json.dumps(event, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class LiveHub:
+    """In-process fan-out of match events to bounded per-subscriber queues.
+
+    `fetch_since(id)` returns events written after `id`, `fetch_latest_id()`
+    the newest id, and `version_source()` changes after any committed write
+    (database.get_data_version); all three are awaited. The poller only runs
+    while someone is subscribed.
+    """
+
+    def __init__(self, fetch_since: Callable[[int], Awaitable[List[dict]]],
+                 fetch_latest_id: Callable[[], Awaitable[int]],
+                 version_source: Callable[[], Awaitable[int]],
+                 queue_size: int = QUEUE_SIZE, poll_interval: float = POLL_INTERVAL):
+        self.fetch_since = fetch_since
+        self.fetch_latest_id = fetch_latest_id
+        self.version_source = version_source
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+        self.delivered = 0
+        self.dropped = 0
+
+    async def subscribe(self, match_id: str) -> asyncio.Queue:
+        """A new queue receiving the match's events from now on"""
+        async with self._start_lock:
+            if self._task is None or self._task.done():
+                # Events up to here are the subscriber's snapshot, read after this returns
+                version = await self.version_source()
+                last_id = await self.fetch_latest_id()
+                self._wake = asyncio.Event()
+                self._task = asyncio.get_running_loop().create_task(self._run(last_id, version))
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            self._subscribers.setdefault(match_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, match_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(match_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[match_id]
+
+    def end(self, match_id: str):
+        """Send the match's subscribers an `ended` event that isn't stored (the match was deleted)"""
+        self.publish(deleted_event(match_id))
+
+    def wake(self):
+        """Look for new events now instead of at the next poll"""
+        if self._wake is not None:
+            self._wake.set()
+
+    def close(self):
+        """End every stream (used on shutdown)"""
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._offer(queue, None)
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def _offer(self, queue: asyncio.Queue, event: Optional[dict]):
+        if queue.full():
+            # A slow client loses its oldest event; each event carries the full score anyway
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(event)
+
+    def publish(self, event: dict):
+        for queue in self._subscribers.get(event["match_id"], ()):
+            self._offer(queue, event)
+            self.delivered += 1
+
+    async def _run(self, last_id: int, last_version: int):
+        while self._subscribers:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                version = await self.version_source()
+                if version == last_version:
+                    continue
+                events = await self.fetch_since(last_id)
+            except Exception as e:
+                print(f"Live event poll failed: {e}")
+                continue  # keep the old version, so the next poll retries
+            last_version = version
+            for event in events:
+                last_id = event["id"]
+                self.publish(event)
@@ -1,14 +1,56 @@
+from startup import StartupReport, FirstResponseTimer  # first, so import time is measured
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import players, matches, announcements, team
-from database import init_db
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from routers import players, matches, announcements, team, opponents, media, gallery, assets, bulk, search, dashboard, live
+from database import migrate_db, seed_db, gallery_worker, pool
+from cache import ResponseCache, ResponseCacheMiddleware
+from compression import CompressionMiddleware
+from metrics import MetricsMiddleware, registry as metrics_registry
+from async_database import get_data_version, live_hub
+
+try:
+    import orjson  # noqa: F401  (optional; ORJSONResponse needs it)
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
+startup_report = StartupReport()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database and background work before serving; clean up on shutdown"""
+    with startup_report.phase("migrations"):
+        startup_report.migrations = await run_in_threadpool(migrate_db)
+    with startup_report.phase("seed"):
+        await run_in_threadpool(seed_db)
+    with startup_report.phase("gallery worker"):
+        gallery_worker.start()  # first scan is delayed, see gallery.SCAN_START_DELAY
+    startup_report.mark_ready()
+    yield
+    live_hub.close()
+    gallery_worker.stop()
+    pool.close_all()
 
 app = FastAPI(
     title="FC Ssoa API",
     description="Backend API for FC Ssoa early morning soccer team",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultResponse,
+    lifespan=lifespan
 )
 
+# gzip/brotli compression of JSON and text bodies. Registered first so it
+# sits inside the response cache, which then stores compressed bodies.
+app.add_middleware(CompressionMiddleware)
+
+# Response cache for read-heavy GET routes, invalidated by database writes.
+# Registered before CORS so cached responses still get CORS headers.
+response_cache = ResponseCache(get_data_version)
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
+
 # CORS configuration - Allow all origins
 app.add_middleware(
     CORSMiddleware,
@@ -19,14 +61,19 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# Initialize database
-init_db()
-
 # Include routers
 app.include_router(team.router, prefix="/api/team", tags=["Team"])
 app.include_router(players.router, prefix="/api/players", tags=["Players"])
 app.include_router(matches.router, prefix="/api/matches", tags=["Matches"])
 app.include_router(announcements.router, prefix="/api/announcements", tags=["Announcements"])
+app.include_router(opponents.router, prefix="/api/opponents", tags=["Opponents"])
+app.include_router(media.router, prefix="/api/media", tags=["Media"])
+app.include_router(gallery.router, prefix="/api/gallery", tags=["Gallery"])
+app.include_router(assets.router, prefix="/api/assets", tags=["Assets"])
+app.include_router(bulk.router, prefix="/api/bulk", tags=["Bulk"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
+app.include_router(live.router, prefix="/api/live", tags=["Live"])
 
 @app.get("/")
 async def root():
@@ -40,35 +87,41 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
-@app.get("/api/gallery")
-async def get_gallery():
-    """Get gallery images"""
-    return {
-        "images": [
-            {
-                "id": "1",
-                "url": "https://images.unsplash.com/photo-1579952363873-27f3bade9f55",
-                "title": "Team Training",
-                "description": "Early morning training session",
-                "date": "2024-12-01"
-            },
-            {
-                "id": "2",
-                "url": "https://images.unsplash.com/photo-1606925797300-0b35e9d1794e",
-                "title": "Match Day",
-                "description": "Victory against FC Thunder",
-                "date": "2024-11-28"
-            },
-            {
-                "id": "3",
-                "url": "https://images.unsplash.com/photo-1560272564-c83b66b1ad12",
-                "title": "Team Photo",
-                "description": "FC Ssoa team photo 2024",
-                "date": "2024-11-15"
-            }
-        ]
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Response cache hit/miss counters"""
+    return response_cache.stats()
+
+@app.get("/api/health/startup")
+async def startup_timing():
+    """Cold-start timing: import and startup phases, readiness and first response (ms since import)"""
+    return startup_report.as_dict()
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Request, SQLite, CSV, cache and live-stream metrics in the Prometheus text format"""
+    cache = response_cache.stats()
+    samples = {
+        f"fc_ssoa_response_cache_{name}_total": ("counter", cache[name])
+        for name in ("hits", "misses", "not_modified", "invalidations", "evictions")
     }
+    samples["fc_ssoa_response_cache_entries"] = ("gauge", cache["entries"])
+    samples["fc_ssoa_live_subscribers"] = ("gauge", live_hub.subscriber_count)
+    samples["fc_ssoa_live_events_delivered_total"] = ("counter", live_hub.delivered)
+    samples["fc_ssoa_live_events_dropped_total"] = ("counter", live_hub.dropped)
+    return PlainTextResponse(metrics_registry.render(samples), media_type="text/plain; version=0.0.4")
+
+# Outside the cache, so cached responses are timed too
+app.add_middleware(MetricsMiddleware, metrics=metrics_registry, routes=app.routes)
+
+# Outermost, so it sees the first response whatever route serves it
+app.add_middleware(FirstResponseTimer, report=startup_report)
+
+startup_report.mark_imported()
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # Workers share all state through SQLite, so any number may run side by side
+    workers = int(os.environ.get("FC_SSOA_WORKERS", "1"))
+    uvicorn.run("main:app" if workers > 1 else app, host="0.0.0.0", port=8080, workers=workers)
@@ -0,0 +1,189 @@
+import hashlib
+import mimetypes
+import os
+import threading
+from email.utils import formatdate
+from typing import Dict, Optional, Tuple
+
+import anyio
+from starlette.responses import Response
+
+# Media settings (override through environment variables)
+MEDIA_DIR = os.environ.get(
+    "FC_SSOA_MEDIA_DIR",
+    os.environ.get("FC_SSOA_DATA_DIR", os.path.join(os.path.dirname(__file__), "data"))
+)
+MEDIA_MAX_AGE = int(os.environ.get("FC_SSOA_MEDIA_MAX_AGE", str(7 * 24 * 3600)))
+CHUNK_SIZE = 256 * 1024
+
+# Only these file types are ever served, so the database and CSVs next to
+# the media files stay private.
+MEDIA_EXTENSIONS = {".mp4", ".webm", ".mov", ".m4v", ".png", ".jpg", ".jpeg", ".gif", ".webp"}
+
+# Content digests keyed by (path, size, mtime_ns), so a file is hashed once per version
+_digest_cache: Dict[Tuple[str, int, int], str] = {}
+_digest_lock = threading.Lock()
+
+
+def resolve_media_path(relative_path: str, media_dir: str = MEDIA_DIR) -> Optional[str]:
+    """Absolute path of a servable media file, or None if it is missing or not allowed"""
+    root = os.path.realpath(media_dir)
+    path = os.path.realpath(os.path.join(root, relative_path))
+    if os.path.commonpath([root, path]) != root:
+        return None
+    if os.path.splitext(path)[1].lower() not in MEDIA_EXTENSIONS or not os.path.isfile(path):
+        return None
+    return path
+
+
+def file_digest(path: str) -> str:
+    """Hex blake2b digest of a file's bytes, read in 1 MB blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(path: str, stat_result: os.stat_result) -> str:
+    """file_digest of a file, cached until its size or mtime changes"""
+    key = (path, stat_result.st_size, stat_result.st_mtime_ns)
+    with _digest_lock:
+        digest = _digest_cache.get(key)
+    if digest is None:
+        digest = file_digest(path)
+        with _digest_lock:
+            _digest_cache[key] = digest
+    return digest
+
+
+def strong_etag(path: str, stat_result: os.stat_result) -> str:
+    """Strong ETag derived from the file's bytes"""
+    return f'"{content_hash(path, stat_result)}"'
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into inclusive (start, end).
+
+    Returns None when the header should be ignored (malformed or several
+    ranges) and raises ValueError when the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_str, sep, end_str = (part.strip() for part in spec.partition("-"))
+    if not sep or not all(part == "" or part.isdigit() for part in (start_str, end_str)):
+        return None
+
+    if not start_str:
+        # Suffix range: the last N bytes
+        if not end_str:
+            return None
+        suffix = int(end_str)
+        if suffix == 0:
+            raise ValueError("Range not satisfiable")
+        return max(size - suffix, 0), size - 1
+
+    start = int(start_str)
+    if start >= size:
+        raise ValueError("Range not satisfiable")
+    end = int(end_str) if end_str else size - 1
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+class MediaFileResponse(Response):
+    """ASGI response for a media file with Range, ETag and zero-copy support.
+
+    Uses the ASGI `http.response.zerocopysend` extension (sendfile) when the
+    server offers it and otherwise streams the requested byte range in
+    chunks read on a worker thread.
+    """
+
+    def __init__(self, path: str, max_age: int = MEDIA_MAX_AGE, headers: Optional[Dict[str, str]] = None):
+        self.path = path
+        self.max_age = max_age
+        self.extra_headers = headers or {}
+        self.status_code = 200
+        self.background = None
+
+    async def __call__(self, scope, receive, send):
+        await self._send_file(scope, send)
+        if self.background is not None:
+            await self.background()
+
+    async def _send_file(self, scope, send):
+        request_headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        etag = await anyio.to_thread.run_sync(strong_etag, self.path, stat_result)
+        size = stat_result.st_size
+
+        headers = [
+            (b"accept-ranges", b"bytes"),
+            (b"etag", etag.encode()),
+            (b"last-modified", formatdate(stat_result.st_mtime, usegmt=True).encode()),
+            (b"cache-control", f"public, max-age={self.max_age}".encode()),
+        ]
+        headers.extend((name.lower().encode("latin-1"), value.encode("latin-1"))
+                       for name, value in self.extra_headers.items())
+
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        content_type = mimetypes.guess_type(self.path)[0] or "application/octet-stream"
+        headers.append((b"content-type", content_type.encode()))
+
+        status, start, end = 200, 0, size - 1
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if range_header and size > 0 and (not if_range or if_range.strip() == etag):
+            try:
+                requested = parse_range(range_header, size)
+            except ValueError:
+                headers.append((b"content-range", f"bytes */{size}".encode()))
+                await send({"type": "http.response.start", "status": 416, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            if requested:
+                status, (start, end) = 206, requested
+                headers.append((b"content-range", f"bytes {start}-{end}/{size}".encode()))
+
+        length = end - start + 1 if size else 0
+        headers.append((b"content-length", str(length).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+
+        if scope["method"] == "HEAD" or length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        with open(self.path, "rb") as f:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f,
+                    "offset": start,
+                    "count": length,
+                })
+                return
+
+            await anyio.to_thread.run_sync(f.seek, start)
+            remaining = length
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(f.read, min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank while streaming; end the response cleanly
+                await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,254 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+
+# Request-level performance metrics.
+#
+# MetricsMiddleware times every HTTP request and files it under its route
+# template (/api/players/{player_id}, not the concrete path). While a
+# request runs, a RequestStats object sits in a context variable; the
+# thread-pool calls made for the request inherit it, so TimedConnection
+# (the pool's connection class) can add each statement's count and time to
+# it, and the pool can record each connection it opens. GET /api/metrics
+# renders everything in the Prometheus text format.
+#
+# Counters live in each worker process, so with several workers every
+# scrape sees the worker that served it.
+
+# Requests slower than this are printed with their query breakdown (0 = off)
+SLOW_REQUEST_MS = float(os.environ.get("FC_SSOA_SLOW_REQUEST_MS", "0"))
+
+# Latency histogram bucket bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """SQLite work done on behalf of one request"""
+
+    __slots__ = ("queries", "query_seconds", "connections", "statements")
+
+    def __init__(self, keep_statements: bool):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.connections = 0
+        # SQL text -> [count, seconds], only kept while the slow-request log is on
+        self.statements: Optional[Dict[str, list]] = {} if keep_statements else None
+
+    def add_query(self, sql: str, seconds: float):
+        self.queries += 1
+        self.query_seconds += seconds
+        if self.statements is not None:
+            entry = self.statements.setdefault(" ".join(sql.split()), [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("fc_ssoa_request_stats", default=None)
+
+
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        stats = _current.get()
+        if stats is None:
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            stats.add_query(sql, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        stats = _current.get()
+        if stats is None:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            stats.add_query(sql, time.perf_counter() - started)
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection whose statements count towards the current request's RequestStats"""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def connection_opened():
+    """Called by the pool whenever it opens a new SQLite connection"""
+    stats = _current.get()
+    if stats is not None:
+        stats.connections += 1
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "total")
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], _Histogram] = defaultdict(_Histogram)
+        self.responses: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.queries: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.query_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.connections: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.csv_writes: Dict[str, int] = defaultdict(int)
+        self.slow_requests = 0
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        with self._lock:
+            self.latency[key].observe(seconds)
+            self.responses[(method, route, status)] += 1
+            self.queries[key] += stats.queries
+            self.query_seconds[key] += stats.query_seconds
+            self.connections[key] += stats.connections
+
+    def count_slow_request(self):
+        with self._lock:
+            self.slow_requests += 1
+
+    def count_csv_write(self, destination: str):
+        with self._lock:
+            self.csv_writes[destination] += 1
+
+    def render(self, extra: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """Prometheus text exposition; `extra` adds unlabelled samples as name -> (type, value)"""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            family("fc_ssoa_request_duration_seconds", "histogram", "HTTP request latency by route")
+            for (method, route), histogram in sorted(self.latency.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                for bound, count in zip(LATENCY_BUCKETS, histogram.buckets):
+                    lines.append(f'fc_ssoa_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'fc_ssoa_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"fc_ssoa_request_duration_seconds_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"fc_ssoa_request_duration_seconds_count{{{labels}}} {histogram.count}")
+
+            family("fc_ssoa_responses_total", "counter", "HTTP responses by route and status code")
+            for (method, route, status), count in sorted(self.responses.items()):
+                lines.append(
+                    f'fc_ssoa_responses_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}'
+                )
+
+            for name, values, help_text in (
+                ("fc_ssoa_sqlite_queries_total", self.queries, "SQLite statements executed by route"),
+                ("fc_ssoa_sqlite_query_seconds_total", self.query_seconds, "Time spent executing SQLite statements by route"),
+                ("fc_ssoa_sqlite_connections_opened_total", self.connections, "SQLite connections opened while serving a route"),
+            ):
+                family(name, "counter", help_text)
+                for (method, route), value in sorted(values.items()):
+                    value = f"{value:.6f}" if isinstance(value, float) else value
+                    lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {value}')
+
+            family("fc_ssoa_csv_writes_total", "counter", "CSV files and exports written")
+            for destination, count in sorted(self.csv_writes.items()):
+                lines.append(f'fc_ssoa_csv_writes_total{{destination="{destination}"}} {count}')
+
+            family("fc_ssoa_slow_requests_total", "counter", "Requests slower than FC_SSOA_SLOW_REQUEST_MS")
+            lines.append(f"fc_ssoa_slow_requests_total {self.slow_requests}")
+
+        for name, (kind, value) in (extra or {}).items():
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry (main.py serves it, database.py counts CSV writes into it)
+registry = Metrics()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def route_template(scope, routes: Sequence = ()) -> str:
+    """The path template of the route serving the request (/api/players/{player_id})"""
+    route = scope.get("route")  # set by FastAPI's APIRoute while matching
+    if route is not None:
+        return route.path
+    # Served before routing (e.g. from the response cache) or by a plain
+    # Starlette route: match it here
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"  # 404s would otherwise add one series per path
+
+
+def _log_slow_request(method: str, path: str, status: int, seconds: float, stats: RequestStats):
+    print(f"Slow request: {method} {path} -> {status} in {seconds * 1000:.1f}ms "
+          f"({stats.queries} queries, {stats.query_seconds * 1000:.1f}ms in SQLite, "
+          f"{stats.connections} connections opened)")
+    ranked = sorted(stats.statements.items(), key=lambda item: -item[1][1])
+    for sql, (count, query_seconds) in ranked[:10]:
+        print(f"  {count:4d}x {query_seconds * 1000:8.2f}ms  {sql[:160]}")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and SQLite usage for every HTTP request"""
+
+    def __init__(self, app, metrics: Metrics, routes: Sequence = (),
+                 slow_request_ms: float = SLOW_REQUEST_MS):
+        self.app = app
+        self.metrics = metrics
+        self.routes = routes
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(keep_statements=self.slow_request_ms > 0)
+        token = _current.set(stats)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - started
+            _current.reset(token)
+            route = route_template(scope, self.routes)
+            self.metrics.observe(scope["method"], route, status, seconds, stats)
+            if self.slow_request_ms and seconds * 1000 >= self.slow_request_ms:
+                self.metrics.count_slow_request()
+                _log_slow_request(scope["method"], scope["path"], status, seconds, stats)
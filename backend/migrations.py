@@ -0,0 +1,152 @@
+import time
+from datetime import datetime
+from typing import Callable, List
+
+import analytics
+import gallery
+import head_to_head
+import leaderboard
+import ledger
+import live
+import ratings
+import search
+import team_stats
+
+# Versioned schema migrations.
+#
+# Every migration runs once, in its own transaction, and is recorded in
+# schema_version. The steps up to version 9 use IF NOT EXISTS (or check
+# the live schema) because databases created before this runner existed
+# already have some or all of those objects; they are adopted without
+# changes. New schema changes are appended with the next version number;
+# released entries are never edited.
+
+def _create_core_tables(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS matches (
+            id TEXT PRIMARY KEY,
+            match_date TEXT NOT NULL,
+            opponent TEXT NOT NULL,
+            location TEXT,
+            home_away TEXT DEFAULT 'home',
+            status TEXT DEFAULT 'scheduled',
+            fc_ssoa_score INTEGER,
+            opponent_score INTEGER,
+            notes TEXT,
+            goal_scorers TEXT,
+            assist_providers TEXT,
+            created_at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS players (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            position TEXT NOT NULL,
+            jersey_number INTEGER,
+            phone TEXT,
+            email TEXT,
+            join_date TEXT,
+            goals INTEGER NOT NULL DEFAULT 0,
+            assists INTEGER NOT NULL DEFAULT 0,
+            matches_played INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS announcements (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            author TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    ''')
+
+def _add_match_home_away(cursor):
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(matches)")}
+    if "home_away" not in columns:
+        cursor.execute("ALTER TABLE matches ADD COLUMN home_away TEXT DEFAULT 'home'")
+
+def _create_match_indexes(cursor):
+    # Filtered / keyset-paginated match lists
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (match_date, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_status_date ON matches (status, match_date, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_opponent_date ON matches (opponent, match_date, id)")
+
+def _create_player_indexes(cursor):
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_position ON players (position)")
+    leaderboard.create_indexes(cursor)
+
+def _create_aggregate_tables(cursor):
+    team_stats.create_table(cursor)
+    head_to_head.create_table(cursor)
+
+def _create_announcement_indexes(cursor):
+    # Keyset-paginated announcement lists
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_announcements_created ON announcements (created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_announcements_author_created ON announcements (author, created_at, id)")
+
+def _create_analytics_tables(cursor):
+    analytics.create_tables(cursor)
+    analytics.rebuild(cursor)  # backfill from the matches already recorded
+
+def _create_rating_tables(cursor):
+    ratings.create_tables(cursor)
+    ratings.replay(cursor)  # rate the matches already recorded
+
+MIGRATIONS: List[tuple] = [
+    (1, "core tables", _create_core_tables),
+    (2, "matches.home_away", _add_match_home_away),
+    (3, "match list indexes", _create_match_indexes),
+    (4, "player and leaderboard indexes", _create_player_indexes),
+    (5, "player stat ledger", ledger.create_table),
+    (6, "team and head-to-head aggregates", _create_aggregate_tables),
+    (7, "gallery media index", gallery.create_table),
+    (8, "announcement list indexes", _create_announcement_indexes),
+    (9, "full-text search index", search.create_table),
+    (10, "live match events", live.create_table),
+    (11, "form, streak and split analytics", _create_analytics_tables),
+    (12, "Elo opponent ratings", _create_rating_tables),
+]
+
+def create_version_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL,
+            seconds REAL NOT NULL
+        )
+    ''')
+
+def current_version(conn) -> int:
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def migrate(transaction: Callable) -> List[dict]:
+    """Apply pending migrations in order; returns the ones applied by this call.
+
+    Each step re-checks schema_version inside its own (BEGIN IMMEDIATE)
+    transaction, so several processes starting at once apply it only once.
+    """
+    with transaction() as conn:
+        create_version_table(conn)
+        version = current_version(conn)
+
+    applied = []
+    for number, name, step in MIGRATIONS:
+        if number <= version:
+            continue
+        started = time.perf_counter()
+        with transaction() as conn:
+            if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (number,)).fetchone():
+                continue
+            step(conn.cursor())
+            seconds = time.perf_counter() - started
+            conn.execute(
+                "INSERT INTO schema_version (version, name, applied_at, seconds) VALUES (?, ?, ?, ?)",
+                (number, name, datetime.now().isoformat(), round(seconds, 4))
+            )
+        applied.append({"version": number, "name": name, "seconds": round(seconds, 4)})
+        print(f"Applied migration {number}: {name}")
+    return applied
@@ -43,6 +43,42 @@ class Player(PlayerBase):
     class Config:
         from_attributes = True
 
+class LeaderboardMetric(str, Enum):
+    GOALS = "goals"
+    ASSISTS = "assists"
+    ATTACK_POINTS = "attack_points"
+    MATCHES_PLAYED = "matches_played"
+
+class LeaderboardEntry(Player):
+    rank: int
+    value: int
+
+class PlayerRank(BaseModel):
+    metric: LeaderboardMetric
+    value: int
+    rank: int
+    tied_with: int
+    total_players: int
+
+class StatTotals(BaseModel):
+    matches_played: int = 0
+    goals: int = 0
+    assists: int = 0
+
+class SeasonStats(StatTotals):
+    season: str
+
+class PlayerTotals(BaseModel):
+    player_id: str
+    seasons: List[SeasonStats]
+    career: StatTotals
+
+class SeasonTableRow(StatTotals):
+    id: str
+    name: str
+    position: PlayerPosition
+    jersey_number: Optional[int] = None
+
 class MatchBase(BaseModel):
     opponent: str = Field(..., min_length=1, max_length=100)
     match_date: str
@@ -73,6 +109,73 @@ class Match(MatchBase):
     class Config:
         from_attributes = True
 
+class MatchResult(Match):
+    result: Optional[str] = None
+
+class LiveEventCreate(BaseModel):
+    kind: str = Field(..., pattern="^(goal|opponent_goal|score|note)$",
+                      description="goal / opponent_goal add one; score sets both scores; note changes nothing")
+    minute: Optional[int] = Field(None, ge=0, le=200)
+    player_name: Optional[str] = Field(None, max_length=100)
+    note: Optional[str] = Field(None, max_length=500)
+    fc_ssoa_score: Optional[int] = Field(None, ge=0)
+    opponent_score: Optional[int] = Field(None, ge=0)
+
+class LiveEvent(BaseModel):
+    id: int
+    match_id: str
+    kind: str
+    minute: Optional[int] = None
+    player_name: Optional[str] = None
+    note: Optional[str] = None
+    fc_ssoa_score: int
+    opponent_score: int
+    created_at: str
+
+class HeadToHeadRecord(BaseModel):
+    total_matches: int
+    wins: int
+    draws: int
+    losses: int
+    win_rate: float
+
+class RecordedHeadToHead(HeadToHeadRecord):
+    goals_scored: int
+    goals_conceded: int
+
+class OpponentRecord(HeadToHeadRecord):
+    """W/D/L overall, split into the imported vs_team.csv record and recorded matches"""
+    opponent: str
+    upcoming_matches: int
+    imported: HeadToHeadRecord
+    recorded: RecordedHeadToHead
+
+class OpponentHistory(OpponentRecord):
+    recent: List[MatchResult]
+
+class OpponentRating(BaseModel):
+    opponent: str
+    rating: float
+    matches: int
+
+class RatingsTable(BaseModel):
+    team_rating: float
+    rated_matches: int
+    draw_rate: float
+    opponents: List[OpponentRating]
+
+class MatchPrediction(BaseModel):
+    match_id: str
+    match_date: str
+    opponent: str
+    home_away: str
+    team_rating: float
+    opponent_rating: float
+    expected_score: float
+    win: float
+    draw: float
+    loss: float
+
 class AnnouncementBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     content: str = Field(..., min_length=1)
@@ -94,6 +197,45 @@ class Announcement(AnnouncementBase):
     class Config:
         from_attributes = True
 
+# List entry; content is left out unless requested
+class AnnouncementSummary(BaseModel):
+    id: str
+    title: str
+    author: str
+    content: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+# Bulk import rows (see bulk.py); ids and timestamps are generated when omitted
+class PlayerImport(PlayerBase):
+    goals: int = Field(0, ge=0)
+    assists: int = Field(0, ge=0)
+    matches_played: int = Field(0, ge=0)
+
+class MatchImport(MatchBase):
+    id: Optional[str] = Field(None, min_length=1)
+    home_away: str = Field("home", pattern="^(home|away)$")
+    status: MatchStatus = MatchStatus.SCHEDULED
+    fc_ssoa_score: Optional[int] = Field(None, ge=0)
+    opponent_score: Optional[int] = Field(None, ge=0)
+    notes: Optional[str] = None
+    created_at: Optional[str] = None
+
+class AnnouncementImport(AnnouncementBase):
+    id: Optional[str] = Field(None, min_length=1)
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class BulkImportResult(BaseModel):
+    entity: str
+    received: int
+    imported: int
+    errors: List[ImportRowError] = []
+
 class TeamInfo(BaseModel):
     name: str = "FC쏘아"
     founded: str = "2024"
@@ -114,3 +256,90 @@ class TeamStats(BaseModel):
     total_goals_scored: int
     total_goals_conceded: int
     upcoming_matches: int
+
+class TeamSplit(str, Enum):
+    VENUE = "venue"
+    MONTH = "month"
+    SEASON = "season"
+
+class FormResult(BaseModel):
+    match_id: str
+    match_date: str
+    opponent: str
+    home_away: str
+    result: str
+    goals_scored: int
+    goals_conceded: int
+
+class TeamForm(BaseModel):
+    last: int
+    form: str
+    wins: int
+    draws: int
+    losses: int
+    goals_scored: int
+    goals_conceded: int
+    results: List[FormResult]
+
+class Streak(BaseModel):
+    length: int
+    from_date: Optional[str] = None
+    to_date: Optional[str] = None
+
+class TeamStreaks(BaseModel):
+    current_win: int
+    current_unbeaten: int
+    longest_win: Streak
+    longest_unbeaten: Streak
+
+class SplitRecord(BaseModel):
+    period: str
+    played: int
+    wins: int
+    draws: int
+    losses: int
+    goals_scored: int
+    goals_conceded: int
+    win_rate: float
+
+class PlayerChoice(BaseModel):
+    name: str
+    position: str
+    jersey_number: Optional[int] = None
+
+class DashboardBundle(BaseModel):
+    """Sections that weren't requested are null"""
+    stats: Optional[TeamStats] = None
+    matches: Optional[List[Match]] = None
+    upcoming: Optional[List[Match]] = None
+    completed: Optional[List[Match]] = None
+    players: Optional[List[PlayerChoice]] = None
+
+class SearchKind(str, Enum):
+    ANNOUNCEMENT = "announcement"
+    MATCH = "match"
+
+class SearchHit(BaseModel):
+    kind: SearchKind
+    id: str
+    date: str
+    title: str
+    snippet: str
+    score: float
+
+class GalleryItem(BaseModel):
+    id: str
+    kind: str
+    title: str
+    url: str
+    thumbnail_url: Optional[str] = None
+    thumbnail_status: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    size: int
+    content_hash: str
+    taken_at: str
+    date: str
+
+class GalleryPage(BaseModel):
+    images: List[GalleryItem]
@@ -0,0 +1,26 @@
+import base64
+import json
+from typing import List
+
+# Types a sort key can hold; anything else would fail to bind as an SQL parameter
+CURSOR_VALUE_TYPES = (str, int, float, type(None))
+
+
+def encode_cursor(*values) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    raw = json.dumps(list(values), ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """Decode a cursor produced by encode_cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    if not all(isinstance(value, CURSOR_VALUE_TYPES) for value in values):
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,251 @@
+import math
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from analytics import result_entry
+
+# Elo-style strength ratings of FC쏘아 and its opponents.
+#
+# Every completed match (in match_results order, see analytics.py) moves
+# the team's and the opponent's rating by K x goal-difference factor x
+# (actual - expected score), with a home advantage added to the home side.
+# A completion dated after every rated match is applied on its own, in the
+# match write's transaction. Anything else (a past result edited, moved or
+# deleted, or a back-filled result) replays the whole history in one pass
+# over match_results; inside batch() that replay runs once at the end.
+#
+# The hand-kept vs_team.csv records have no dates, so they can't be
+# replayed; they only set where an opponent's rating starts.
+
+INITIAL_RATING = 1500.0
+K_FACTOR = float(os.environ.get("FC_SSOA_ELO_K", "24"))
+HOME_ADVANTAGE = float(os.environ.get("FC_SSOA_ELO_HOME_ADVANTAGE", "60"))
+# Matches of imported history worth as much as the prior itself
+PRIOR_WEIGHT = 10
+# Draw share assumed until recorded matches say otherwise
+DEFAULT_DRAW_RATE = 0.25
+
+
+def create_tables(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS opponent_ratings (
+            opponent TEXT PRIMARY KEY,
+            rating REAL NOT NULL,
+            matches INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS team_rating (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            rating REAL NOT NULL,
+            matches INTEGER NOT NULL DEFAULT 0,
+            draws INTEGER NOT NULL DEFAULT 0,
+            through_date TEXT,
+            through_match_id TEXT
+        )
+    ''')
+
+
+def expected_score(team_rating: float, opponent_rating: float, home_away: str) -> float:
+    """FC쏘아's expected score (win = 1, draw = 0.5) against the opponent"""
+    advantage = HOME_ADVANTAGE if home_away == "home" else -HOME_ADVANTAGE
+    return 1 / (1 + 10 ** ((opponent_rating - team_rating - advantage) / 400))
+
+
+def _goal_factor(goal_difference: int) -> float:
+    # Bigger wins move ratings further (World Football Elo weighting)
+    goal_difference = abs(goal_difference)
+    if goal_difference <= 1:
+        return 1.0
+    if goal_difference == 2:
+        return 1.5
+    return (11 + goal_difference) / 8
+
+
+def rating_change(team_rating: float, opponent_rating: float, entry: dict) -> float:
+    """Points FC쏘아 gains (the opponent loses the same) from one result"""
+    actual = {"win": 1.0, "draw": 0.5, "loss": 0.0}[entry["result"]]
+    expected = expected_score(team_rating, opponent_rating, entry["home_away"])
+    goal_difference = entry["goals_scored"] - entry["goals_conceded"]
+    return K_FACTOR * _goal_factor(goal_difference) * (actual - expected)
+
+
+def prior_rating(record: Optional[dict]) -> float:
+    """Starting rating of an opponent, from its imported head-to-head record"""
+    played = record["total_matches"] if record else 0
+    if not played:
+        return INITIAL_RATING
+    score = (record["wins"] + 0.5 * record["draws"]) / played
+    score = min(max(score, 0.05), 0.95)
+    # Rating gap that makes `score` the expected score, shrunk towards 0 for short histories
+    gap = 400 * math.log10(score / (1 - score))
+    return INITIAL_RATING - gap * played / (played + PRIOR_WEIGHT)
+
+
+def _baseline_records(conn, opponent: Optional[str] = None) -> Dict[str, dict]:
+    query = "SELECT opponent, total_matches, wins, draws FROM opponent_records WHERE scope = 'baseline'"
+    params: Tuple = ()
+    if opponent is not None:
+        query += " AND opponent = ?"
+        params = (opponent,)
+    return {row["opponent"]: dict(row) for row in conn.execute(query, params)}
+
+
+def _team_row(conn) -> dict:
+    row = conn.execute(
+        "SELECT rating, matches, draws, through_date, through_match_id FROM team_rating WHERE id = 1"
+    ).fetchone()
+    if row:
+        return dict(row)
+    return {"rating": INITIAL_RATING, "matches": 0, "draws": 0, "through_date": None, "through_match_id": None}
+
+
+def _save_team_row(conn, team: dict):
+    conn.execute('''
+        INSERT OR REPLACE INTO team_rating (id, rating, matches, draws, through_date, through_match_id)
+        VALUES (1, ?, ?, ?, ?, ?)
+    ''', (team["rating"], team["matches"], team["draws"], team["through_date"], team["through_match_id"]))
+
+
+def _opponent_rating(conn, opponent: str) -> Tuple[float, int]:
+    row = conn.execute("SELECT rating, matches FROM opponent_ratings WHERE opponent = ?", (opponent,)).fetchone()
+    if row:
+        return row[0], row[1]
+    return prior_rating(_baseline_records(conn, opponent).get(opponent)), 0
+
+
+def replay(conn):
+    """Recompute every rating from the start, in one pass over the recorded results"""
+    priors = _baseline_records(conn)
+    opponents: Dict[str, List] = {}
+    team = {"rating": INITIAL_RATING, "matches": 0, "draws": 0, "through_date": None, "through_match_id": None}
+    rows = conn.execute('''
+        SELECT match_id, match_date, opponent, home_away, result, goals_scored, goals_conceded
+        FROM match_results ORDER BY match_date, match_id
+    ''')
+    for row in rows:
+        opponent = opponents.get(row["opponent"])
+        if opponent is None:
+            opponent = opponents[row["opponent"]] = [prior_rating(priors.get(row["opponent"])), 0]
+        change = rating_change(team["rating"], opponent[0], row)
+        team["rating"] += change
+        opponent[0] -= change
+        opponent[1] += 1
+        team["matches"] += 1
+        team["draws"] += row["result"] == "draw"
+        team["through_date"], team["through_match_id"] = row["match_date"], row["match_id"]
+
+    conn.execute("DELETE FROM opponent_ratings")
+    conn.executemany("INSERT INTO opponent_ratings (opponent, rating, matches) VALUES (?, ?, ?)",
+                     [(name, rating, matches) for name, (rating, matches) in opponents.items()])
+    _save_team_row(conn, team)
+
+
+_batch = threading.local()
+
+
+@contextmanager
+def batch(conn) -> Iterator[None]:
+    """Within the block, match writes on `conn` that need a replay share one, run at the end"""
+    _batch.conn, _batch.pending = conn, False
+    try:
+        yield
+        if _batch.pending:
+            replay(conn)
+    finally:
+        _batch.conn = None
+
+
+def apply_match_change(conn, old: Optional[dict], new: Optional[dict]):
+    """Rate a newly completed latest match, or replay the history for any other result change"""
+    before, after = result_entry(old), result_entry(new)
+    if before == after:
+        return
+    in_batch = getattr(_batch, "conn", None) is conn
+    if in_batch and _batch.pending:
+        return  # the replay at the end of the batch covers this write too
+
+    team = _team_row(conn)
+    through = (team["through_date"], team["through_match_id"])
+    if before is None and (through[0] is None or (after["match_date"], after["match_id"]) > through):
+        opponent_rating, matches = _opponent_rating(conn, after["opponent"])
+        change = rating_change(team["rating"], opponent_rating, after)
+        conn.execute('''
+            INSERT OR REPLACE INTO opponent_ratings (opponent, rating, matches) VALUES (?, ?, ?)
+        ''', (after["opponent"], opponent_rating - change, matches + 1))
+        team["rating"] += change
+        team["matches"] += 1
+        team["draws"] += after["result"] == "draw"
+        team["through_date"], team["through_match_id"] = after["match_date"], after["match_id"]
+        _save_team_row(conn, team)
+    elif in_batch:
+        _batch.pending = True
+    else:
+        replay(conn)
+
+
+def draw_rate(team: dict) -> float:
+    """Share of draws among rated matches, kept between 5% and 50%"""
+    if team["matches"] < PRIOR_WEIGHT:
+        return DEFAULT_DRAW_RATE
+    return min(max(team["draws"] / team["matches"], 0.05), 0.5)
+
+
+def outcome_probabilities(expected: float, draws: float) -> Dict[str, float]:
+    """Win/draw/loss probabilities with the given expected score.
+
+    Draws are most likely between equal sides: at an expected score of 0.5
+    the draw probability is the observed draw rate, falling to 0 as one side
+    becomes a certain winner. Win and loss split the rest so that
+    win + draw / 2 equals the expected score.
+    """
+    draw = draws * 4 * expected * (1 - expected)
+    return {
+        "win": round(expected - draw / 2, 4),
+        "draw": round(draw, 4),
+        "loss": round(1 - expected - draw / 2, 4),
+    }
+
+
+def table(conn) -> dict:
+    """The team's rating and every rated opponent, strongest first"""
+    team = _team_row(conn)
+    rows = conn.execute("SELECT opponent, rating, matches FROM opponent_ratings ORDER BY rating DESC, opponent")
+    return {
+        "team_rating": round(team["rating"], 1),
+        "rated_matches": team["matches"],
+        "draw_rate": round(draw_rate(team), 4),
+        "opponents": [
+            {"opponent": row["opponent"], "rating": round(row["rating"], 1), "matches": row["matches"]}
+            for row in rows
+        ],
+    }
+
+
+def predict(conn, matches: List[dict]) -> List[dict]:
+    """Expected score and W/D/L probabilities of each (scheduled) match"""
+    team = _team_row(conn)
+    draws = draw_rate(team)
+    # Read once for all matches; unrated opponents start from their prior
+    rated = {row["opponent"]: row["rating"] for row in conn.execute("SELECT opponent, rating FROM opponent_ratings")}
+    priors = _baseline_records(conn)
+    predictions = []
+    for match in matches:
+        opponent_rating = rated.get(match["opponent"])
+        if opponent_rating is None:
+            opponent_rating = prior_rating(priors.get(match["opponent"]))
+        home_away = match.get("home_away") or "home"
+        expected = expected_score(team["rating"], opponent_rating, home_away)
+        predictions.append({
+            "match_id": match["id"],
+            "match_date": match["match_date"],
+            "opponent": match["opponent"],
+            "home_away": home_away,
+            "team_rating": round(team["rating"], 1),
+            "opponent_rating": round(opponent_rating, 1),
+            "expected_score": round(expected, 4),
+            **outcome_probabilities(expected, draws),
+        })
+    return predictions
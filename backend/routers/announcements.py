@@ -1,28 +1,56 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
-from models import Announcement, AnnouncementCreate, AnnouncementUpdate
-from database import (
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
+from models import Announcement, AnnouncementCreate, AnnouncementUpdate, AnnouncementSummary
+from async_database import (
     get_announcements,
     get_announcement,
     create_announcement,
     update_announcement,
     delete_announcement
 )
+from pagination import encode_cursor, decode_cursor
 
 router = APIRouter()
 
-@router.get("", response_model=List[Announcement])
+def _set_next_cursor(response: Response, announcements: List[dict], limit: int):
+    """Expose the keyset cursor for the next page when this page is full"""
+    if len(announcements) == limit:
+        last = announcements[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
+
+@router.get("", response_model=List[AnnouncementSummary], response_model_exclude_none=True)
 async def list_announcements(
-    limit: int = Query(20, ge=1, le=100, description="Limit number of results")
+    response: Response,
+    limit: int = Query(20, ge=1, le=100, description="Limit number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    author: Optional[str] = Query(None, description="Filter by author"),
+    date_from: Optional[str] = Query(None, description="Earliest creation date (inclusive)"),
+    date_to: Optional[str] = Query(None, description="Latest creation date (inclusive)"),
+    include_content: bool = Query(False, description="Include the announcement body")
 ):
-    """Get all announcements"""
-    announcements = get_announcements()
-    return announcements[:limit]
+    """Get announcements, newest first, with keyset pagination"""
+    after = None
+    if cursor:
+        try:
+            after = tuple(decode_cursor(cursor, 2))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    announcements = await get_announcements(
+        author=author,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+        cursor=after,
+        with_content=include_content
+    )
+    _set_next_cursor(response, announcements, limit)
+    return announcements
 
 @router.get("/{announcement_id}", response_model=Announcement)
 async def get_announcement_by_id(announcement_id: str):
     """Get a specific announcement by ID"""
-    announcement = get_announcement(announcement_id)
+    announcement = await get_announcement(announcement_id)
     if not announcement:
         raise HTTPException(status_code=404, detail="Announcement not found")
     return announcement
@@ -31,18 +59,18 @@ async def get_announcement_by_id(announcement_id: str):
 async def create_new_announcement(announcement: AnnouncementCreate):
     """Create a new announcement"""
     announcement_data = announcement.model_dump()
-    new_announcement = create_announcement(announcement_data)
+    new_announcement = await create_announcement(announcement_data)
     return new_announcement
 
 @router.put("/{announcement_id}", response_model=Announcement)
 async def update_announcement_by_id(announcement_id: str, announcement_update: AnnouncementUpdate):
     """Update an announcement"""
-    announcement = get_announcement(announcement_id)
+    announcement = await get_announcement(announcement_id)
     if not announcement:
         raise HTTPException(status_code=404, detail="Announcement not found")
 
     update_data = announcement_update.model_dump(exclude_unset=True)
-    updated_announcement = update_announcement(announcement_id, update_data)
+    updated_announcement = await update_announcement(announcement_id, update_data)
 
     if not updated_announcement:
         raise HTTPException(status_code=404, detail="Announcement not found")
@@ -52,13 +80,15 @@ async def update_announcement_by_id(announcement_id: str, announcement_update: A
 @router.delete("/{announcement_id}", status_code=204)
 async def delete_announcement_by_id(announcement_id: str):
     """Delete an announcement"""
-    success = delete_announcement(announcement_id)
+    success = await delete_announcement(announcement_id)
     if not success:
         raise HTTPException(status_code=404, detail="Announcement not found")
     return None
 
-@router.get("/latest/list", response_model=List[Announcement])
-async def get_latest_announcements(limit: int = Query(5, ge=1, le=20)):
+@router.get("/latest/list", response_model=List[AnnouncementSummary], response_model_exclude_none=True)
+async def get_latest_announcements(
+    limit: int = Query(5, ge=1, le=20),
+    include_content: bool = Query(False, description="Include the announcement body")
+):
     """Get latest announcements"""
-    announcements = get_announcements()
-    return announcements[:limit]
+    return await get_announcements(limit=limit, with_content=include_content)
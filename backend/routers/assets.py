@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from assets import VARIANT_WIDTHS, resolve_asset, negotiate_format, get_variant
+from media import MediaFileResponse
+
+router = APIRouter()
+
+@router.api_route("/{name}", methods=["GET", "HEAD"])
+async def get_asset(
+    name: str,
+    request: Request,
+    w: Optional[int] = Query(None, description=f"Width in pixels, one of {', '.join(map(str, VARIANT_WIDTHS))}")
+):
+    """Get a resized, recompressed image asset (WebP when accepted, otherwise PNG)"""
+    if w is not None and w not in VARIANT_WIDTHS:
+        raise HTTPException(status_code=400, detail=f"w must be one of {list(VARIANT_WIDTHS)}")
+    source = resolve_asset(name)
+    if not source:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    fmt = negotiate_format(request.headers.get("accept"))
+    path = await run_in_threadpool(get_variant, source, w, fmt)
+    return MediaFileResponse(path, headers={"Vary": "Accept"})
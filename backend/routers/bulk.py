@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from enum import Enum
+from typing import Optional
+from models import BulkImportResult
+from async_database import import_records, export_records
+from bulk import ImportTooLarge, read_records
+
+router = APIRouter()
+
+class BulkEntity(str, Enum):
+    PLAYERS = "players"
+    MATCHES = "matches"
+    ANNOUNCEMENTS = "announcements"
+
+class BulkFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+MEDIA_TYPES = {
+    BulkFormat.CSV: "text/csv",
+    BulkFormat.NDJSON: "application/x-ndjson",
+}
+
+def _request_format(request: Request, fmt: Optional[BulkFormat]) -> BulkFormat:
+    if fmt:
+        return fmt
+    content_type = request.headers.get("content-type", "")
+    return BulkFormat.CSV if "csv" in content_type else BulkFormat.NDJSON
+
+@router.post("/{entity}/import", response_model=BulkImportResult)
+async def import_entity(
+    entity: BulkEntity,
+    request: Request,
+    format: Optional[BulkFormat] = Query(None, description="Body format (default: from Content-Type, else NDJSON)"),
+    skip_invalid: bool = Query(False, description="Import the valid rows even if some rows are invalid")
+):
+    """Import CSV or NDJSON rows in one transaction, reporting validation errors per row"""
+    try:
+        records = await read_records(request.stream(), _request_format(request, format).value)
+    except ImportTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    result = await import_records(entity.value, records, skip_invalid)
+    if result["errors"] and not skip_invalid:
+        raise HTTPException(status_code=422, detail=result)
+    return result
+
+@router.get("/{entity}/export")
+async def export_entity(
+    entity: BulkEntity,
+    format: BulkFormat = Query(BulkFormat.NDJSON, description="csv or ndjson")
+):
+    """Stream every row as CSV or NDJSON"""
+    return StreamingResponse(
+        export_records(entity.value, format.value),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={entity.value}.{format.value}"}
+    )
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from models import DashboardBundle
+from async_database import get_dashboard
+from database import DASHBOARD_SECTIONS
+
+router = APIRouter()
+
+@router.get("", response_model=DashboardBundle)
+async def dashboard(
+    include: Optional[str] = Query(
+        None, description=f"Comma-separated sections to return ({', '.join(DASHBOARD_SECTIONS)}); all by default"
+    ),
+    upcoming_limit: int = Query(5, ge=1, le=50, description="Number of upcoming matches"),
+    completed_limit: int = Query(10, ge=1, le=100, description="Number of completed matches")
+):
+    """Team stats, match lists and the player picker in one request, read from one consistent snapshot"""
+    sections = [name.strip() for name in include.split(",") if name.strip()] if include else list(DASHBOARD_SECTIONS)
+    unknown = sorted(set(sections) - set(DASHBOARD_SECTIONS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+    return await get_dashboard(sections, upcoming_limit, completed_limit)
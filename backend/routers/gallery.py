@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Optional
+from models import GalleryItem, GalleryPage
+from async_database import get_gallery_page, get_gallery_item
+from database import gallery_worker
+from pagination import encode_cursor, decode_cursor
+
+router = APIRouter()
+
+@router.get("", response_model=GalleryPage)
+async def list_gallery(
+    response: Response,
+    limit: int = Query(24, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    kind: Optional[str] = Query(None, pattern="^(image|video)$", description="Only images or only videos")
+):
+    """Get gallery media, newest first, with keyset pagination"""
+    try:
+        after = tuple(decode_cursor(cursor, 2)) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    items = await get_gallery_page(limit=limit, cursor=after, kind=kind)
+    if len(items) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(items[-1]["taken_at"], items[-1]["id"])
+    return {"images": items}
+
+@router.post("/rescan", status_code=202)
+async def rescan_gallery():
+    """Ask the background worker to rescan the media directory now"""
+    gallery_worker.wake()
+    return {"scheduled": True, "last_run": gallery_worker.last_run}
+
+@router.get("/{media_id}", response_model=GalleryItem)
+async def get_gallery_media(media_id: str):
+    """Get one gallery item"""
+    item = await get_gallery_item(media_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Gallery item not found")
+    return item
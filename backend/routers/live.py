@@ -0,0 +1,109 @@
+import asyncio
+import json
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import List, Optional
+from models import LiveEvent, LiveEventCreate, Match
+from async_database import (
+    start_live_match,
+    record_live_event,
+    get_live_snapshot,
+    get_live_events,
+    get_match,
+    live_hub
+)
+from database import MatchNotLive
+from live import HEARTBEAT_INTERVAL, TERMINAL_KINDS, deleted_event, format_sse
+
+router = APIRouter()
+
+@router.post("/{match_id}/start", response_model=Match)
+async def start_match(match_id: str):
+    """Mark a scheduled match as ongoing (0-0) so live events can be posted"""
+    try:
+        match = await start_live_match(match_id)
+    except MatchNotLive as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+    live_hub.wake()
+    return match
+
+@router.post("/{match_id}/events", response_model=LiveEvent, status_code=201)
+async def post_event(match_id: str, event: LiveEventCreate):
+    """Record a goal, conceded goal, score correction or note; every stream of the match receives it"""
+    if event.kind == "score" and (event.fc_ssoa_score is None or event.opponent_score is None):
+        raise HTTPException(status_code=400, detail="A score event needs fc_ssoa_score and opponent_score")
+    try:
+        stored = await record_live_event(match_id, event.model_dump())
+    except MatchNotLive as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not stored:
+        raise HTTPException(status_code=404, detail="Match not found")
+    live_hub.wake()
+    return stored
+
+@router.get("/{match_id}/events", response_model=List[LiveEvent])
+async def list_events(match_id: str):
+    """Every live event of a match so far, oldest first"""
+    snapshot = await get_live_snapshot(match_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Match not found")
+    return snapshot["events"]
+
+@router.get("/{match_id}/stream")
+async def stream_events(match_id: str, last_event_id: Optional[int] = Header(None)):
+    """Server-Sent Events stream of a match.
+
+    A new connection starts with a `snapshot` event (the match and its events
+    so far); a reconnect with Last-Event-ID gets the missed events instead.
+    The stream ends after the `final` event, sent when the ongoing match is
+    completed, or the `ended` event, sent when it is edited to another
+    status or deleted (the `ended` event of a deleted match has no id).
+    """
+    queue = await live_hub.subscribe(match_id)
+    try:
+        snapshot = await get_live_snapshot(match_id)
+    except Exception:
+        live_hub.unsubscribe(match_id, queue)
+        raise
+    if not snapshot:
+        live_hub.unsubscribe(match_id, queue)
+        raise HTTPException(status_code=404, detail="Match not found")
+
+    async def events():
+        events = snapshot["events"]
+        seen = events[-1]["id"] if events else 0
+        if last_event_id is not None:
+            for event in events:
+                if event["id"] > last_event_id:
+                    yield format_sse(event)
+        else:
+            yield format_sse({"id": seen}, "snapshot", json.dumps(snapshot, ensure_ascii=False))
+        if snapshot["match"]["status"] in ("completed", "cancelled"):
+            return
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                # A match deleted through another worker sends no event here
+                if not await get_match(match_id):
+                    yield format_sse(deleted_event(match_id))
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            if "id" in event and event["id"] <= seen:
+                continue
+            yield format_sse(event)
+            if event["kind"] in TERMINAL_KINDS:
+                return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(live_hub.unsubscribe, match_id, queue)
+    )
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
-from pydantic import BaseModel
-from models import Match, MatchCreate, MatchUpdate, MatchStatus
-from database import (
+from pydantic import BaseModel, Field
+from models import Match, MatchCreate, MatchUpdate, MatchStatus, PlayerChoice, MatchPrediction
+from async_database import (
     get_matches,
     get_match,
     create_match,
     update_match,
     delete_match,
     complete_match,
-    get_players
+    complete_matches,
+    get_player_choices,
+    predict_matches,
+    get_upcoming_predictions,
+    live_hub
 )
+from database import MatchNotCompletable
+from pagination import encode_cursor, decode_cursor
 
 router = APIRouter()
 
@@ -23,63 +29,122 @@ class MatchCompleteRequest(BaseModel):
     opponent_score: int
     goals: Optional[List[GoalAssist]] = []
     assists: Optional[List[GoalAssist]] = []
+    players: Optional[List[str]] = Field([], description="Players who played (scorers and assisters are added automatically)")
+
+class BulkMatchComplete(MatchCompleteRequest):
+    match_id: str
+
+class BulkMatchCompleteRequest(BaseModel):
+    matches: List[BulkMatchComplete] = Field(..., min_length=1, max_length=500)
+
+def _decode_match_cursor(cursor: Optional[str]):
+    if not cursor:
+        return None
+    try:
+        return tuple(decode_cursor(cursor, 2))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _set_next_cursor(response: Response, matches: List[dict], limit: Optional[int]):
+    """Expose the keyset cursor for the next page when this page is full"""
+    if limit and len(matches) == limit:
+        last = matches[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["match_date"], last["id"])
 
 @router.get("", response_model=List[Match])
 async def list_matches(
+    response: Response,
     status: Optional[MatchStatus] = Query(None, description="Filter by match status"),
-    limit: Optional[int] = Query(None, ge=1, le=100, description="Limit number of results")
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Limit number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    date_from: Optional[str] = Query(None, description="Earliest match date (inclusive)"),
+    date_to: Optional[str] = Query(None, description="Latest match date (inclusive)"),
+    opponent: Optional[str] = Query(None, description="Filter by opponent"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort by match date")
 ):
-    """Get all matches with optional filtering"""
-    matches = get_matches()
-
-    if status:
-        matches = [m for m in matches if m.get("status") == status]
-
-    if limit:
-        matches = matches[:limit]
-
+    """Get all matches with optional filtering and keyset pagination"""
+    matches = await get_matches(
+        status=status.value if status else None,
+        date_from=date_from,
+        date_to=date_to,
+        opponent=opponent,
+        limit=limit,
+        cursor=_decode_match_cursor(cursor),
+        order=order,
+        with_stats=False
+    )
+    _set_next_cursor(response, matches, limit)
     return matches
 
-@router.get("/players-for-stats")
+@router.get("/players-for-stats", response_model=List[PlayerChoice])
 async def get_players_for_stats():
     """Get list of players for goal/assist selection"""
-    players = get_players()
-    return [{"name": p["name"], "position": p["position"], "jersey_number": p.get("jersey_number")} for p in players]
+    return await get_player_choices()
 
 @router.get("/{match_id}", response_model=Match)
 async def get_match_by_id(match_id: str):
     """Get a specific match by ID"""
-    match = get_match(match_id)
+    match = await get_match(match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     return match
 
+@router.get("/{match_id}/prediction", response_model=MatchPrediction)
+async def get_match_prediction(match_id: str):
+    """Get the win/draw/loss expectation of a match that hasn't been played, from current ratings"""
+    match = await get_match(match_id)
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+    if match.get("status") == "completed":
+        raise HTTPException(status_code=400, detail="Match already completed")
+    return (await predict_matches([match]))[0]
+
 @router.post("", response_model=Match, status_code=201)
 async def create_new_match(match: MatchCreate):
     """Create a new match"""
     match_data = match.model_dump()
-    new_match = create_match(match_data)
+    new_match = await create_match(match_data)
     return new_match
 
 @router.put("/{match_id}", response_model=Match)
 async def update_match_by_id(match_id: str, match_update: MatchUpdate):
     """Update a match"""
-    match = get_match(match_id)
+    match = await get_match(match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
 
     update_data = match_update.model_dump(exclude_unset=True)
-    updated_match = update_match(match_id, update_data)
+    updated_match = await update_match(match_id, update_data)
 
     if not updated_match:
         raise HTTPException(status_code=404, detail="Match not found")
 
     return updated_match
 
+@router.post("/bulk/complete", response_model=List[Match])
+async def complete_matches_in_bulk(request: BulkMatchCompleteRequest):
+    """Complete several matches in one transaction (e.g. back-filling a season)"""
+    completions = [
+        {
+            "match_id": m.match_id,
+            "fc_ssoa_score": m.fc_ssoa_score,
+            "opponent_score": m.opponent_score,
+            "goal_scorers": [g.model_dump() for g in m.goals] if m.goals else [],
+            "assist_providers": [a.model_dump() for a in m.assists] if m.assists else [],
+            "appearances": m.players or []
+        }
+        for m in request.matches
+    ]
+
+    try:
+        return await complete_matches(completions)
+    except MatchNotCompletable as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/{match_id}/complete", response_model=Match)
 async def complete_match_with_stats(match_id: str, request: MatchCompleteRequest):
     """Complete a match and update player stats with goals and assists"""
-    match = get_match(match_id)
+    match = await get_match(match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
@@ -89,12 +154,13 @@ async def complete_match_with_stats(match_id: str, request: MatchCompleteRequest
     goal_scorers = [g.model_dump() for g in request.goals] if request.goals else []
     assist_providers = [a.model_dump() for a in request.assists] if request.assists else []
     
-    updated_match = complete_match(
+    updated_match = await complete_match(
         match_id,
         request.fc_ssoa_score,
         request.opponent_score,
         goal_scorers,
-        assist_providers
+        assist_providers,
+        request.players or []
     )
     
     if not updated_match:
@@ -105,22 +171,38 @@ async def complete_match_with_stats(match_id: str, request: MatchCompleteRequest
 @router.delete("/{match_id}", status_code=204)
 async def delete_match_by_id(match_id: str):
     """Delete a match"""
-    success = delete_match(match_id)
+    success = await delete_match(match_id)
     if not success:
         raise HTTPException(status_code=404, detail="Match not found")
+    live_hub.end(match_id)
     return None
 
 @router.get("/upcoming/list", response_model=List[Match])
-async def get_upcoming_matches(limit: int = Query(5, ge=1, le=50)):
+async def get_upcoming_matches(
+    response: Response,
+    limit: int = Query(5, ge=1, le=50),
+    cursor: Optional[str] = Query(None)
+):
     """Get upcoming matches"""
-    matches = get_matches()
-    upcoming = [m for m in matches if m.get("status") == "scheduled"]
-    return upcoming[:limit]
+    upcoming = await get_matches(status="scheduled", limit=limit,
+                                 cursor=_decode_match_cursor(cursor), with_stats=False)
+    _set_next_cursor(response, upcoming, limit)
+    return upcoming
 
 @router.get("/completed/list", response_model=List[Match])
-async def get_completed_matches(limit: int = Query(10, ge=1, le=100)):
+async def get_completed_matches(
+    response: Response,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
+):
     """Get completed matches"""
-    matches = get_matches()
-    completed = [m for m in matches if m.get("status") == "completed"]
-    return completed[:limit]
+    completed = await get_matches(status="completed", limit=limit,
+                                  cursor=_decode_match_cursor(cursor), with_stats=False)
+    _set_next_cursor(response, completed, limit)
+    return completed
+
 
+@router.get("/predictions/list", response_model=List[MatchPrediction])
+async def get_match_predictions(limit: int = Query(10, ge=1, le=50)):
+    """Get win/draw/loss expectations of the next scheduled matches, soonest first"""
+    return await get_upcoming_predictions(limit)
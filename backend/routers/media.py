@@ -0,0 +1,12 @@
+from fastapi import APIRouter, HTTPException
+from media import MediaFileResponse, resolve_media_path
+
+router = APIRouter()
+
+@router.api_route("/{file_path:path}", methods=["GET", "HEAD"])
+async def get_media_file(file_path: str):
+    """Stream a video or image from the media directory (supports HTTP Range requests)"""
+    path = resolve_media_path(file_path)
+    if not path:
+        raise HTTPException(status_code=404, detail="Media file not found")
+    return MediaFileResponse(path)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List
+from models import OpponentRecord, OpponentHistory, RatingsTable
+from async_database import get_opponent_records, get_opponent_history, get_ratings
+
+router = APIRouter()
+
+@router.get("", response_model=List[OpponentRecord])
+async def list_opponent_records():
+    """Get the head-to-head record against every opponent"""
+    return await get_opponent_records()
+
+@router.get("/ratings/list", response_model=RatingsTable)
+async def list_ratings():
+    """Get the Elo ratings of the team and every opponent, strongest opponent first"""
+    return await get_ratings()
+
+@router.get("/{opponent}", response_model=OpponentHistory)
+async def get_opponent_record(opponent: str, last: int = Query(5, ge=1, le=50)):
+    """Get the record against one opponent and the most recent results"""
+    history = await get_opponent_history(opponent, last)
+    if not history:
+        raise HTTPException(status_code=404, detail="Opponent not found")
+    return history
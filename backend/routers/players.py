@@ -1,12 +1,28 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-from models import Player, PlayerCreate, PlayerUpdate, PlayerPosition
-from database import (
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Dict, List, Optional
+from models import (
+    Player,
+    PlayerCreate,
+    PlayerUpdate,
+    PlayerPosition,
+    LeaderboardEntry,
+    LeaderboardMetric,
+    PlayerRank,
+    PlayerTotals,
+    SeasonTableRow
+)
+from async_database import (
     get_players,
     get_player,
     create_player,
     update_player,
-    delete_player
+    delete_player,
+    export_players_csv,
+    get_leaderboard,
+    get_player_ranks,
+    get_seasons,
+    get_season_table,
+    get_player_totals
 )
 
 router = APIRouter()
@@ -14,30 +30,18 @@ router = APIRouter()
 @router.get("", response_model=List[Player])
 async def list_players(
     position: Optional[PlayerPosition] = Query(None, description="Filter by position"),
-    sort_by: Optional[str] = Query("name", description="Sort by field (name, goals, assists, matches_played)")
+    sort_by: Optional[str] = Query("name", description="Sort by field (name, goals, assists, attack_points, matches_played)")
 ):
     """Get all players with optional filtering and sorting"""
-    players = get_players()
-
-    if position:
-        players = [p for p in players if p.get("position") == position]
-
-    # Sort players
-    if sort_by == "goals":
-        players = sorted(players, key=lambda x: x.get("goals", 0), reverse=True)
-    elif sort_by == "assists":
-        players = sorted(players, key=lambda x: x.get("assists", 0), reverse=True)
-    elif sort_by == "matches_played":
-        players = sorted(players, key=lambda x: x.get("matches_played", 0), reverse=True)
-    else:
-        players = sorted(players, key=lambda x: x.get("name", ""))
-
-    return players
+    return await get_players(
+        position=position.value if position else None,
+        sort_by=sort_by or "name"
+    )
 
 @router.get("/{player_id}", response_model=Player)
 async def get_player_by_id(player_id: str):
     """Get a specific player by ID"""
-    player = get_player(player_id)
+    player = await get_player(player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     return player
@@ -46,18 +50,18 @@ async def get_player_by_id(player_id: str):
 async def create_new_player(player: PlayerCreate):
     """Create a new player"""
     player_data = player.model_dump()
-    new_player = create_player(player_data)
+    new_player = await create_player(player_data)
     return new_player
 
 @router.put("/{player_id}", response_model=Player)
 async def update_player_by_id(player_id: str, player_update: PlayerUpdate):
     """Update a player"""
-    player = get_player(player_id)
+    player = await get_player(player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
 
     update_data = player_update.model_dump(exclude_unset=True)
-    updated_player = update_player(player_id, update_data)
+    updated_player = await update_player(player_id, update_data)
 
     if not updated_player:
         raise HTTPException(status_code=404, detail="Player not found")
@@ -67,7 +71,7 @@ async def update_player_by_id(player_id: str, player_update: PlayerUpdate):
 @router.delete("/{player_id}", status_code=204)
 async def delete_player_by_id(player_id: str):
     """Delete a player"""
-    success = delete_player(player_id)
+    success = await delete_player(player_id)
     if not success:
         raise HTTPException(status_code=404, detail="Player not found")
     return None
@@ -75,13 +79,54 @@ async def delete_player_by_id(player_id: str):
 @router.get("/top/scorers", response_model=List[Player])
 async def get_top_scorers(limit: int = Query(10, ge=1, le=50)):
     """Get top scorers"""
-    players = get_players()
-    sorted_players = sorted(players, key=lambda x: x.get("goals", 0), reverse=True)
-    return sorted_players[:limit]
+    return await get_leaderboard("goals", limit)
 
 @router.get("/top/assisters", response_model=List[Player])
 async def get_top_assisters(limit: int = Query(10, ge=1, le=50)):
     """Get top assist providers"""
-    players = get_players()
-    sorted_players = sorted(players, key=lambda x: x.get("assists", 0), reverse=True)
-    return sorted_players[:limit]
+    return await get_leaderboard("assists", limit)
+
+@router.get("/leaderboard/{metric}", response_model=List[LeaderboardEntry])
+async def get_metric_leaderboard(
+    metric: LeaderboardMetric,
+    limit: int = Query(10, ge=1, le=100),
+    include_ties: bool = Query(False, description="Also return players tied with the last entry")
+):
+    """Ranked leaderboard for goals, assists, attack points or matches played"""
+    return await get_leaderboard(metric.value, limit, include_ties)
+
+@router.get("/{player_id}/rank", response_model=Dict[LeaderboardMetric, PlayerRank])
+async def get_player_rank(player_id: str):
+    """A player's rank on every leaderboard"""
+    ranks = await get_player_ranks(player_id)
+    if not ranks:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return ranks
+
+@router.get("/export/csv")
+async def export_players():
+    """Export players as CSV (same layout as stats_all.csv)"""
+    content = await export_players_csv()
+    return Response(
+        content=content.encode("utf-8-sig"),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="stats_all.csv"'}
+    )
+
+@router.get("/seasons/list", response_model=List[str])
+async def list_seasons():
+    """Seasons with recorded stats, newest first"""
+    return await get_seasons()
+
+@router.get("/seasons/{season}", response_model=List[SeasonTableRow])
+async def get_season_stats(season: str):
+    """Per-player goals, assists and appearances for one season"""
+    return await get_season_table(season)
+
+@router.get("/{player_id}/stats", response_model=PlayerTotals)
+async def get_player_stats(player_id: str):
+    """A player's per-season and career totals"""
+    totals = await get_player_totals(player_id)
+    if not totals:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return totals
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
+from models import SearchHit, SearchKind
+from async_database import search_content
+from pagination import encode_cursor, decode_cursor
+
+router = APIRouter()
+
+@router.get("", response_model=List[SearchHit])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for (prefix match)"),
+    kind: Optional[SearchKind] = Query(None, description="Only announcements or only matches"),
+    limit: int = Query(20, ge=1, le=100, description="Results per page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
+):
+    """Search announcements (title, content, author) and matches (opponent, notes, location), best match first"""
+    offset = 0
+    if cursor:
+        try:
+            offset = int(decode_cursor(cursor, 1)[0])
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    hits = await search_content(q, kind.value if kind else None, limit, offset)
+    if len(hits) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(offset + limit)
+    return hits
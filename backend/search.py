@@ -0,0 +1,101 @@
+import re
+from typing import List, Optional
+
+# Full-text search over announcements and matches.
+#
+# search_index is an FTS5 table holding one document per announcement
+# (title, content, author) and per match (opponent, notes, location). The
+# source tables' triggers keep it in sync inside every write's
+# transaction. Each document's FTS rowid is derived from its source row's
+# rowid (matches even, announcements odd), so triggers update and delete
+# documents by rowid instead of scanning the index.
+#
+# The unicode61 tokenizer splits on whitespace and punctuation, and every
+# query term is matched as a prefix (so "공지" finds "공지사항").
+
+KINDS = {"announcement": ("announcements", 1), "match": ("matches", 0)}
+
+def create_table(cursor):
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            kind UNINDEXED,
+            ref_id UNINDEXED,
+            date UNINDEXED,
+            title,
+            body,
+            meta,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    ''')
+
+    documents = {
+        "announcement": "new.rowid * 2 + 1, 'announcement', new.id, new.created_at, "
+                        "new.title, new.content, new.author",
+        "match": "new.rowid * 2, 'match', new.id, new.match_date, "
+                 "new.opponent, coalesce(new.notes, ''), coalesce(new.location, '')",
+    }
+    watched = {"announcement": "title, content, author, created_at",
+               "match": "opponent, notes, location, match_date"}
+    for kind, (table, offset) in KINDS.items():
+        insert = f"INSERT INTO search_index (rowid, kind, ref_id, date, title, body, meta) VALUES ({documents[kind]});"
+        delete = f"DELETE FROM search_index WHERE rowid = old.rowid * 2 + {offset};"
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN {insert} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN {delete} END")
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {watched[kind]} ON {table} "
+            f"BEGIN {delete} {insert} END"
+        )
+
+    # Databases created before the index existed get it filled once
+    if not cursor.execute("SELECT 1 FROM search_index LIMIT 1").fetchone():
+        rebuild(cursor)
+
+def rebuild(conn):
+    """Re-index every announcement and match (e.g. after a VACUUM renumbered rowids)"""
+    conn.execute("DELETE FROM search_index")
+    conn.execute('''
+        INSERT INTO search_index (rowid, kind, ref_id, date, title, body, meta)
+        SELECT rowid * 2 + 1, 'announcement', id, created_at, title, content, author FROM announcements
+    ''')
+    conn.execute('''
+        INSERT INTO search_index (rowid, kind, ref_id, date, title, body, meta)
+        SELECT rowid * 2, 'match', id, match_date, opponent, coalesce(notes, ''), coalesce(location, '')
+        FROM matches
+    ''')
+
+def match_expression(text: str) -> Optional[str]:
+    """FTS5 query matching every word of `text` as a prefix, or None if it has no words.
+
+    Words are quoted, so FTS5 operators and punctuation typed by users are
+    treated as plain text.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+def search(conn, text: str, kind: Optional[str] = None, limit: int = 20, offset: int = 0) -> List[dict]:
+    """Best matches first; title hits weigh more than body text, which weighs more than meta"""
+    expression = match_expression(text)
+    if not expression:
+        return []
+    query = '''
+        SELECT kind, ref_id AS id, date, title,
+               snippet(search_index, -1, '<mark>', '</mark>', '…', 16) AS snippet,
+               bm25(search_index, 0, 0, 0, 10.0, 2.0, 1.0) AS relevance
+        FROM search_index
+        WHERE search_index MATCH ?
+    '''
+    params: list = [expression]
+    if kind:
+        query += " AND kind = ?"
+        params.append(kind)
+    query += " ORDER BY relevance, date DESC LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+    results = []
+    for row in conn.execute(query, params):
+        result = dict(row)
+        result["score"] = round(-result.pop("relevance"), 4)  # bm25 is lower-is-better
+        results.append(result)
+    return results
@@ -0,0 +1,69 @@
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+# Startup timing.
+#
+# main.py imports this module first, so IMPORT_STARTED approximates the
+# moment the process began loading the app. The lifespan handler records
+# each startup phase, and FirstResponseTimer notes when the first response
+# starts; GET /api/health/startup returns the whole report.
+
+IMPORT_STARTED = time.perf_counter()
+
+
+def _ms_since(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+class StartupReport:
+    def __init__(self, started: float = IMPORT_STARTED):
+        self.started = started
+        self.phases: List[dict] = []
+        self.ready_ms: Optional[float] = None
+        self.first_response_ms: Optional[float] = None
+        self.migrations: List[dict] = []
+
+    def mark_imported(self):
+        self.phases.append({"name": "import", "ms": _ms_since(self.started)})
+
+    @contextmanager
+    def phase(self, name: str):
+        phase_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({"name": name, "ms": _ms_since(phase_started)})
+
+    def mark_ready(self):
+        self.ready_ms = _ms_since(self.started)
+        phases = ", ".join(f"{phase['name']} {phase['ms']}ms" for phase in self.phases)
+        print(f"Startup ready in {self.ready_ms}ms ({phases})")
+
+    def as_dict(self) -> dict:
+        return {
+            "ready_ms": self.ready_ms,
+            "first_response_ms": self.first_response_ms,
+            "phases": self.phases,
+            "migrations_applied": self.migrations,
+        }
+
+
+class FirstResponseTimer:
+    """ASGI middleware recording when the first HTTP response starts, then staying out of the way"""
+
+    def __init__(self, app, report: StartupReport):
+        self.app = app
+        self.report = report
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.report.first_response_ms is not None:
+            await self.app(scope, receive, send)
+            return
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start" and self.report.first_response_ms is None:
+                self.report.first_response_ms = _ms_since(self.report.started)
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
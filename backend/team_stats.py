@@ -0,0 +1,114 @@
+from typing import Optional
+
+# Materialized team record.
+#
+# The team_stats table holds two rows:
+#   'baseline' - the hand-kept history imported once from team_stats.csv
+#   'total'    - baseline plus the contribution of every row in matches
+# The 'total' row is adjusted by the difference between a match's old and
+# new contribution inside the same transaction as each match write, so
+# reading it is always a single-row lookup that agrees with the matches table.
+
+STAT_COLUMNS = (
+    "total_matches",
+    "wins",
+    "draws",
+    "losses",
+    "goals_scored",
+    "goals_conceded",
+    "upcoming_matches",
+)
+
+def create_table(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS team_stats (
+            scope TEXT PRIMARY KEY,
+            total_matches INTEGER NOT NULL DEFAULT 0,
+            wins INTEGER NOT NULL DEFAULT 0,
+            draws INTEGER NOT NULL DEFAULT 0,
+            losses INTEGER NOT NULL DEFAULT 0,
+            goals_scored INTEGER NOT NULL DEFAULT 0,
+            goals_conceded INTEGER NOT NULL DEFAULT 0,
+            upcoming_matches INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+def match_contribution(match: Optional[dict]) -> dict:
+    """What a single match row adds to the team record"""
+    contribution = dict.fromkeys(STAT_COLUMNS, 0)
+    if not match:
+        return contribution
+
+    status = match.get("status")
+    if status == "scheduled":
+        contribution["upcoming_matches"] = 1
+    elif status == "completed":
+        scored = match.get("fc_ssoa_score")
+        conceded = match.get("opponent_score")
+        if scored is None or conceded is None:
+            return contribution
+        contribution["total_matches"] = 1
+        contribution["goals_scored"] = scored
+        contribution["goals_conceded"] = conceded
+        if scored > conceded:
+            contribution["wins"] = 1
+        elif scored < conceded:
+            contribution["losses"] = 1
+        else:
+            contribution["draws"] = 1
+    return contribution
+
+def apply_match_change(conn, old: Optional[dict], new: Optional[dict]):
+    """Adjust the 'total' row for a match going from `old` to `new` (None = absent)"""
+    before = match_contribution(old)
+    after = match_contribution(new)
+    delta = [after[column] - before[column] for column in STAT_COLUMNS]
+    if not any(delta):
+        return
+
+    assignments = ", ".join(f"{column} = {column} + ?" for column in STAT_COLUMNS)
+    conn.execute(f"UPDATE team_stats SET {assignments} WHERE scope = 'total'", delta)
+
+def rebuild(conn):
+    """Recompute the 'total' row from the baseline and a full scan of matches"""
+    completed = "status = 'completed' AND fc_ssoa_score IS NOT NULL AND opponent_score IS NOT NULL"
+    totals = conn.execute(f'''
+        SELECT
+            COALESCE(SUM({completed}), 0),
+            COALESCE(SUM({completed} AND fc_ssoa_score > opponent_score), 0),
+            COALESCE(SUM({completed} AND fc_ssoa_score = opponent_score), 0),
+            COALESCE(SUM({completed} AND fc_ssoa_score < opponent_score), 0),
+            COALESCE(SUM(CASE WHEN {completed} THEN fc_ssoa_score ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN {completed} THEN opponent_score ELSE 0 END), 0),
+            COALESCE(SUM(status = 'scheduled'), 0)
+        FROM matches
+    ''').fetchone()
+
+    baseline = read(conn, scope="baseline") or dict.fromkeys(STAT_COLUMNS, 0)
+    values = [baseline[column] + total for column, total in zip(STAT_COLUMNS, totals)]
+    conn.execute(
+        f"INSERT OR REPLACE INTO team_stats (scope, {', '.join(STAT_COLUMNS)}) "
+        f"VALUES ('total', {', '.join('?' for _ in STAT_COLUMNS)})",
+        values
+    )
+
+def is_seeded(conn) -> bool:
+    return read(conn, scope="baseline") is not None
+
+def seed(conn, baseline: dict):
+    """Store the imported history once and build the 'total' row from it"""
+    if is_seeded(conn):
+        return
+    values = [baseline.get(column, 0) for column in STAT_COLUMNS]
+    conn.execute(
+        f"INSERT INTO team_stats (scope, {', '.join(STAT_COLUMNS)}) "
+        f"VALUES ('baseline', {', '.join('?' for _ in STAT_COLUMNS)})",
+        values
+    )
+    rebuild(conn)
+
+def read(conn, scope: str = "total") -> Optional[dict]:
+    row = conn.execute(
+        f"SELECT {', '.join(STAT_COLUMNS)} FROM team_stats WHERE scope = ?", (scope,)
+    ).fetchone()
+    return dict(row) if row else None
@@ -32,7 +32,14 @@ function Navigation() {
     <nav className={`navigation ${scrolled ? 'scrolled' : ''}`}>
       <div className="nav-container">
         <Link to="/" className="logo">
-          <img src="/logo.png" alt="FC쏘아" className="logo-icon" />
+          <img
+            src="https://fc-ssoa-backend.onrender.com/api/assets/ROGO.png?w=128"
+            onError={(e) => { e.currentTarget.onerror = null; e.currentTarget.src = '/logo.png' }}
+            width="40"
+            height="40"
+            alt="FC쏘아"
+            className="logo-icon"
+          />
           <span className="logo-text">FC쏘아</span>
         </Link>
 
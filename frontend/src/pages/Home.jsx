@@ -15,8 +15,10 @@ function Home() {
   useEffect(() => {
     const fetchStats = async () => {
       try {
-        const response = await axios.get('https://fc-ssoa-backend.onrender.com/api/team/stats')
-        setTeamStats(response.data)
+        const response = await axios.get('https://fc-ssoa-backend.onrender.com/api/dashboard', {
+          params: { include: 'stats' }
+        })
+        setTeamStats(response.data.stats)
       } catch (err) {
         console.error('Failed to fetch team stats:', err)
       }
@@ -33,60 +33,55 @@ function Schedule() {
   const [teamStats, setTeamStats] = useState({ total_matches: 0, wins: 0, draws: 0, losses: 0 })
 
   useEffect(() => {
-    fetchMatches()
-    fetchPlayers()
-    fetchTeamStats()
+    fetchDashboard()
   }, [])
 
-  const fetchTeamStats = async () => {
-    try {
-      const response = await axios.get('https://fc-ssoa-backend.onrender.com/api/team/stats')
-      setTeamStats(response.data)
-    } catch (err) {
-      console.error('Failed to fetch team stats:', err)
+  const transformMatch = (match) => {
+    const matchDateTime = new Date(match.match_date)
+    const date = matchDateTime.toISOString().split('T')[0]
+    const time = matchDateTime.toTimeString().slice(0, 5)
+
+    let result = null
+    let score = null
+    let status = match.status === 'scheduled' ? 'upcoming' : match.status
+
+    if (match.status === 'completed' && match.fc_ssoa_score !== null && match.opponent_score !== null) {
+      score = {
+        home: match.fc_ssoa_score,
+        away: match.opponent_score
+      }
+
+      if (match.fc_ssoa_score > match.opponent_score) {
+        result = 'win'
+      } else if (match.fc_ssoa_score < match.opponent_score) {
+        result = 'loss'
+      } else {
+        result = 'draw'
+      }
+    }
+
+    return {
+      id: match.id,
+      date,
+      time,
+      opponent: match.opponent,
+      location: match.location,
+      home_away: match.home_away,
+      status,
+      score,
+      result
     }
   }
 
-  const fetchMatches = async () => {
+  // Team stats, matches and the player picker arrive together in one request
+  const fetchDashboard = async () => {
     try {
-      const response = await axios.get('https://fc-ssoa-backend.onrender.com/api/matches')
-      const transformedMatches = response.data.map(match => {
-        const matchDateTime = new Date(match.match_date)
-        const date = matchDateTime.toISOString().split('T')[0]
-        const time = matchDateTime.toTimeString().slice(0, 5)
-
-        let result = null
-        let score = null
-        let status = match.status === 'scheduled' ? 'upcoming' : match.status
-
-        if (match.status === 'completed' && match.fc_ssoa_score !== null && match.opponent_score !== null) {
-          score = {
-            home: match.fc_ssoa_score,
-            away: match.opponent_score
-          }
-
-          if (match.fc_ssoa_score > match.opponent_score) {
-            result = 'win'
-          } else if (match.fc_ssoa_score < match.opponent_score) {
-            result = 'loss'
-          } else {
-            result = 'draw'
-          }
-        }
-
-        return {
-          id: match.id,
-          date,
-          time,
-          opponent: match.opponent,
-          location: match.location,
-          home_away: match.home_away,
-          status,
-          score,
-          result
-        }
+      const response = await axios.get('https://fc-ssoa-backend.onrender.com/api/dashboard', {
+        params: { include: 'stats,matches,players' }
       })
-      setMatches(transformedMatches)
+      setTeamStats(response.data.stats)
+      setMatches(response.data.matches.map(transformMatch))
+      setPlayers(response.data.players)
       setLoading(false)
     } catch (err) {
       setError('경기 정보를 불러오는데 실패했습니다')
@@ -94,15 +89,6 @@ function Schedule() {
     }
   }
 
-  const fetchPlayers = async () => {
-    try {
-      const response = await axios.get('https://fc-ssoa-backend.onrender.com/api/matches/players-for-stats')
-      setPlayers(response.data)
-    } catch (err) {
-      console.error('Failed to fetch players:', err)
-    }
-  }
-
   const resetForm = () => {
     setFormData({
       opponent: '',
@@ -185,7 +171,7 @@ function Schedule() {
         await axios.post('https://fc-ssoa-backend.onrender.com/api/matches', payload)
       }
       closeModal()
-      fetchMatches()
+      fetchDashboard()
     } catch (err) {
       alert('저장에 실패했습니다: ' + (err.response?.data?.detail || err.message))
     }
@@ -204,7 +190,7 @@ function Schedule() {
     try {
       await axios.post(`https://fc-ssoa-backend.onrender.com/api/matches/${completingMatch.id}/complete`, payload)
       closeCompleteModal()
-      fetchMatches()
+      fetchDashboard()
       alert('경기가 완료 처리되었고 선수 통계가 업데이트되었습니다!')
     } catch (err) {
       alert('완료 처리에 실패했습니다: ' + (err.response?.data?.detail || err.message))
@@ -216,7 +202,7 @@ function Schedule() {
 
     try {
       await axios.delete(`https://fc-ssoa-backend.onrender.com/api/matches/${matchId}`)
-      fetchMatches()
+      fetchDashboard()
     } catch (err) {
       alert('삭제에 실패했습니다: ' + (err.response?.data?.detail || err.message))
     }